@@ -0,0 +1,283 @@
+import os
+import sys
+import json
+import time
+import inspect
+import argparse
+import platform
+import resource
+import tempfile
+import functools
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # Run from any directory
+
+import instrumentation
+from loaders.file_loader import FileLoader
+from loaders.pdf_loader import PDFLoader
+from loaders.docx_loader import DOCXLoader
+from loaders.ppt_loader import PPTLoader
+from data_extractor import DataExtractor, EXTRACTOR_VERSION
+from storage.sql_storage import SQLStorage
+from storage.sqlite_storage import SQLiteStorage
+from benchmarks.synthetic import generate_corpus
+
+TEST_FILES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "test_files")
+
+LOADERS = {
+    "pdf": PDFLoader,
+    "docx": DOCXLoader,
+    "pptx": PPTLoader
+}
+
+# Documents of test_files/ benchmarked for every file type.
+CORPUS_NAMES = ["small", "large", "multilingual", "annotate"]
+
+class StageTimer:
+    """
+    Measures the inclusive time and the number of calls of every method of the benchmarked classes.
+    Methods are wrapped in place for the duration of a benchmark case and restored afterwards. Time spent
+    consuming a generator returned by a method is counted towards that method.
+    """
+
+    def __init__(self):
+        self.stages = {}
+        self._originals = []
+
+    def _record(self, name, elapsed):
+        stage = self.stages.setdefault(name, {"calls": 0, "seconds": 0.0})
+        stage["calls"] += 1
+        stage["seconds"] += elapsed
+
+    def _timed_generator(self, name, generator):
+        elapsed = 0.0
+        try:
+            while True:
+                start = time.perf_counter()
+                try:
+                    item = next(generator)
+                except StopIteration as stop:
+                    elapsed += time.perf_counter() - start
+                    return stop.value
+                elapsed += time.perf_counter() - start
+                yield item
+        finally:
+            self._record(name, elapsed)
+
+    def _wrap(self, name, method):
+        @functools.wraps(method)
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                result = method(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+            if inspect.isgenerator(result):
+                return self._timed_generator(name, result)
+            self._record(name, elapsed)
+            return result
+        return timed
+
+    def instrument(self, cls, predicate=None):
+        """
+        Wraps the methods defined by a class.
+        Args:
+            cls (type): The class whose methods are timed.
+            predicate (callable, optional): Takes a method name and returns whether to time it; defaults to
+                                            every method that is not a dunder method.
+        """
+        for name, member in list(vars(cls).items()):
+            if not inspect.isfunction(member) or name.startswith("__"):
+                continue
+            if predicate is not None and not predicate(name):
+                continue
+            self._originals.append((cls, name, member))
+            setattr(cls, name, self._wrap(f"{cls.__name__}.{name}", member))
+
+    def restore(self):
+        """
+        Puts the original methods back.
+        """
+        for cls, name, member in reversed(self._originals):
+            setattr(cls, name, member)
+        self._originals = []
+
+def count_pages(file_type, filepath):
+    """
+    Returns the number of pages of a PDF or slides of a PPTX. DOCX files have no fixed pages, so None is returned.
+    """
+    loader = {"pdf": PDFLoader, "docx": DOCXLoader, "pptx": PPTLoader}[file_type]()
+    with loader.open(filepath) as handle:  # Read from the document metadata, without parsing pages or slides
+        return handle.page_count
+
+def run_case(name, file_type, filepath, store):
+    """
+    Extracts (and optionally stores) one document and measures it. Runs in its own process so that the peak
+    RSS belongs to this case alone.
+
+    Args:
+        name (str): The name of the benchmark case.
+        file_type (str): 'pdf', 'docx', or 'pptx'.
+        filepath (str): The path of the document.
+        store (bool): Whether the extracted data is also stored in a temporary SQLite database.
+
+    Returns:
+        dict: The measurements of the case.
+    """
+    pages = count_pages(file_type, filepath)
+    timer = StageTimer()
+    timer.instrument(DataExtractor)
+    timer.instrument(FileLoader, lambda method: method == "load_file")
+    timer.instrument(LOADERS[file_type], lambda method: method == "process_file")
+    timer.instrument(SQLStorage, lambda method: method.startswith("store_") or method == "_insert_rows")
+
+    with tempfile.TemporaryDirectory() as work_folder:
+        storage = SQLiteStorage(os.path.join(work_folder, "benchmark.sqlite")) if store else None
+        loader = LOADERS[file_type]()
+        loader.filepath = filepath
+        extractor = DataExtractor(loader, os.path.join(work_folder, "output"))
+
+        with instrumentation.collect(filepath) as metrics:  # Counts the pages, bytes written, and rows inserted
+            start = time.perf_counter()
+            extracted = extractor.extract_all()
+            if storage is not None:
+                storage.store_document(extracted, file_type)
+            elapsed = time.perf_counter() - start
+        if storage is not None:
+            storage.close()
+    timer.restore()
+
+    records = sum(len(items) for items in extracted.values())
+    return {
+        "name": name,
+        "file_type": file_type,
+        "file_size": os.path.getsize(filepath),
+        "pages": pages,
+        "records": records,
+        "seconds": elapsed,
+        "pages_per_second": pages / elapsed if pages and elapsed > 0 else None,
+        "records_per_second": records / elapsed if elapsed > 0 else None,
+        "peak_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,  # Kilobytes on Linux
+        "counters": metrics.report()["counters"],
+        "stages": dict(sorted(timer.stages.items()))
+    }
+
+def run_isolated(name, file_type, filepath, store):
+    """
+    Runs a benchmark case in a fresh worker process and returns its measurements.
+    """
+    with ProcessPoolExecutor(max_workers=1) as executor:
+        return executor.submit(run_case, name, file_type, filepath, store).result()
+
+def summarize_repeats(runs):
+    """
+    Combines the measurements of the repeats of a case, keeping the run with the median duration.
+    Args:
+        runs (list): The measurements of each repeat.
+
+    Returns:
+        dict: The median run, with the duration of every repeat added under 'repeat_seconds'.
+    """
+    ordered = sorted(runs, key=lambda run: run["seconds"])
+    median = dict(ordered[(len(ordered) - 1) // 2])
+    median["repeat_seconds"] = [run["seconds"] for run in runs]
+    median["peak_rss_kb"] = max(run["peak_rss_kb"] for run in runs)
+    return median
+
+def collect_cases(corpus_names, file_types, synthetic_pages, synthetic_folder):
+    """
+    Lists the benchmark cases: the test_files corpus and the synthetic documents generated at each scale.
+    Returns:
+        list: (name, file_type, filepath) tuples.
+    """
+    cases = []
+    for file_type in file_types:
+        for corpus_name in corpus_names:
+            filepath = os.path.join(TEST_FILES, file_type, f"{corpus_name}.{file_type}")
+            if os.path.exists(filepath):
+                cases.append((f"{file_type}/{corpus_name}", file_type, filepath))
+    for pages in synthetic_pages:
+        paths = generate_corpus(synthetic_folder, pages)
+        for file_type in file_types:
+            cases.append((f"{file_type}/synthetic_{pages}", file_type, paths[file_type]))
+    return cases
+
+def run_benchmarks(cases, repeat=3, store=True):
+    """
+    Runs every benchmark case and builds the machine-readable report.
+    Args:
+        cases (list): (name, file_type, filepath) tuples, as returned by collect_cases.
+        repeat (int): The number of times each case is run; the median run is reported.
+        store (bool): Whether the extracted data is also stored, to time the SQLStorage calls.
+
+    Returns:
+        dict: The report, with the environment and the measurements of every case.
+    """
+    results = []
+    for name, file_type, filepath in cases:
+        runs = [run_isolated(name, file_type, filepath, store) for _ in range(repeat)]
+        result = summarize_repeats(runs)
+        rate = f"{result['pages_per_second']:.1f} pages/s" if result["pages_per_second"] else \
+            f"{result['records_per_second']:.1f} records/s"
+        print(f"{name}: {result['seconds']:.3f}s, {rate}, peak RSS {result['peak_rss_kb'] / 1024:.1f} MB")
+        results.append(result)
+    return {
+        "extractor_version": EXTRACTOR_VERSION,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "repeat": repeat,
+        "cases": results
+    }
+
+def compare_reports(baseline, current, tolerance=0.2, min_seconds=0.05):
+    """
+    Finds the cases that are slower than in a baseline report by more than the tolerance.
+    Args:
+        baseline (dict): A report written by an earlier run.
+        current (dict): The report of this run.
+        tolerance (float): The allowed relative slowdown, e.g. 0.2 for 20%.
+        min_seconds (float): Cases faster than this in the baseline are too noisy to compare and are skipped.
+
+    Returns:
+        list: A description of every regression.
+    """
+    baseline_cases = {case["name"]: case for case in baseline["cases"]}
+    regressions = []
+    for case in current["cases"]:
+        previous = baseline_cases.get(case["name"])
+        if previous is None or previous["seconds"] < min_seconds:
+            continue
+        slowdown = case["seconds"] / previous["seconds"] - 1
+        if slowdown > tolerance:
+            regressions.append(f"{case['name']}: {previous['seconds']:.3f}s -> {case['seconds']:.3f}s (+{slowdown:.0%})")
+    return regressions
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the extraction pipeline on the test corpus and synthetic documents.")
+    parser.add_argument("--file-types", nargs="+", choices=list(LOADERS), default=list(LOADERS))
+    parser.add_argument("--corpus", nargs="*", default=CORPUS_NAMES, help="Names of the test_files documents to benchmark.")
+    parser.add_argument("--synthetic-pages", type=int, nargs="*", default=[50, 500],
+                        help="Page counts of the synthetic documents generated for each file type.")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs of each case; the median run is reported.")
+    parser.add_argument("--no-store", action="store_true", help="Only extract, without timing the storage calls.")
+    parser.add_argument("--output", default="benchmark_results.json", help="Path of the JSON report.")
+    parser.add_argument("--baseline", help="JSON report of an earlier run to compare against.")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed relative slowdown against the baseline.")
+    parser.add_argument("--min-seconds", type=float, default=0.05, help="Baseline cases faster than this are not compared.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as synthetic_folder:
+        cases = collect_cases(args.corpus, args.file_types, args.synthetic_pages, synthetic_folder)
+        report = run_benchmarks(cases, repeat=args.repeat, store=not args.no_store)
+
+    with open(args.output, "w", encoding="utf-8") as file:
+        json.dump(report, file, indent=4)
+    print(f"Benchmark report written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as file:
+            regressions = compare_reports(json.load(file), report, args.tolerance, args.min_seconds)
+        for regression in regressions:
+            print(f"Regression: {regression}")
+        sys.exit(1 if regressions else 0)
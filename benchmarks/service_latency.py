@@ -0,0 +1,103 @@
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import threading
+import statistics
+import subprocess
+import urllib.request
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # Run from any directory
+
+from main import FileProcessor
+from service import ExtractionService, create_server
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TEST_FILES = os.path.join(ROOT, "test_files")
+
+# Documents of test_files/ whose latency is measured.
+DOCUMENTS = ["pdf/small.pdf", "pdf/large.pdf", "docx/large.docx", "pptx/large.pptx"]
+
+def measure_cold(filepath, work_folder):
+    """
+    Processes one document the way a one-off run does: a new Python process that imports the extraction
+    libraries, builds the loaders, and starts a worker pool for the file.
+
+    Returns:
+        float: The wall-clock seconds of the run.
+    """
+    command = [sys.executable, os.path.join(ROOT, "main.py"), "--batch", filepath, "--workers", "1", "--log-level", "WARNING"]
+    start = time.perf_counter()
+    subprocess.run(command, cwd=work_folder, check=True, stdout=subprocess.DEVNULL)
+    return time.perf_counter() - start
+
+def measure_warm(url, filepath):
+    """
+    Sends one document to a running extraction service and waits for the result.
+
+    Returns:
+        float: The seconds from sending the request to receiving the result.
+    """
+    request = urllib.request.Request(f"{url}/extract", data=json.dumps({"path": filepath}).encode("utf-8"),
+                                     headers={"Content-Type": "application/json"})
+    start = time.perf_counter()
+    with urllib.request.urlopen(request) as response:
+        result = json.load(response)
+    elapsed = time.perf_counter() - start
+    if result["status"] != "done":
+        raise RuntimeError(f"{filepath}: {result['error']}")
+    return elapsed
+
+def run_latency_benchmark(documents, repeat=5):
+    """
+    Measures the latency of every document from a cold start and through a warm service.
+
+    Args:
+        documents (list): Paths of the documents, relative to test_files/.
+        repeat (int): The number of measurements of each document in each mode.
+
+    Returns:
+        dict: The report, with the latencies of every document and the median of each mode.
+    """
+    cases = []
+    with tempfile.TemporaryDirectory() as work_folder:
+        processor = FileProcessor(base_output_folder=os.path.join(work_folder, "service_output"))
+        with ExtractionService(processor, workers=1) as service:
+            server = create_server(service, port=0)
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            url = f"http://127.0.0.1:{server.server_address[1]}"
+            try:
+                for document in documents:
+                    filepath = os.path.join(TEST_FILES, document)
+                    cold = [measure_cold(filepath, work_folder) for _ in range(repeat)]
+                    measure_warm(url, filepath)  # The first request also warms the caches of the worker
+                    warm = [measure_warm(url, filepath) for _ in range(repeat)]
+                    case = {
+                        "name": document,
+                        "cold_seconds": cold,
+                        "warm_seconds": warm,
+                        "cold_median": statistics.median(cold),
+                        "warm_median": statistics.median(warm)
+                    }
+                    case["speedup"] = case["cold_median"] / case["warm_median"]
+                    print(f"{document}: cold {case['cold_median'] * 1000:.0f} ms, warm {case['warm_median'] * 1000:.0f} ms "
+                          f"({case['speedup']:.1f}x)")
+                    cases.append(case)
+            finally:
+                server.shutdown()
+                server.server_close()
+    return {"repeat": repeat, "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"), "cases": cases}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare the per-document latency of a cold start with a warm extraction service.")
+    parser.add_argument("--documents", nargs="+", default=DOCUMENTS, help="Documents of test_files/ to measure.")
+    parser.add_argument("--repeat", type=int, default=5, help="Measurements of each document in each mode.")
+    parser.add_argument("--output", default="service_latency.json", help="Path of the JSON report.")
+    args = parser.parse_args()
+
+    report = run_latency_benchmark(args.documents, repeat=args.repeat)
+    with open(args.output, "w", encoding="utf-8") as file:
+        json.dump(report, file, indent=4)
+    print(f"Latency report written to {args.output}")
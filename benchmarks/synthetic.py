@@ -0,0 +1,120 @@
+import os
+import fitz
+from docx import Document
+from pptx import Presentation
+from pptx.util import Inches
+
+# Text of a synthetic paragraph; repeated so each page carries a realistic amount of text.
+PARAGRAPH = ("Quarterly revenue grew across every region while operating costs stayed flat. "
+             "The table below summarises the results reported by each business unit. ") * 3
+
+def _make_logo():
+    """
+    Returns the PNG bytes of a small image embedded in every synthetic document.
+    """
+    logo = fitz.Pixmap(fitz.csRGB, fitz.IRect(0, 0, 32, 32), False)
+    logo.set_rect(logo.irect, (30, 90, 200))
+    return logo.tobytes("png")
+
+def generate_pdf(path, pages):
+    """
+    Generates a PDF with a heading, body text, a link, a logo image, and a ruled table on every page.
+    Args:
+        path (str): The path of the PDF to create.
+        pages (int): The number of pages.
+    """
+    logo = _make_logo()
+    doc = fitz.open()
+    for page_num in range(pages):
+        page = doc.new_page()
+        page.insert_text((72, 72), f"Section {page_num + 1}", fontsize=18)
+        page.insert_textbox(fitz.Rect(72, 90, 520, 250), PARAGRAPH, fontsize=10)
+        page.insert_link({"kind": fitz.LINK_URI, "from": fitz.Rect(72, 260, 250, 275),
+                          "uri": f"https://example.com/section/{page_num + 1}"})
+        page.insert_text((72, 272), "Read the full report", fontsize=10)
+        page.insert_image(fitz.Rect(450, 40, 500, 90), stream=logo)
+        # A 4x3 ruled table, detected by pdfplumber from its lines
+        for row in range(5):
+            page.draw_line((72, 300 + row * 20), (432, 300 + row * 20))
+        for column in range(4):
+            page.draw_line((72 + column * 120, 300), (72 + column * 120, 380))
+        for row in range(4):
+            for column in range(3):
+                page.insert_text((78 + column * 120, 314 + row * 20), f"R{row + 1}C{column + 1}", fontsize=9)
+    doc.save(path)
+
+def generate_docx(path, pages):
+    """
+    Generates a DOCX with the content of about one page per unit: a heading, paragraphs, a logo, and a table.
+    Args:
+        path (str): The path of the DOCX to create.
+        pages (int): The number of page-sized sections.
+    """
+    logo_path = f"{path}.logo.png"
+    with open(logo_path, "wb") as logo_file:
+        logo_file.write(_make_logo())
+    doc = Document()
+    for page_num in range(pages):
+        doc.add_heading(f"Section {page_num + 1}", level=1)
+        for _ in range(3):
+            doc.add_paragraph(PARAGRAPH)
+        doc.add_picture(logo_path, width=Inches(0.5))
+        table = doc.add_table(rows=4, cols=3)
+        for row_index, row in enumerate(table.rows):
+            for column_index, cell in enumerate(row.cells):
+                cell.text = f"R{row_index + 1}C{column_index + 1}"
+        doc.add_page_break()
+    doc.save(path)
+    os.remove(logo_path)
+
+def generate_pptx(path, slides):
+    """
+    Generates a PPTX where every slide has a title, body text with a link, a logo picture, and a table.
+    Args:
+        path (str): The path of the PPTX to create.
+        slides (int): The number of slides.
+    """
+    logo_path = f"{path}.logo.png"
+    with open(logo_path, "wb") as logo_file:
+        logo_file.write(_make_logo())
+    presentation = Presentation()
+    layout = presentation.slide_layouts[5]  # Title only
+    for slide_num in range(slides):
+        slide = presentation.slides.add_slide(layout)
+        slide.shapes.title.text = f"Section {slide_num + 1}"
+        body = slide.shapes.add_textbox(Inches(0.5), Inches(1.5), Inches(6), Inches(1.5)).text_frame
+        body.text = PARAGRAPH
+        run = body.add_paragraph().add_run()
+        run.text = "Read the full report"
+        run.hyperlink.address = f"https://example.com/section/{slide_num + 1}"
+        slide.shapes.add_picture(logo_path, Inches(8.5), Inches(0.2), width=Inches(0.8))
+        table = slide.shapes.add_table(4, 3, Inches(0.5), Inches(3.5), Inches(6), Inches(1.5)).table
+        for row_index in range(4):
+            for column_index in range(3):
+                table.cell(row_index, column_index).text = f"R{row_index + 1}C{column_index + 1}"
+    presentation.save(path)
+    os.remove(logo_path)
+
+# Generator of each file type, taking (path, pages).
+GENERATORS = {
+    "pdf": generate_pdf,
+    "docx": generate_docx,
+    "pptx": generate_pptx
+}
+
+def generate_corpus(folder, pages):
+    """
+    Generates one synthetic document of each file type.
+    Args:
+        folder (str): The directory the documents are written to.
+        pages (int): The number of pages (slides for PPTX, page-sized sections for DOCX) of each document.
+
+    Returns:
+        dict: The path of the generated document of each file type.
+    """
+    os.makedirs(folder, exist_ok=True)
+    paths = {}
+    for file_type, generate in GENERATORS.items():
+        paths[file_type] = os.path.join(folder, f"synthetic_{pages}.{file_type}")
+        generate(paths[file_type], pages)
+    return paths
@@ -1,11 +1,50 @@
 import os
 import fitz  # PyMuPDF for handling PDF files
-import pdfplumber  # For extracting tables from PDFs
 import csv  # For saving tables as CSV files
+import shutil  # For copying repeated images without extracting them again
+import hashlib  # For content-addressed image storage and page fingerprints
+import json  # For the page fingerprint manifests
+import operator
+import itertools  # For joining the spans of PDF lines
+import inspect
+import logging
+import functools
+from concurrent.futures import ProcessPoolExecutor  # For extracting page ranges of large PDFs in parallel
 from docx.oxml.ns import qn  # Used for namespacing in DOCX processing
+from docx.styles import BabelFish  # Maps internal DOCX style names to their UI names
+from docx.image.image import Image as DocxImage  # Reads the pixel dimensions of DOCX images
+from PIL import Image as PILImage  # Identifies the format of PPTX pictures read from the package
+import instrumentation  # For per-stage metrics of the current document
+from records import TextLine, PageText, SlideText, to_json  # Compact text records
+from instrumentation import instrumented
+from timeouts import time_limit  # For the time limit of every PDF page stage
+from errors import PageTimeout
 from loaders.pdf_loader import PDFLoader
 from loaders.docx_loader import DOCXLoader
 from loaders.ppt_loader import PPTLoader
+from loaders import ooxml_package as ooxml  # Streaming reader for DOCX and PPTX packages
+
+# Version of the extraction logic. Bump it whenever a change alters the extracted output,
+# so results cached by older versions are no longer used.
+EXTRACTOR_VERSION = "1"
+
+# Table pre-filter. pdfplumber's default table settings build cells only from ruling lines and rectangle
+# edges, and drop tables with a single cell, so a page needs at least the 6 corners of two adjacent cells.
+# Edges closer than the snap, join, and intersection tolerances (3 points each) may still meet after pdfplumber
+# merges them, so the pre-filter accepts intersections up to their sum.
+TABLE_EDGE_TOLERANCE = 9
+MIN_TABLE_INTERSECTIONS = 6
+
+# Heading detection of PDF text. With the 'threshold' detection a line is a heading when its font is larger than
+# HEADING_FONT_SIZE points; with 'page' detection when its font is HEADING_SIZE_RATIO times larger than the body text.
+HEADING_DETECTIONS = ("threshold", "page")
+HEADING_FONT_SIZE = 14
+HEADING_SIZE_RATIO = 1.2
+
+logger = logging.getLogger(__name__)
+
+# Graphic data URI of a table in a PPTX graphic frame.
+PPTX_TABLE_URI = "http://schemas.openxmlformats.org/drawingml/2006/table"
 
 def clean_text(text):
     """
@@ -17,15 +56,1068 @@ def clean_text(text):
     """
     return text.replace("\n", " ").replace("\t", " ").strip()
 
+def page_time_limit(stage, empty_result):
+    """
+    Decorator of the methods extracting one stage of a single PDF page. When the extractor has a page timeout,
+    the stage is interrupted once it runs longer, the page is recorded in the extractor's `page_errors`, and
+    the empty result of the stage is returned, so one pathological page cannot stall the whole document.
+
+    Args:
+        stage (str): The name of the stage in the page errors, e.g. 'tables'.
+        empty_result (callable): Returns the result of a failed page from the extractor and the 0-based page index.
+    """
+    def decorator(method):
+        page_num_index = list(inspect.signature(method).parameters).index("page_num") - 1  # Position after self
+
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            if not self.page_timeout:
+                return method(self, *args, **kwargs)
+            page_num = kwargs["page_num"] if "page_num" in kwargs else args[page_num_index]
+            try:
+                with time_limit(self.page_timeout, lambda: PageTimeout(
+                        self.loader.filepath, "page_timeout",
+                        f"Page {page_num + 1} {stage} took longer than {self.page_timeout} seconds")):
+                    return method(self, *args, **kwargs)
+            except PageTimeout as e:
+                self._record_page_error(page_num, stage, e)
+                return empty_result(self, page_num)
+        return wrapper
+    return decorator
+
 class DataExtractor:
-    def __init__(self, loader):
+    def __init__(self, loader, output_folder="output", page_workers=None, pages_per_chunk=25, cache=None,
+                 image_store=None, image_mode="extract", writer=None, manifest_folder=None, table_prefilter=True,
+                 table_format="csv", streaming=False, compact_records=False, heading_detection="threshold",
+                 page_timeout=None):
         """
         Initializes the DataExtractor with a specific file loader instance.
         Args:
             loader (PDFLoader | DOCXLoader | PPTLoader): The loader instance capable of loading a specific file format.
+            output_folder (str): The base directory where extracted images and tables are written.
+            page_workers (int, optional): Number of worker processes used to extract PDF text and tables by page range.
+                                          None or 1 keeps extraction serial.
+            pages_per_chunk (int): Number of consecutive pages handed to a worker at a time.
+            cache (ExtractionCache, optional): Cache checked by extract_all before the document is opened.
+            image_store (str, optional): Directory of a content-addressed image store. When set, every image is
+                                         saved once under the hash of its content and shared by all records,
+                                         pages, and documents that contain it.
+            image_mode (str): 'extract' to decode and save every image, or 'metadata' to only record each image's
+                              reference, format, dimensions, and position. Metadata records can be saved later
+                              with materialize_images.
+            writer (ArtifactWriter, optional): Background writer that image and CSV files are handed to, so the
+                                               next page is extracted while they are written. Every public
+                                               extraction method waits for its files before returning.
+            manifest_folder (str, optional): Directory of the page fingerprint manifests. When set, extract_all
+                                             re-extracts only the PDF pages and PPTX slides whose fingerprint
+                                             changed since the last run and reuses the records of the others.
+            table_prefilter (bool): Whether PDF pages whose vector drawings cannot form a table are skipped
+                                    without running pdfplumber's table detection. The number of skipped pages
+                                    of the last extraction is kept in `table_pages_skipped`.
+            table_format (str): 'csv' to save every table as its own CSV file, or 'rows' to keep the cells of each
+                                table in its record under 'rows' instead, e.g. to append them to a columnar
+                                TableDataset. No CSV file is written with 'rows'.
+            streaming (bool): Whether DOCX and PPTX files are read part by part from the zip archive instead of
+                              being loaded whole with python-docx or python-pptx. The document body and each
+                              slide are parsed incrementally and released block by block, and images are copied
+                              from the archive without being loaded, so memory use stays bounded for very large
+                              files. The extracted records are the same. PDF files are not affected.
+            compact_records (bool): Whether text lines and the text of pages and slides are kept as compact
+                                    slotted records (TextLine, PageText, SlideText) with interned style
+                                    names instead of dicts. The records read like the dicts and compare equal to
+                                    them, and are converted to dicts only when written as JSON.
+            heading_detection (str): How lines of PDF text are classified as headings. 'threshold' treats fonts
+                                     larger than 14 points as headings. 'page' compares each line to the body
+                                     font size of its page instead, so headings are found in documents set in
+                                     small or large type as well.
+            page_timeout (float, optional): Seconds each stage (text, links, images, or tables) of a single PDF page
+                                            may take. A stage that runs longer is interrupted, the page is recorded
+                                            in `page_errors`, and extraction goes on with an empty result for it.
+                                            Results with page errors are not cached. Needs the main thread of a
+                                            POSIX process; None disables the limit.
         """
         self.loader = loader
+        self.output_folder = output_folder
+        self.page_workers = page_workers
+        self.pages_per_chunk = pages_per_chunk
+        self.cache = cache
+        self.image_store = image_store
+        self.image_mode = image_mode
+        self.writer = writer
+        self.manifest_folder = manifest_folder
+        self.table_prefilter = table_prefilter
+        self.table_format = table_format
+        self.streaming = streaming
+        self.compact_records = compact_records
+        self.heading_detection = heading_detection
+        self.changed_pages = None  # Pages re-extracted by the last incremental extract_all; None for the whole file
+        self.content_hash = None  # SHA-256 of the file hashed by the last cached extract_all, for the storage
+        self.table_pages_skipped = 0  # PDF pages of the last extraction whose table detection was skipped
+        self.page_timeout = page_timeout
+        self.page_errors = []  # PDF page stages that failed, as dicts with the page number, stage, code, and message
+
+    @instrumented()
+    def extract_all(self):
+        """
+        Extracts text, links, images, and tables in a single pass over the loaded file.
+        Each underlying document is parsed once and the parsed object is shared by every content
+        extractor, instead of being re-loaded by each of the extract_* methods.
+
+        When a cache is configured, results stored for the same file content, extractor version, and options
+        are returned without opening the document, and fresh results are stored for the next run.
+
+        Returns:
+            dict: The extracted data keyed by content type ('text', 'links', 'images', 'tables'),
+                  identical to the results of the four separate extract_* calls.
+        """
+        if self.cache is None:
+            self.content_hash = None
+            return self._flush_artifacts(self._extract_all())
+
+        # The file is hashed once; the hash is kept so the caller can store it without reading the file again.
+        self.content_hash = self.cache.hash_file(self.loader.filepath)
+        cache_key = self.cache.make_key(self.loader.filepath, EXTRACTOR_VERSION, self._get_cache_options(),
+                                        self.content_hash)
+        extracted = self.cache.get(cache_key)
+        if extracted is not None:
+            # The cache does not know whether the rows of the file are stored in the database the caller stores
+            # to (a new database file, another backend, or an earlier store that failed), so every row is replaced.
+            self.changed_pages = None
+            self.page_errors = []
+            if self.compact_records:  # Entries are stored as JSON, so the records come back as dicts
+                extracted["text"] = [self._make_cached_text_record(item) for item in extracted["text"]]
+        else:
+            extracted = self._flush_artifacts(self._extract_all())  # The cache checks that every artifact exists
+            if not self.page_errors:  # Pages that timed out are extracted again next time
+                self.cache.put(cache_key, extracted, filepath=self.loader.filepath, version=EXTRACTOR_VERSION)
+        return extracted
+
+    def _flush_artifacts(self, result=None):
+        """
+        Waits until every file handed to the background writer is on disk; the barrier at the end of a document.
+        Args:
+            result (optional): A value passed through, so the barrier can wrap a return value.
+
+        Returns:
+            The given result.
+        """
+        if self.writer is not None:
+            self.writer.flush()
+        return result
+
+    def _get_cache_options(self):
+        """
+        Returns the extraction options that affect the extracted data, which are part of the cache key.
+        """
+        return {
+            "file_type": self.loader.file_extension,
+            "output_folder": os.path.abspath(self.output_folder),
+            "image_store": os.path.abspath(self.image_store) if self.image_store else None,
+            "image_mode": self.image_mode,
+            "table_format": self.table_format,
+            "heading_detection": self.heading_detection
+        }
+
+    def _extract_all(self):
+        """
+        Extracts every content type from the loaded file in a single pass, without consulting the cache.
+        """
+        self.changed_pages = None
+        self.table_pages_skipped = 0
+        self.page_errors = []
+        with self._open_document() as handle:  # Every pass below shares the document, loaded once
+            if self.manifest_folder and isinstance(self.loader, (PDFLoader, PPTLoader)):
+                return self._extract_incremental()
+
+            if isinstance(self.loader, PDFLoader):
+                return self._extract_pdf_all(self.loader.filepath)
+            if self._streams():
+                return self._extract_streamed(("text", "links", "images", "tables"))
+
+            loaded_file = handle.document  # Load DOCX or PPT once for every content type
+
+            if isinstance(self.loader, DOCXLoader):
+                return {
+                    "text": self._extract_docx_text(loaded_file),
+                    "links": self._extract_docx_links(loaded_file),
+                    "images": self._extract_docx_images(loaded_file),
+                    "tables": self._extract_docx_tables(loaded_file)
+                }
+            elif isinstance(self.loader, PPTLoader):
+                return self._extract_pptx_all(loaded_file)
+
+    def _open_document(self):
+        """
+        Opens the document handle of the loaded file. While it is open, every extraction pass shares the document
+        it loads, so a file is parsed once however many content types are extracted from it.
+
+        Returns:
+            DocumentHandle: The handle, to be closed by the caller, e.g. with a `with` block.
+        """
+        return self.loader.open(self.loader.filepath)
+
+    def _extract_pdf_all(self, pdf_path):
+        """
+        Extracts every content type from a PDF file in one walk over its pages.
+        Each PDF backend (PyMuPDF for text, links, and images, pdfplumber for tables) opens the file at most
+        once, pdfplumber only if a page needs table detection, and the pages are visited together. When page
+        workers are enabled, text and tables are extracted by the worker processes while this process walks
+        links and images.
+
+        Args:
+            pdf_path (str): The file path to the PDF document.
+
+        Returns:
+            dict: The extracted text, links, images, and tables of the PDF.
+        """
+        with self.loader.open(pdf_path) as handle:
+            doc = handle.document  # Validate and open the PDF document using PyMuPDF
+            pdf_images_folder = os.path.join(self.output_folder, "images", "pdf")  # Define the directory to store images
+            pdf_tables_folder = os.path.join(self.output_folder, "tables", "pdf")  # Define the directory to store CSV files
+            os.makedirs(pdf_images_folder, exist_ok=True)  # Ensure the directories exist
+            os.makedirs(pdf_tables_folder, exist_ok=True)
+
+            extracted = {"text": [], "links": [], "images": [], "tables": []}
+            instrumentation.increment("pages", len(doc))
+            page_ranges = self._get_page_ranges(len(doc))
+            if len(page_ranges) > 1:
+                skipped_pages = self._get_table_free_pages(doc)  # Decided here so the workers need not count them
+                with ProcessPoolExecutor(max_workers=self.page_workers) as executor:
+                    text_futures = [executor.submit(self._run_page_range, "_extract_pdf_text_range", pdf_path, start, stop)
+                                    for start, stop in page_ranges]
+                    table_futures = [executor.submit(self._run_page_range, "_extract_pdf_tables_range", pdf_path, start, stop,
+                                                     pdf_tables_folder, skipped_pages)
+                                     for start, stop in page_ranges]
+                    xref_cache = {}  # Images already extracted from this document, by xref
+                    for page_num, page in enumerate(doc.pages()):
+                        extracted["links"].extend(self._extract_pdf_page_links(page, page_num))
+                        extracted["images"].extend(self._extract_pdf_page_images(doc, page, page_num, pdf_images_folder, xref_cache))
+                    # Merge the worker results back in page order
+                    for future in text_futures:
+                        extracted["text"].extend(self._merge_page_range(future.result()))
+                    for future in table_futures:
+                        extracted["tables"].extend(self._merge_page_range(future.result()))
+                return extracted
+
+            xref_cache = {}  # Images already extracted from this document, by xref
+            for page_num, page in enumerate(doc.pages()):  # Visit each page once for all content types
+                extracted["text"].append(self._extract_pdf_page_text(page, page_num))
+                extracted["links"].extend(self._extract_pdf_page_links(page, page_num))
+                extracted["images"].extend(self._extract_pdf_page_images(doc, page, page_num, pdf_images_folder, xref_cache))
+                if not self._skips_table_detection(page):  # pdfplumber opens the PDF on the first page it has to check
+                    extracted["tables"].extend(self._extract_pdf_page_tables(handle.layout.pages[page_num], page_num,
+                                                                             pdf_tables_folder))
+
+            return extracted
+
+    def _get_manifest_path(self):
+        """
+        Returns the path of the fingerprint manifest of the loaded file, named after its absolute path.
+        """
+        filepath = os.path.abspath(self.loader.filepath)
+        path_hash = hashlib.sha256(filepath.encode("utf-8")).hexdigest()[:16]
+        return os.path.join(self.manifest_folder, f"{os.path.basename(filepath)}.{path_hash}.json")
+
+    def _load_manifest(self, manifest_path):
+        """
+        Returns the page entries of the previous run, or an empty list if there is no usable manifest.
+        A manifest written by another extractor version or with other options is ignored.
+        """
+        try:
+            with open(manifest_path, encoding="utf-8") as file:
+                manifest = json.load(file)
+        except (OSError, ValueError):
+            return []
+        if manifest.get("version") != EXTRACTOR_VERSION or manifest.get("options") != self._get_cache_options():
+            return []
+        return manifest["pages"]
+
+    def _save_manifest(self, manifest_path, pages):
+        """
+        Writes the page entries of this run to the manifest, replacing it atomically.
+        """
+        os.makedirs(self.manifest_folder, exist_ok=True)
+        temp_path = f"{manifest_path}.{os.getpid()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as file:
+            json.dump({"version": EXTRACTOR_VERSION, "options": self._get_cache_options(), "pages": pages},
+                      file, ensure_ascii=False, default=to_json)
+        os.replace(temp_path, manifest_path)
+
+    @staticmethod
+    def _is_reusable(entry, fingerprint):
+        """
+        Returns whether the entry of a page from the previous run can be reused: the fingerprint is unchanged
+        and every image and CSV file of the page still exists.
+        """
+        if entry is None or entry["fingerprint"] != fingerprint:
+            return False
+        artifact_paths = [item.get("image_path") for item in entry["images"]]
+        artifact_paths += [item.get("csv_path") for item in entry["tables"]]
+        return all(os.path.exists(path) for path in artifact_paths if path)
+
+    def _fingerprint_pdf_page(self, doc, page):
+        """
+        Hashes everything the extraction of a PDF page depends on: its content stream, size and rotation,
+        fonts, images, form XObjects, and links. Object numbers are left out, so rewriting the file without
+        changing the page keeps its fingerprint.
+
+        Args:
+            doc (fitz.Document): The PyMuPDF document.
+            page (fitz.Page): The page to fingerprint.
+
+        Returns:
+            str: The hexadecimal SHA-256 fingerprint of the page.
+        """
+        digest = hashlib.sha256()
+        digest.update(repr((tuple(page.rect), page.rotation)).encode("utf-8"))
+        digest.update(page.read_contents())
+        digest.update(repr([font[1:] for font in page.get_fonts()]).encode("utf-8"))
+        for xref in [image[0] for image in page.get_images(full=True)] + [xobject[0] for xobject in page.get_xobjects()]:
+            digest.update(doc.xref_stream_raw(xref) or b"")
+        digest.update(repr([(link["kind"], link.get("uri"), link.get("page"), tuple(link["from"]))
+                            for link in page.get_links()]).encode("utf-8"))
+        return digest.hexdigest()
+
+    @staticmethod
+    def _fingerprint_pptx_slide(slide):
+        """
+        Hashes everything the extraction of a slide depends on: the slide XML and the targets of its
+        relationships (hyperlink addresses, and the name and content of images and other parts).
+
+        Args:
+            slide (Slide): The python-pptx slide object.
+
+        Returns:
+            str: The hexadecimal SHA-256 fingerprint of the slide.
+        """
+        digest = hashlib.sha256(slide.part.blob)
+        for rel_id, rel in sorted(slide.part.rels.items()):
+            digest.update(f"{rel_id}|{rel.reltype}|{rel.target_ref}".encode("utf-8"))
+            if not rel.is_external and "/slideLayout" not in rel.reltype and "/notesSlide" not in rel.reltype:
+                digest.update(rel.target_part.blob)  # Images, charts, and embedded objects
+        return digest.hexdigest()
+
+    def _extract_incremental(self):
+        """
+        Extracts every content type from a PDF or PPTX file, re-extracting only the pages or slides whose
+        fingerprint differs from the manifest of the previous run. The records of unchanged pages are reused
+        and spliced with the fresh ones, so the result matches a full extraction. The numbers of the
+        re-extracted and removed pages are left in `changed_pages`.
 
+        Returns:
+            dict: The extracted text, links, images, and tables of the file.
+        """
+        manifest_path = self._get_manifest_path()
+        previous = self._load_manifest(manifest_path)
+        if isinstance(self.loader, PDFLoader):
+            pages = self._extract_pdf_pages_incremental(previous)
+        else:
+            pages = self._extract_pptx_slides_incremental(previous)
+
+        self.changed_pages = [page_num + 1 for page_num, entry in enumerate(pages) if entry.pop("changed")]
+        self.changed_pages += list(range(len(pages) + 1, len(previous) + 1))  # Pages removed since the last run
+        self._flush_artifacts()  # Files are on disk before the manifest refers to them
+        self._save_manifest(manifest_path, pages)
+
+        extracted = {"text": [], "links": [], "images": [], "tables": []}
+        seen_links = set()
+        for entry in pages:
+            for content in ("text", "images", "tables"):
+                extracted[content].extend(entry[content])
+            for link in entry["links"]:
+                if isinstance(self.loader, PPTLoader):  # PPTX links are de-duplicated across the whole presentation
+                    if (link["link"], link["linked_text"]) in seen_links:
+                        continue
+                    seen_links.add((link["link"], link["linked_text"]))
+                extracted["links"].append(link)
+        return extracted
+
+    def _extract_pdf_pages_incremental(self, previous):
+        """
+        Extracts the pages of a PDF file whose fingerprint changed since the previous run.
+        Args:
+            previous (list): The page entries of the previous run.
+
+        Returns:
+            list: One entry per page with its fingerprint, records, and whether it was re-extracted.
+        """
+        with self._open_document() as handle:  # Shares the document opened by extract_all
+            doc = handle.document  # Validate and open the PDF document using PyMuPDF
+            pdf_images_folder = os.path.join(self.output_folder, "images", "pdf")
+            pdf_tables_folder = os.path.join(self.output_folder, "tables", "pdf")
+            os.makedirs(pdf_images_folder, exist_ok=True)
+            os.makedirs(pdf_tables_folder, exist_ok=True)
+            instrumentation.increment("pages", len(doc))
+
+            pages = []
+            xref_cache = {}  # Images already extracted in this run, by xref
+            for page_num, page in enumerate(doc.pages()):
+                fingerprint = self._fingerprint_pdf_page(doc, page)
+                entry = previous[page_num] if page_num < len(previous) else None
+                if self._is_reusable(entry, fingerprint):
+                    pages.append(dict(entry, changed=False))
+                    continue
+                error_count = len(self.page_errors)
+                pages.append({
+                    "fingerprint": fingerprint,
+                    "changed": True,
+                    "text": [self._extract_pdf_page_text(page, page_num)],
+                    "links": self._extract_pdf_page_links(page, page_num),
+                    "images": self._extract_pdf_page_images(doc, page, page_num, pdf_images_folder, xref_cache),
+                    "tables": [] if self._skips_table_detection(page) else
+                              self._extract_pdf_page_tables(handle.layout.pages[page_num], page_num, pdf_tables_folder)
+                })
+                if len(self.page_errors) > error_count:
+                    pages[-1]["fingerprint"] = None  # Never reused, so the page is extracted again next time
+        return pages
+
+    def _extract_pptx_slides_incremental(self, previous):
+        """
+        Extracts the slides of a PPTX file whose fingerprint changed since the previous run.
+        Links are kept per slide before the presentation-wide de-duplication, which is applied when the
+        slides are spliced together.
+
+        Args:
+            previous (list): The slide entries of the previous run.
+
+        Returns:
+            list: One entry per slide with its fingerprint, records, and whether it was re-extracted.
+        """
+        with self._open_document() as handle:  # Shares the presentation opened by extract_all
+            presentation = handle.document
+            pptx_images_folder = os.path.join(self.output_folder, "images", "pptx")
+            pptx_tables_folder = os.path.join(self.output_folder, "tables", "pptx")
+            os.makedirs(pptx_images_folder, exist_ok=True)
+            os.makedirs(pptx_tables_folder, exist_ok=True)
+            instrumentation.increment("pages", len(presentation.slides))
+
+            slides = []
+            for slide_num, slide in enumerate(presentation.slides):
+                fingerprint = self._fingerprint_pptx_slide(slide)
+                entry = previous[slide_num] if slide_num < len(previous) else None
+                if self._is_reusable(entry, fingerprint):
+                    slides.append(dict(entry, changed=False))
+                    continue
+                slide_text = self._extract_pptx_slide_text(slide, slide_num)
+                slides.append({
+                    "fingerprint": fingerprint,
+                    "changed": True,
+                    "text": [slide_text] if slide_text else [],
+                    "links": self._extract_pptx_slide_links(slide, slide_num, set()),
+                    "images": self._extract_pptx_slide_images(slide, slide_num, pptx_images_folder),
+                    "tables": self._extract_pptx_slide_tables(slide, slide_num, pptx_tables_folder)
+                })
+        return slides
+
+    def _get_page_ranges(self, page_count):
+        """
+        Splits the pages of a PDF into the (start, stop) ranges handed to the page workers.
+        Args:
+            page_count (int): The number of pages in the PDF.
+
+        Returns:
+            list: The 0-based, half-open page ranges in page order; a single range when page workers are disabled.
+        """
+        if not self.page_workers or self.page_workers <= 1:
+            return [(0, page_count)]
+        return [(start, min(start + self.pages_per_chunk, page_count))
+                for start in range(0, page_count, self.pages_per_chunk)] or [(0, 0)]
+
+    def _map_page_ranges(self, range_method, pdf_path, page_count, *args):
+        """
+        Runs a page range extraction method over every page range of a PDF and concatenates the results in page order.
+        Ranges are extracted in worker processes when page workers are enabled, and in this process otherwise.
+
+        Args:
+            range_method (callable): A bound method taking (pdf_path, start, stop, *args) and returning a list.
+            pdf_path (str): The file path to the PDF document.
+            page_count (int): The number of pages in the PDF.
+            *args: Extra arguments passed on to the range method.
+
+        Returns:
+            list: The merged results of every page range.
+        """
+        page_ranges = self._get_page_ranges(page_count)
+        if len(page_ranges) == 1:
+            return range_method(pdf_path, 0, page_count, *args)
+
+        results = []
+        with ProcessPoolExecutor(max_workers=self.page_workers) as executor:
+            futures = [executor.submit(self._run_page_range, range_method.__name__, pdf_path, start, stop, *args)
+                       for start, stop in page_ranges]
+            for future in futures:  # Futures are kept in page order, so results merge back in order
+                results.extend(self._merge_page_range(future.result()))
+        return results
+
+    def _run_page_range(self, method_name, *args):
+        """
+        Runs a page range extraction method in a page worker. The page errors recorded by the worker's copy of
+        the extractor are returned with the results, since they would otherwise stay in the worker.
+
+        Args:
+            method_name (str): The name of the range method, e.g. '_extract_pdf_text_range'.
+            *args: The arguments of the range method.
+
+        Returns:
+            tuple: The results of the range method and the page errors of the range.
+        """
+        self.page_errors = []
+        return getattr(self, method_name)(*args), self.page_errors
+
+    def _merge_page_range(self, range_result):
+        """
+        Keeps the page errors of a page range returned by _run_page_range and returns its results.
+        """
+        results, page_errors = range_result
+        self.page_errors.extend(page_errors)
+        return results
+
+    def _record_page_error(self, page_num, stage, error):
+        """
+        Records a stage of a PDF page that failed, logs it, and counts it as a 'page_errors' metric.
+        Args:
+            page_num (int): The 0-based index of the page.
+            stage (str): The stage that failed: 'text', 'links', 'images', or 'tables'.
+            error (ExtractionError): The error of the stage.
+        """
+        self.page_errors.append({"page_number": page_num + 1, "stage": stage, "code": error.code, "message": error.message})
+        instrumentation.increment("page_errors")
+        logger.warning("Skipped %s: %s", error.filepath, error.message)
+
+    def _extract_pptx_all(self, presentation):
+        """
+        Extracts every content type from a PPTX file in one walk over its slides.
+        Args:
+            presentation (Presentation): The loaded PPTX file object from python-pptx.
+
+        Returns:
+            dict: The extracted text, links, images, and tables of the presentation.
+        """
+        pptx_images_folder = os.path.join(self.output_folder, "images", "pptx")
+        pptx_tables_folder = os.path.join(self.output_folder, "tables", "pptx")
+        os.makedirs(pptx_images_folder, exist_ok=True)  # Ensure the output directories exist
+        os.makedirs(pptx_tables_folder, exist_ok=True)
+
+        extracted = {"text": [], "links": [], "images": [], "tables": []}
+        instrumentation.increment("pages", len(presentation.slides))  # Slides are counted as pages
+        seen_links = set()  # Links are de-duplicated across the whole presentation
+        for slide_num, slide in enumerate(presentation.slides):  # Visit each slide once for all content types
+            slide_text = self._extract_pptx_slide_text(slide, slide_num)
+            if slide_text:
+                extracted["text"].append(slide_text)
+            extracted["links"].extend(self._extract_pptx_slide_links(slide, slide_num, seen_links))
+            extracted["images"].extend(self._extract_pptx_slide_images(slide, slide_num, pptx_images_folder))
+            extracted["tables"].extend(self._extract_pptx_slide_tables(slide, slide_num, pptx_tables_folder))
+
+        return extracted
+
+    def _streams(self):
+        """
+        Returns whether the loaded file is read with the streaming reader instead of python-docx or python-pptx.
+        """
+        return self.streaming and isinstance(self.loader, (DOCXLoader, PPTLoader))
+
+    def _extract_streamed(self, contents):
+        """
+        Extracts the given content types of a DOCX or PPTX file with the streaming reader.
+        Args:
+            contents (tuple): The content types to extract, e.g. ('text', 'links', 'images', 'tables').
+
+        Returns:
+            dict: The records of each content type, identical to those of the python-docx and python-pptx paths.
+        """
+        extracted = {content: [] for content in contents}
+        for content, record in self._iter_streamed(contents):
+            extracted[content].append(record)
+        return self._flush_artifacts(extracted)
+
+    @instrumented()
+    def _iter_streamed(self, contents):
+        """
+        Reads a DOCX or PPTX file part by part and yields its records as they are reached. Only the current
+        block (a paragraph or table of a DOCX body, a shape of a slide) is held in memory, and images are
+        copied from the zip archive as streams.
+
+        Args:
+            contents (tuple): The content types to extract.
+
+        Yields:
+            tuple: The content type and the record, in document order within each content type.
+        """
+        file_type = self.loader.file_extension.lstrip('.')
+        images_folder = os.path.join(self.output_folder, "images", file_type)
+        tables_folder = os.path.join(self.output_folder, "tables", file_type)
+        if "images" in contents:
+            os.makedirs(images_folder, exist_ok=True)  # Ensure the output directories exist
+        if "tables" in contents:
+            os.makedirs(tables_folder, exist_ok=True)
+
+        with self._open_document() as handle:
+            if isinstance(self.loader, DOCXLoader):
+                yield from self._stream_docx(handle.package, contents, images_folder, tables_folder)
+            else:
+                yield from self._stream_pptx(handle.package, contents, images_folder, tables_folder)
+
+    def _stream_docx(self, package, contents, images_folder, tables_folder):
+        """
+        Streams the records of a DOCX package: the hyperlinks from the relationships of the document part, then
+        the paragraphs, inline images, and tables of the body, one body block at a time.
+        Args:
+            package (OOXMLPackage): The open DOCX package.
+            contents (tuple): The content types to extract.
+            images_folder (str): The directory the image files are written to.
+            tables_folder (str): The directory the CSV files are written to.
+
+        Yields:
+            tuple: The content type and the record.
+        """
+        document_partname = package.main_partname()
+        document_rels = package.rels(document_partname)
+        if "links" in contents:
+            extracted_links = set()  # Hyperlinks are de-duplicated, as in _extract_docx_links
+            for rel in document_rels.values():
+                if "hyperlink" in rel.reltype and rel.target_ref not in extracted_links:
+                    extracted_links.add(rel.target_ref)
+                    yield "links", {"link": rel.target_ref}
+
+        styles = self._read_docx_styles(package, document_partname) if "text" in contents else None
+        image_index = table_index = 0
+        for block in package.iter_children(document_partname, "w:body"):
+            if "images" in contents:
+                for inline in block.iter(ooxml.qn("wp:inline")):
+                    if not self._is_docx_inline_shape(inline):
+                        continue
+                    image_index += 1
+                    record = self._stream_docx_image(package, document_rels, inline, image_index, images_folder)
+                    if record is not None:
+                        yield "images", record
+            if block.tag == ooxml.qn("w:p") and "text" in contents:
+                text = self._get_docx_paragraph_text(block)
+                if text.strip():
+                    yield "text", self._make_text_line(clean_text(text), self._get_docx_style_name(block, styles))
+            elif block.tag == ooxml.qn("w:tbl") and "tables" in contents:
+                table_index += 1
+                csv_filename = f"docx_table_{table_index}.csv"
+                yield "tables", {
+                    "table_index": table_index,
+                    **self._save_table(self._get_docx_table_rows(block), tables_folder, csv_filename)
+                }
+
+    @staticmethod
+    def _read_docx_styles(package, document_partname):
+        """
+        Reads the styles part of a DOCX package.
+        Returns:
+            tuple: The (type, UI name) of each style id, and a 1-tuple holding the name of the default paragraph
+                   style, or None if the document has none.
+        """
+        styles, default = {}, None
+        styles_partname = package.related_partname(document_partname, "/styles")
+        if styles_partname is None:
+            return styles, default
+        for style in package.parse_part(styles_partname).iterfind(ooxml.qn("w:style")):
+            style_type = style.get(ooxml.qn("w:type"))  # A style without a type never matches a paragraph, as in python-docx
+            name = style.find(ooxml.qn("w:name"))
+            name = BabelFish.internal2ui(name.get(ooxml.qn("w:val"))) if name is not None else None
+            styles.setdefault(style.get(ooxml.qn("w:styleId")), (style_type, name))
+            if style_type == "paragraph" and style.get(ooxml.qn("w:default")) in ("1", "true", "on"):
+                default = (name,)  # The last default style wins, as in python-docx
+        return styles, default
+
+    @staticmethod
+    def _get_docx_style_name(paragraph, styles):
+        """
+        Returns the style name of a paragraph the way python-docx resolves it: its own paragraph style, else the
+        default paragraph style, else 'Normal'.
+        """
+        styles, default = styles
+        style_id = paragraph.find("w:pPr/w:pStyle", ooxml.NAMESPACES)
+        style = styles.get(style_id.get(ooxml.qn("w:val"))) if style_id is not None else None
+        if style is not None and style[0] == "paragraph":
+            return style[1]
+        return default[0] if default else "Normal"
+
+    # Text equivalent of the run content elements of a DOCX paragraph, as in python-docx.
+    DOCX_RUN_TEXT = {ooxml.qn("w:tab"): "\t", ooxml.qn("w:ptab"): "\t", ooxml.qn("w:cr"): "\n",
+                     ooxml.qn("w:noBreakHyphen"): "-"}
+
+    def _get_docx_run_text(self, run):
+        """
+        Returns the text of a 'w:r' element, with tabs and line breaks translated as python-docx does.
+        """
+        text = []
+        for child in run:
+            if child.tag == ooxml.qn("w:t"):
+                text.append(child.text or "")
+            elif child.tag == ooxml.qn("w:br"):  # Page and column breaks have no text
+                text.append("\n" if child.get(ooxml.qn("w:type"), "textWrapping") == "textWrapping" else "")
+            else:
+                text.append(self.DOCX_RUN_TEXT.get(child.tag, ""))
+        return "".join(text)
+
+    def _get_docx_paragraph_text(self, paragraph):
+        """
+        Returns the text of a 'w:p' element: its runs and the runs of its hyperlinks.
+        """
+        text = []
+        for child in paragraph:
+            if child.tag == ooxml.qn("w:r"):
+                text.append(self._get_docx_run_text(child))
+            elif child.tag == ooxml.qn("w:hyperlink"):
+                text.extend(self._get_docx_run_text(run) for run in child.iterfind(ooxml.qn("w:r")))
+        return "".join(text)
+
+    def _get_docx_table_rows(self, table):
+        """
+        Returns the cell texts of a 'w:tbl' element row by row, the way python-docx reports row.cells:
+        a cell spanning several grid columns is repeated for each of them, and a vertically merged cell
+        repeats the text of the cell above.
+        """
+        rows = []
+        previous = {}  # Cell texts of the previous row by grid offset
+        for tr in table.iterfind(ooxml.qn("w:tr")):
+            grid_before = tr.find("w:trPr/w:gridBefore", ooxml.NAMESPACES)
+            grid_offset = int(grid_before.get(ooxml.qn("w:val"))) if grid_before is not None else 0
+            row, current = [], {}
+            for tc in tr.iterfind(ooxml.qn("w:tc")):
+                grid_span = tc.find("w:tcPr/w:gridSpan", ooxml.NAMESPACES)
+                grid_span = int(grid_span.get(ooxml.qn("w:val"))) if grid_span is not None else 1
+                v_merge = tc.find("w:tcPr/w:vMerge", ooxml.NAMESPACES)
+                if v_merge is not None and v_merge.get(ooxml.qn("w:val"), "continue") == "continue" \
+                        and grid_offset in previous:
+                    texts = previous[grid_offset]
+                else:
+                    text = "\n".join(self._get_docx_paragraph_text(p) for p in tc.iterfind(ooxml.qn("w:p")))
+                    texts = [text] * grid_span
+                current[grid_offset] = texts
+                row.extend(texts)
+                grid_offset += grid_span
+            rows.append(row)
+            previous = current
+        return rows
+
+    @staticmethod
+    def _is_docx_inline_shape(inline):
+        """
+        Returns whether a 'wp:inline' element is one of python-docx's inline shapes, i.e. it sits in a
+        drawing of a run of a paragraph.
+        """
+        drawing = inline.getparent()
+        run = drawing.getparent() if drawing is not None else None
+        paragraph = run.getparent() if run is not None else None
+        return drawing.tag == ooxml.qn("w:drawing") and run is not None and run.tag == ooxml.qn("w:r") \
+            and paragraph is not None and paragraph.tag == ooxml.qn("w:p")
+
+    def _stream_docx_image(self, package, document_rels, inline, image_index, images_folder):
+        """
+        Saves (or describes, in metadata mode) the picture of a DOCX inline shape.
+        Returns:
+            dict | None: The image record, or None if the inline shape holds no embedded picture.
+        """
+        blip = inline.find("a:graphic/a:graphicData/pic:pic/pic:blipFill/a:blip", ooxml.NAMESPACES)
+        rel = document_rels.get(blip.get(ooxml.qn("r:embed"))) if blip is not None else None
+        if rel is None or rel.is_external:
+            return None
+        image_format = package.content_type(rel.target_partname).split('/')[-1]
+        if self.image_mode == "metadata":
+            image = DocxImage.from_blob(package.read_part(rel.target_partname))
+            extent = inline.find(ooxml.qn("wp:extent"))
+            return {
+                "image_index": image_index,
+                "rel_id": rel.rId,
+                "image_format": image_format,
+                "width": image.px_width,
+                "height": image.px_height,
+                "display_width": int(extent.get("cx")),
+                "display_height": int(extent.get("cy"))
+            }
+        image_filename = f"docx_image_{image_index}.{image_format}"
+        saved_image = self._save_package_image(package, rel.target_partname, image_format, images_folder, image_filename)
+        return self._make_image_record(None, None, image_format, saved_image)
+
+    def _stream_pptx(self, package, contents, images_folder, tables_folder):
+        """
+        Streams the records of a PPTX package slide by slide, parsing each slide one shape at a time.
+        Args:
+            package (OOXMLPackage): The open PPTX package.
+            contents (tuple): The content types to extract.
+            images_folder (str): The directory the image files are written to.
+            tables_folder (str): The directory the CSV files are written to.
+
+        Yields:
+            tuple: The content type and the record.
+        """
+        presentation_partname = package.main_partname()
+        presentation_rels = package.rels(presentation_partname)
+        slide_partnames = [presentation_rels[slide_id.get(ooxml.qn("r:id"))].target_partname
+                           for slide_id in package.parse_part(presentation_partname).iterfind("p:sldIdLst/p:sldId", ooxml.NAMESPACES)]
+        instrumentation.increment("pages", len(slide_partnames))  # Slides are counted as pages
+        seen_links = set()  # Links are de-duplicated across the whole presentation
+        for slide_num, slide_partname in enumerate(slide_partnames):
+            slide_rels = package.rels(slide_partname)
+            slide = {content: [] for content in contents}
+            for shape in package.iter_children(slide_partname, "p:spTree"):
+                if shape.tag == ooxml.qn("p:sp") and ("text" in contents or "links" in contents):
+                    self._stream_pptx_shape_text(shape, slide_num, slide_rels, slide, seen_links)
+                elif shape.tag == ooxml.qn("p:pic") and "images" in contents:
+                    record = self._stream_pptx_picture(package, shape, slide_num, slide_rels, images_folder)
+                    if record is not None:
+                        slide["images"].append(record)
+                elif shape.tag == ooxml.qn("p:graphicFrame") and "tables" in contents:
+                    graphic_data = shape.find("a:graphic/a:graphicData", ooxml.NAMESPACES)
+                    if graphic_data is not None and graphic_data.get("uri") == PPTX_TABLE_URI:
+                        table = graphic_data.find(ooxml.qn("a:tbl"))
+                        shape_id = shape.find("p:nvGraphicFramePr/p:cNvPr", ooxml.NAMESPACES).get("id")
+                        csv_filename = f"pptx_table_{slide_num+1}_{shape_id}.csv"
+                        slide["tables"].append({
+                            "slide_number": slide_num + 1,
+                            **self._save_table(self._get_pptx_table_rows(table), tables_folder, csv_filename)
+                        })
+
+            if slide.get("text"):  # Only slides with text get a text record
+                yield "text", self._make_text_record("slide_number", slide_num + 1, slide.pop("text"))
+            for content in ("links", "images", "tables"):
+                for record in slide.get(content, []):
+                    yield content, record
+
+    def _stream_pptx_shape_text(self, shape, slide_num, slide_rels, slide, seen_links):
+        """
+        Collects the styled paragraphs and the hyperlinks of a 'p:sp' shape, as _extract_pptx_slide_text and
+        _extract_pptx_slide_links do for python-pptx shapes.
+        Args:
+            shape (lxml.etree._Element): The 'p:sp' element.
+            slide_num (int): The 0-based index of the slide.
+            slide_rels (dict): The relationships of the slide part.
+            slide (dict): The records of the slide by content type; updated in place.
+            seen_links (set): (link, linked text) pairs already extracted; updated in place.
+        """
+        for paragraph in shape.iterfind("p:txBody/a:p", ooxml.NAMESPACES):
+            paragraph_text, linked_text, link = "", "", None
+            style = "normal"  # Default style
+            for run in paragraph.iterfind(ooxml.qn("a:r")):
+                run_text = run.findtext(ooxml.qn("a:t")) or ""
+                paragraph_text += run_text
+                properties = run.find(ooxml.qn("a:rPr"))
+                if properties is None:
+                    continue
+                # Bold text or a font size above 200000 EMU (sz is in hundredths of a point, 127 EMU each)
+                size = properties.get("sz")
+                if properties.get("b") in ("1", "true") or (size and int(size) * 127 > 200000):
+                    style = "Heading"
+                click = properties.find(ooxml.qn("a:hlinkClick"))
+                rel = slide_rels.get(click.get(ooxml.qn("r:id"))) if click is not None else None
+                if rel is not None and rel.target_ref:
+                    link = link or rel.target_ref
+                    linked_text += run_text
+
+            cleaned_text = clean_text(paragraph_text)
+            if "text" in slide and cleaned_text:
+                slide["text"].append(self._make_text_line(cleaned_text, style))
+            if "links" in slide and link and linked_text and (link, clean_text(linked_text)) not in seen_links:
+                seen_links.add((link, clean_text(linked_text)))
+                slide["links"].append({"slide_number": slide_num + 1, "linked_text": clean_text(linked_text), "link": link})
+
+    @staticmethod
+    def _get_pptx_table_rows(table):
+        """
+        Returns the cell texts of an 'a:tbl' element row by row, with paragraphs separated by newlines and line
+        breaks as vertical tabs, as python-pptx reports cell.text.
+        """
+        def paragraph_text(paragraph):
+            text = []
+            for child in paragraph:
+                if child.tag in (ooxml.qn("a:r"), ooxml.qn("a:fld")):
+                    text.append(child.findtext(ooxml.qn("a:t")) or "")
+                elif child.tag == ooxml.qn("a:br"):
+                    text.append("\v")
+            return "".join(text)
+
+        return [["\n".join(paragraph_text(p) for p in tc.iterfind("a:txBody/a:p", ooxml.NAMESPACES))
+                 for tc in tr.iterfind(ooxml.qn("a:tc"))]
+                for tr in table.iterfind(ooxml.qn("a:tr"))]
+
+    # File extension of each PIL image format, as python-pptx reports it in image.ext.
+    PPTX_IMAGE_EXTENSIONS = {"BMP": "bmp", "GIF": "gif", "JPEG": "jpg", "PNG": "png", "TIFF": "tiff", "WMF": "wmf"}
+
+    def _stream_pptx_picture(self, package, shape, slide_num, slide_rels, images_folder):
+        """
+        Saves (or describes, in metadata mode) the image of a 'p:pic' shape. Placeholder pictures and movies
+        are skipped, since python-pptx does not report them as pictures.
+        Returns:
+            dict | None: The image record, or None if the shape is not a picture with an embedded image.
+        """
+        if shape.find("p:nvPicPr/p:nvPr/p:ph", ooxml.NAMESPACES) is not None or \
+                shape.find("p:nvPicPr/p:nvPr/a:videoFile", ooxml.NAMESPACES) is not None:
+            return None
+        blip = shape.find("p:blipFill/a:blip", ooxml.NAMESPACES)
+        rel = slide_rels.get(blip.get(ooxml.qn("r:embed"))) if blip is not None else None
+        if rel is None or rel.is_external:
+            return None
+        shape_id = shape.find("p:nvPicPr/p:cNvPr", ooxml.NAMESPACES).get("id")
+        with package.open_part(rel.target_partname) as stream, PILImage.open(stream) as image:  # Reads the header only
+            image_format, size = self.PPTX_IMAGE_EXTENSIONS[image.format], image.size
+
+        if self.image_mode == "metadata":
+            offset = shape.find("p:spPr/a:xfrm/a:off", ooxml.NAMESPACES)
+            extent = shape.find("p:spPr/a:xfrm/a:ext", ooxml.NAMESPACES)
+            position = [int(offset.get("x")), int(offset.get("y"))] if offset is not None else [None, None]
+            position += [int(extent.get("cx")), int(extent.get("cy"))] if extent is not None else [None, None]
+            return {
+                "slide_number": slide_num + 1,
+                "shape_id": int(shape_id),
+                "rel_id": rel.rId,
+                "image_format": image_format,
+                "width": size[0],
+                "height": size[1],
+                "position": position
+            }
+        image_filename = f"pptx_image_{slide_num+1}_{shape_id}.{image_format}"
+        saved_image = self._save_package_image(package, rel.target_partname, image_format, images_folder, image_filename)
+        return self._make_image_record("slide_number", slide_num + 1, image_format, saved_image)
+
+    @instrumented()
+    def _save_package_image(self, package, partname, image_format, images_folder, image_filename):
+        """
+        Saves a media part of a DOCX or PPTX package. Without an image store or background writer the part is
+        copied from the zip archive to the image file as a stream; otherwise it is read and saved with _save_image.
+        Args:
+            package (OOXMLPackage): The open package.
+            partname (str): The partname of the media part.
+            image_format (str): The image file extension.
+            images_folder (str): The directory of position-based image files.
+            image_filename (str): The position-based filename of the image.
+
+        Returns:
+            dict: The 'image_filename' and 'image_path' of the saved image, and its 'image_hash' with an image store.
+        """
+        if self.image_store is not None or self.writer is not None:
+            return self._save_image(package.read_part(partname), image_format, images_folder, image_filename)
+        image_path = os.path.join(images_folder, image_filename)
+        with package.open_part(partname) as source, open(image_path, "wb") as image_file:
+            shutil.copyfileobj(source, image_file)
+        instrumentation.record_file(image_path)
+        return {"image_filename": image_filename, "image_path": image_path}
+
+    @instrumented()
+    def iter_text(self):
+        """
+        Yields the text of the loaded file one record at a time: one page for PDF, one slide for PPTX,
+        and one paragraph for DOCX. Only the current page or slide is held in memory.
+
+        Yields:
+            dict: The same records as extract_text, in the same order.
+        """
+        if self._streams():
+            yield from (record for _, record in self._iter_streamed(("text",)))
+            return
+
+        with self._open_document() as handle:
+            loaded_file = handle.document  # Pages and slides are loaded one at a time as they are reached
+
+            if isinstance(self.loader, PDFLoader):
+                for page_num, page in enumerate(loaded_file.pages()):
+                    yield self._extract_pdf_page_text(page, page_num)
+            elif isinstance(self.loader, DOCXLoader):
+                yield from self._iter_docx_text(loaded_file)
+            elif isinstance(self.loader, PPTLoader):
+                for slide_num, slide in enumerate(loaded_file.slides):
+                    slide_text = self._extract_pptx_slide_text(slide, slide_num)
+                    if slide_text:  # Skip slides without text, as extract_text does
+                        yield slide_text
+
+    @instrumented()
+    def iter_links(self):
+        """
+        Yields the hyperlinks of the loaded file one at a time, walking the document page by page or slide by slide.
+
+        Yields:
+            dict: The same records as extract_links, in the same order.
+        """
+        if self._streams():
+            yield from (record for _, record in self._iter_streamed(("links",)))
+            return
+
+        with self._open_document() as handle:
+            loaded_file = handle.document
+
+            if isinstance(self.loader, PDFLoader):
+                for page_num, page in enumerate(loaded_file.pages()):
+                    yield from self._extract_pdf_page_links(page, page_num)
+            elif isinstance(self.loader, DOCXLoader):
+                yield from self._extract_docx_links(loaded_file)
+            elif isinstance(self.loader, PPTLoader):
+                seen_links = set()
+                for slide_num, slide in enumerate(loaded_file.slides):
+                    yield from self._extract_pptx_slide_links(slide, slide_num, seen_links)
+
+    @instrumented()
+    def iter_images(self):
+        """
+        Yields the images of the loaded file one at a time, saving each image file as it is reached.
+
+        Yields:
+            dict: The same records as extract_images, in the same order.
+        """
+        if self._streams():
+            yield from (record for _, record in self._iter_streamed(("images",)))
+            self._flush_artifacts()
+            return
+
+        file_type = self.loader.file_extension.lstrip('.')
+        images_folder = os.path.join(self.output_folder, "images", file_type)  # Define the directory to store images
+        os.makedirs(images_folder, exist_ok=True)  # Ensure the directory exists
+
+        with self._open_document() as handle:
+            loaded_file = handle.document  # Load the file using the appropriate loader
+
+            if isinstance(self.loader, PDFLoader):
+                xref_cache = {}  # Images already extracted from this document, by xref
+                for page_num, page in enumerate(loaded_file.pages()):
+                    yield from self._extract_pdf_page_images(loaded_file, page, page_num, images_folder, xref_cache)
+            elif isinstance(self.loader, DOCXLoader):
+                yield from self._iter_docx_images(loaded_file, images_folder)
+            elif isinstance(self.loader, PPTLoader):
+                for slide_num, slide in enumerate(loaded_file.slides):
+                    yield from self._extract_pptx_slide_images(slide, slide_num, images_folder)
+        self._flush_artifacts()
+
+    @instrumented()
+    def iter_tables(self):
+        """
+        Yields the tables of the loaded file one at a time, saving each CSV file as it is reached.
+        For PDF files the cached layout of each page is released once its tables have been extracted.
+
+        Yields:
+            dict: The same records as extract_tables, in the same order.
+        """
+        if self._streams():
+            yield from (record for _, record in self._iter_streamed(("tables",)))
+            self._flush_artifacts()
+            return
+
+        file_type = self.loader.file_extension.lstrip('.')
+        tables_folder = os.path.join(self.output_folder, "tables", file_type)  # Define the directory to store CSV files
+        os.makedirs(tables_folder, exist_ok=True)  # Ensure the directory exists
+
+        with self._open_document() as handle:
+            loaded_file = handle.document  # Load the file using the appropriate loader
+
+            if isinstance(self.loader, PDFLoader):
+                self.table_pages_skipped = 0
+                for page_num, page in enumerate(loaded_file.pages()):  # The vector drawings checked by the pre-filter
+                    if self._skips_table_detection(page):
+                        continue
+                    layout_page = handle.layout.pages[page_num]
+                    yield from self._extract_pdf_page_tables(layout_page, page_num, tables_folder)
+                    layout_page.close()  # Drop the parsed layout objects of the page
+            elif isinstance(self.loader, DOCXLoader):
+                yield from self._iter_docx_tables(loaded_file, tables_folder)
+            elif isinstance(self.loader, PPTLoader):
+                for slide_num, slide in enumerate(loaded_file.slides):
+                    yield from self._extract_pptx_slide_tables(slide, slide_num, tables_folder)
+        self._flush_artifacts()
+
+    @instrumented()
     def extract_text(self):
         """
         Extracts text from a loaded file using the appropriate loader.
@@ -36,12 +1128,16 @@ class DataExtractor:
         if isinstance(self.loader, PDFLoader):
             return self._extract_pdf_text(self.loader.filepath)  # Special handling for PDF files directly from the path
 
-        loaded_file = self.loader.load_file(self.loader.filepath)  # Load file for DOCX or PPT
+        if self._streams():
+            return self._extract_streamed(("text",))["text"]
+
+        with self._open_document() as handle:
+            loaded_file = handle.document  # Load file for DOCX or PPT
 
-        if isinstance(self.loader, DOCXLoader):
-            return self._extract_docx_text(loaded_file)
-        elif isinstance(self.loader, PPTLoader):
-            return self._extract_pptx_text(loaded_file)
+            if isinstance(self.loader, DOCXLoader):
+                return self._extract_docx_text(loaded_file)
+            elif isinstance(self.loader, PPTLoader):
+                return self._extract_pptx_text(loaded_file)
 
     def _extract_pdf_text(self, pdf_path):
         """
@@ -51,47 +1147,102 @@ class DataExtractor:
         Returns:
             list: List of dictionaries with page numbers and content for each page.
         """
-        doc = fitz.open(pdf_path)  # Open the PDF document using PyMuPDF
-        text_data = []
+        with self.loader.open(pdf_path) as handle:  # Kept open for the page ranges extracted in this process
+            return self._map_page_ranges(self._extract_pdf_text_range, pdf_path, handle.page_count)
 
-        for page_num in range(len(doc)):
-            page = doc.load_page(page_num)  # Load each page individually
-            blocks = page.get_text("dict")["blocks"]  # Extract text in 'dict' format to get structured blocks
-            page_content = []
-            current_line = ""
-            current_style = None  # Style tracking variable
-
-            for block in blocks:
-                if "lines" in block:
-                    for line in block["lines"]:
-                        line_text = ""
-                        line_style = None
-
-                        for span in line["spans"]:
-                            font_size = span["size"]
-                            text = span["text"].strip()
-                            style = "Heading" if font_size > 14 else "normal"
-
-                            line_text += " " + text if line_text else text
-                            line_style = line_style or style
-
-                        # Continuously merge text or start new line based on style consistency
-                        if current_line and line_style == current_style:
-                            current_line += " " + line_text
-                        else:
-                            if current_line:  # Finish the current line and start a new one
-                                page_content.append({"text": current_line.strip(), "style": current_style})
-                            current_line = line_text
-                            current_style = line_style
-
-            # Ensure the last line of the page is added
-            if current_line:
-                page_content.append({"text": current_line.strip(), "style": current_style})
-
-            text_data.append({"page_number": page_num + 1, "content": page_content})
+    def _extract_pdf_text_range(self, pdf_path, start, stop):
+        """
+        Extracts the text of a range of pages from a PDF file. In a page worker the range is read through a
+        document handle of its own; in this process the open handle of the file is shared.
+        Args:
+            pdf_path (str): The file path to the PDF document.
+            start (int): The 0-based index of the first page to extract.
+            stop (int): The 0-based index of the page after the last page to extract.
+        Returns:
+            list: List of dictionaries with page numbers and content for each page of the range.
+        """
+        text_data = []
+        with self.loader.open(pdf_path) as handle:
+            doc = handle.document  # Open the PDF document using PyMuPDF
+            for page_num in range(start, stop):
+                page = doc.load_page(page_num)  # Load each page individually
+                text_data.append(self._extract_pdf_page_text(page, page_num))
 
         return text_data
 
+    @page_time_limit("text", lambda self, page_num: self._make_text_record("page_number", page_num + 1, []))
+    @instrumented()
+    def _extract_pdf_page_text(self, page, page_num):
+        """
+        Extracts the text of a single PDF page, merging consecutive lines that share the same style.
+        Args:
+            page (fitz.Page): The loaded PyMuPDF page.
+            page_num (int): The 0-based index of the page in the document.
+        Returns:
+            dict: The page number and the merged content of the page.
+        """
+        blocks = page.get_text("dict")["blocks"]  # Extract text in 'dict' format to get structured blocks
+        lines = [line for block in blocks if "lines" in block for line in block["lines"]]
+        heading_size = self._get_heading_size(lines)
+        page_content = []
+        # Lines of the same style are merged into one; their texts are collected and joined once the style changes
+        current_parts = []
+        current_style = None  # Style tracking variable
+        has_current_line = False
+
+        for line in lines:
+            spans = line["spans"]
+            if not spans:
+                line_text, line_style = "", None
+            else:
+                # The first span decides the style of the whole line
+                line_style = "Heading" if spans[0]["size"] > heading_size else "normal"
+                texts = [span["text"].strip() for span in spans]
+                if not texts[0]:  # Leave out the empty spans before the first text
+                    texts = list(itertools.dropwhile(operator.not_, texts))
+                line_text = " ".join(texts)
+
+            # Continuously merge text or start new line based on style consistency
+            if has_current_line and line_style == current_style:
+                current_parts.append(line_text)
+            else:
+                if has_current_line:  # Finish the current line and start a new one
+                    page_content.append(self._make_text_line(" ".join(current_parts).strip(), current_style))
+                current_parts = [line_text]
+                current_style = line_style
+                has_current_line = bool(line_text)
+
+        # Ensure the last line of the page is added
+        if has_current_line:
+            page_content.append(self._make_text_line(" ".join(current_parts).strip(), current_style))
+
+        return self._make_text_record("page_number", page_num + 1, page_content)
+
+    def _get_heading_size(self, lines):
+        """
+        Returns the font size above which a line of a PDF page is a heading. With the 'threshold' heading
+        detection this is the fixed HEADING_FONT_SIZE. With 'page' it is derived from the page's own font
+        sizes: the body size, i.e. the size of most of the page's characters, times HEADING_SIZE_RATIO.
+
+        Args:
+            lines (list): The text lines of the page, as returned in PyMuPDF's 'dict' format.
+
+        Returns:
+            float: The font size threshold in points.
+        """
+        if self.heading_detection != "page":
+            return HEADING_FONT_SIZE
+        characters = {}  # Number of characters set in each font size, rounded to a tenth of a point
+        for line in lines:
+            for span in line["spans"]:
+                size = round(span["size"], 1)
+                characters[size] = characters.get(size, 0) + len(span["text"].strip())
+        if not any(characters.values()):
+            return HEADING_FONT_SIZE
+        body_size = max(characters, key=lambda size: (characters[size], -size))  # Ties go to the smaller size
+        return body_size * HEADING_SIZE_RATIO
+
+    @instrumented()
     def _extract_docx_text(self, doc):
         """
         Extracts text from a DOCX file and returns a list of dictionaries,
@@ -102,12 +1253,22 @@ class DataExtractor:
         Returns:
             list: A list of dictionaries with keys 'text' and 'style' representing each paragraph's content and style name.
         """
-        # List comprehension to iterate over all paragraphs in the document,
-        # clean the text, and collect text and style name if the paragraph is not empty.
-        return [
-            {"text": clean_text(paragraph.text), "style": paragraph.style.name if paragraph.style else "Normal"}
-            for paragraph in doc.paragraphs if paragraph.text.strip()
-        ]
+        return list(self._iter_docx_text(doc))
+
+    def _iter_docx_text(self, doc):
+        """
+        Yields the non-empty paragraphs of a DOCX file one at a time with their style name.
+        Args:
+            doc (Document): The loaded DOCX file object from python-docx.
+
+        Yields:
+            dict: The cleaned 'text' and the 'style' name of each paragraph.
+        """
+        # Iterate over all paragraphs in the document, clean the text,
+        # and yield text and style name if the paragraph is not empty.
+        for paragraph in doc.paragraphs:
+            if paragraph.text.strip():
+                yield self._make_text_line(clean_text(paragraph.text), paragraph.style.name if paragraph.style else "Normal")
 
     def _extract_pptx_text(self, presentation):
         """
@@ -125,40 +1286,94 @@ class DataExtractor:
 
         # Loop through each slide in the presentation
         for slide_num, slide in enumerate(presentation.slides):
-            slide_content = []
-
-            # Check each shape in the slide; focus on those with text frames
-            for shape in slide.shapes:
-                if shape.has_text_frame:
-                    for paragraph in shape.text_frame.paragraphs:
-                        paragraph_text = ""
-                        style = "normal"  # Default style
-
-                        # Concatenate all runs in the paragraph to form the full text
-                        for run in paragraph.runs:
-                            paragraph_text += run.text
-
-                            # Determine style by checking if the text is bold or font size is significantly large
-                            if run.font.bold or (run.font.size and run.font.size > 200000):
-                                style = "Heading"
-
-                        # Clean text and filter out any paragraph that consists only of whitespace
-                        cleaned_text = clean_text(paragraph_text)
-                        if cleaned_text:
-                            slide_content.append({
-                                "text": cleaned_text,
-                                "style": style
-                            })
+            slide_text = self._extract_pptx_slide_text(slide, slide_num)
 
             # Only include slides that contain content to avoid empty entries
-            if slide_content:
-                text_data.append({
-                    "slide_number": slide_num + 1,
-                    "content": slide_content
-                })
+            if slide_text:
+                text_data.append(slide_text)
 
         return text_data
 
+    @instrumented()
+    def _extract_pptx_slide_text(self, slide, slide_num):
+        """
+        Extracts the text of a single slide, classifying each paragraph as a heading or normal text.
+        Args:
+            slide (Slide): The python-pptx slide object.
+            slide_num (int): The 0-based index of the slide in the presentation.
+
+        Returns:
+            dict | None: The slide number and its content, or None if the slide has no text.
+        """
+        slide_content = []
+
+        # Check each shape in the slide; focus on those with text frames
+        for shape in slide.shapes:
+            if shape.has_text_frame:
+                for paragraph in shape.text_frame.paragraphs:
+                    paragraph_text = ""
+                    style = "normal"  # Default style
+
+                    # Concatenate all runs in the paragraph to form the full text
+                    for run in paragraph.runs:
+                        paragraph_text += run.text
+
+                        # Determine style by checking if the text is bold or font size is significantly large
+                        if run.font.bold or (run.font.size and run.font.size > 200000):
+                            style = "Heading"
+
+                    # Clean text and filter out any paragraph that consists only of whitespace
+                    cleaned_text = clean_text(paragraph_text)
+                    if cleaned_text:
+                        slide_content.append(self._make_text_line(cleaned_text, style))
+
+        if not slide_content:
+            return None
+        return self._make_text_record("slide_number", slide_num + 1, slide_content)
+
+    def _make_text_line(self, text, style):
+        """
+        Builds the record of one line or paragraph of text.
+        Args:
+            text (str): The cleaned text.
+            style (str): The style name, e.g. 'Heading' or 'normal'.
+
+        Returns:
+            dict | TextLine: The 'text' and 'style' of the line, as a compact record with compact_records.
+        """
+        if self.compact_records:
+            return TextLine(text, style)
+        return {"text": text, "style": style}
+
+    def _make_text_record(self, location_key, location, content):
+        """
+        Builds the text record of a PDF page or PPTX slide.
+        Args:
+            location_key (str): 'page_number' or 'slide_number'.
+            location (int): The 1-based page or slide number.
+            content (list): The text lines of the page or slide.
+
+        Returns:
+            dict | PageText | SlideText: The page or slide number and its content, as a compact record with
+                                         compact_records.
+        """
+        if self.compact_records:
+            record_class = PageText if location_key == "page_number" else SlideText
+            return record_class(location, content)
+        return {location_key: location, "content": content}
+
+    def _make_cached_text_record(self, item):
+        """
+        Rebuilds a text record read back from the cache, as a DOCX line or a PDF page or PPTX slide, with the
+        record types of the current options, so a cache hit returns the same types as an extraction.
+        """
+        if "content" not in item:
+            return self._make_text_line(item["text"], item["style"])
+        location_key = "page_number" if "page_number" in item else "slide_number"
+        content = [self._make_text_line(line["text"], line["style"]) for line in item["content"]]
+        return self._make_text_record(location_key, item[location_key], content)
+
+    @instrumented()
     def extract_links(self):
         """
         Extracts hyperlinks from the currently loaded file using the appropriate loader.
@@ -168,38 +1383,93 @@ class DataExtractor:
         Returns:
             list: A list of dictionaries, each containing metadata about the hyperlinks found.
         """
-        loaded_file = self.loader.load_file(self.loader.filepath)
+        if self._streams():
+            return self._extract_streamed(("links",))["links"]
 
-        if isinstance(self.loader, PDFLoader):
-            return self._extract_pdf_links(loaded_file)
-        elif isinstance(self.loader, DOCXLoader):
-            return self._extract_docx_links(loaded_file)
-        elif isinstance(self.loader, PPTLoader):
-            return self._extract_pptx_links(loaded_file)
+        with self._open_document() as handle:
+            loaded_file = handle.document
+
+            if isinstance(self.loader, PDFLoader):
+                return self._extract_pdf_links(loaded_file)
+            elif isinstance(self.loader, DOCXLoader):
+                return self._extract_docx_links(loaded_file)
+            elif isinstance(self.loader, PPTLoader):
+                return self._extract_pptx_links(loaded_file)
 
-    def _extract_pdf_links(self, pdf_reader):
+    def _extract_pdf_links(self, doc):
         """
-        Extracts hyperlinks from a PDF file using annotations, which are often used to store hyperlink data.
+        Extracts hyperlinks from a PDF file, page by page, from the link annotations resolved by PyMuPDF.
         Args:
-            pdf_reader (fitz.Document): The loaded PDF document.
+            doc (fitz.Document): The loaded PDF document.
 
         Returns:
-            list: A list of dictionaries where each dictionary contains the page number and the hyperlink URL.
+            list: A list of dictionaries where each dictionary describes one link of a page.
         """
         links_data = []
-        for page_num, page in enumerate(pdf_reader.pages):
-            annotations = page.get('/Annots')  # Retrieve annotations from the page
-            if annotations:
-                for annotation in annotations:
-                    # Attempt to retrieve the hyperlink URI from the annotation
-                    uri = annotation.get_object().get('/A').get('/URI')
-                    if uri:
-                        links_data.append({
-                            "page_number": page_num + 1,  # Page numbers are indexed from 1 for user clarity
-                            "link": uri
-                        })
+        for page_num, page in enumerate(doc.pages()):
+            links_data.extend(self._extract_pdf_page_links(page, page_num))
         return links_data
 
+    @page_time_limit("links", lambda self, page_num: [])
+    @instrumented()
+    def _extract_pdf_page_links(self, page, page_num):
+        """
+        Extracts the links of a single PDF page: external URIs and internal GoTo links to another page,
+        including named destinations that resolve to a page. Other link kinds, such as launch actions and
+        links into other files, are skipped, as are link annotations without a target.
+
+        Args:
+            page (fitz.Page): The PyMuPDF page object.
+            page_num (int): The 0-based index of the page in the document.
+
+        Returns:
+            list: A list of dictionaries with the page number, the link (the URI, or '#page=N' for internal links),
+                  the anchor text under the link rectangle, the link type ('uri' or 'goto'), and the rectangle.
+                  Internal links also hold the 1-based 'target_page'.
+        """
+        links_data = []
+        words = None  # Words of the page, read once the first link is found
+        for link in page.get_links():  # Link annotations resolved by PyMuPDF, in page order
+            if link["kind"] == fitz.LINK_URI and link.get("uri"):
+                link_data = {"page_number": page_num + 1, "link": link["uri"]}  # Page numbers are indexed from 1 for user clarity
+                link_type = "uri"
+            elif link["kind"] in (fitz.LINK_GOTO, fitz.LINK_NAMED) and link.get("page", -1) >= 0:
+                link_data = {"page_number": page_num + 1, "link": f"#page={link['page'] + 1}"}
+                link_type = "goto"
+            else:
+                continue
+            if words is None:
+                words = page.get_text("words")
+            link_data["linked_text"] = self._get_anchor_text(words, link["from"])
+            link_data["link_type"] = link_type
+            link_data["rect"] = [round(value, 2) for value in link["from"]]
+            if link_type == "goto":
+                link_data["target_page"] = link["page"] + 1
+            links_data.append(link_data)
+        return links_data
+
+    @staticmethod
+    def _get_anchor_text(words, rect, min_overlap=0.5):
+        """
+        Returns the text of the words covered by a link rectangle. A word belongs to the link when at least
+        `min_overlap` of its area lies inside the rectangle, so neighbouring words that only touch its edge are left out.
+
+        Args:
+            words (list): The words of the page, as returned by page.get_text("words").
+            rect (fitz.Rect): The rectangle of the link.
+            min_overlap (float): The minimum fraction of a word's area inside the rectangle.
+
+        Returns:
+            str: The anchor text, in reading order.
+        """
+        anchor_words = []
+        for word in words:
+            word_rect = fitz.Rect(word[:4])
+            if not word_rect.is_empty and abs(word_rect & rect) >= min_overlap * abs(word_rect):
+                anchor_words.append(word[4])
+        return clean_text(" ".join(anchor_words))
+
+    @instrumented()
     def _extract_docx_links(self, doc):
         """
         Extracts hyperlinks from a DOCX file, focusing only on the URLs and ensuring no duplicates are stored.
@@ -233,46 +1503,72 @@ class DataExtractor:
             list: A list of dictionaries, each containing the slide number, linked text, and the hyperlink URL.
         """
         links_data = []  # Initialize the list to hold link data.
+        seen_links = set()  # Track (link, linked text) pairs already stored to avoid duplicate entries.
 
         # Iterate over all slides in the presentation.
         for slide_num, slide in enumerate(presentation.slides):
-            # Iterate over all shapes in the slide that have a text frame.
-            for shape in slide.shapes:
-                if shape.has_text_frame:
-                    # Check each paragraph in the text frame.
-                    for paragraph in shape.text_frame.paragraphs:
-                        linked_text = ""
-                        link = None
-
-                        # Check each run in the paragraph for hyperlinks.
-                        for run in paragraph.runs:
-                            if run.hyperlink and run.hyperlink.address:
-                                # Assign the first hyperlink address found and accumulate the text associated with the hyperlink.
-                                link = link or run.hyperlink.address
-                                linked_text += run.text
-
-                        # If a hyperlink was found and has associated text, store it, ensuring no duplicate entries.
-                        if link and linked_text and not any(d['link'] == link and d['linked_text'] == clean_text(linked_text) for d in links_data):
-                            links_data.append({
-                                "slide_number": slide_num + 1,  # 1-based index for user clarity.
-                                "linked_text": clean_text(linked_text),  # Cleaned text to ensure consistency.
-                                "link": link
-                            })
+            links_data.extend(self._extract_pptx_slide_links(slide, slide_num, seen_links))
+
+        return links_data
+
+    @instrumented()
+    def _extract_pptx_slide_links(self, slide, slide_num, seen_links):
+        """
+        Extracts the hyperlinks of a single slide, skipping links already seen on earlier slides.
+        Args:
+            slide (Slide): The python-pptx slide object.
+            slide_num (int): The 0-based index of the slide in the presentation.
+            seen_links (set): (link, linked text) pairs already extracted; updated in place.
+
+        Returns:
+            list: A list of dictionaries with the slide number, linked text, and the hyperlink URL.
+        """
+        links_data = []
+
+        # Iterate over all shapes in the slide that have a text frame.
+        for shape in slide.shapes:
+            if shape.has_text_frame:
+                # Check each paragraph in the text frame.
+                for paragraph in shape.text_frame.paragraphs:
+                    linked_text = ""
+                    link = None
+
+                    # Check each run in the paragraph for hyperlinks.
+                    for run in paragraph.runs:
+                        if run.hyperlink and run.hyperlink.address:
+                            # Assign the first hyperlink address found and accumulate the text associated with the hyperlink.
+                            link = link or run.hyperlink.address
+                            linked_text += run.text
+
+                    # If a hyperlink was found and has associated text, store it, ensuring no duplicate entries.
+                    if link and linked_text and (link, clean_text(linked_text)) not in seen_links:
+                        seen_links.add((link, clean_text(linked_text)))
+                        links_data.append({
+                            "slide_number": slide_num + 1,  # 1-based index for user clarity.
+                            "linked_text": clean_text(linked_text),  # Cleaned text to ensure consistency.
+                            "link": link
+                        })
 
         return links_data
 
+    @instrumented()
     def extract_images(self):
         """
         Extract images based on the file type of the loaded document. Determines the type of loader and
         delegates to the appropriate image extraction method.
         """
-        loaded_file = self.loader.load_file(self.loader.filepath)  # Load the file using the appropriate loader
+        if self._streams():
+            return self._extract_streamed(("images",))["images"]
+
         if isinstance(self.loader, PDFLoader):
-            return self._extract_pdf_images(self.loader.filepath)  # Extract images from PDF
-        elif isinstance(self.loader, DOCXLoader):
-            return self._extract_docx_images(loaded_file)  # Extract images from DOCX
-        elif isinstance(self.loader, PPTLoader):
-            return self._extract_pptx_images(loaded_file)  # Extract images from PPTX
+            return self._flush_artifacts(self._extract_pdf_images(self.loader.filepath))  # Extract images from PDF
+
+        with self._open_document() as handle:
+            loaded_file = handle.document  # Load the file using the appropriate loader
+            if isinstance(self.loader, DOCXLoader):
+                return self._flush_artifacts(self._extract_docx_images(loaded_file))  # Extract images from DOCX
+            elif isinstance(self.loader, PPTLoader):
+                return self._flush_artifacts(self._extract_pptx_images(loaded_file))  # Extract images from PPTX
 
     def _extract_pdf_images(self, pdf_path):
         """
@@ -284,29 +1580,142 @@ class DataExtractor:
             list: A list of dictionaries containing details about each extracted image.
         """
         images_data = []
-        doc = fitz.open(pdf_path)  # Open the PDF document using PyMuPDF
-        pdf_images_folder = os.path.join("output", "images", "pdf")  # Define the directory to store images
+        pdf_images_folder = os.path.join(self.output_folder, "images", "pdf")  # Define the directory to store images
         os.makedirs(pdf_images_folder, exist_ok=True)  # Ensure the directory exists
 
-        for page_num, page in enumerate(doc.pages()):  # Iterate through each page in the PDF
-            for image_index, image in enumerate(page.get_images(full=True)):  # Get all images from the page
-                xref = image[0]  # Reference number for the image
+        xref_cache = {}  # Images already extracted from this document, by xref
+        with self.loader.open(pdf_path) as handle:
+            doc = handle.document  # Open the PDF document using PyMuPDF
+            for page_num, page in enumerate(doc.pages()):  # Iterate through each page in the PDF
+                images_data.extend(self._extract_pdf_page_images(doc, page, page_num, pdf_images_folder, xref_cache))
+
+        return images_data
+
+    @page_time_limit("images", lambda self, page_num: [])
+    @instrumented()
+    def _extract_pdf_page_images(self, doc, page, page_num, pdf_images_folder, xref_cache):
+        """
+        Extracts the images of a single PDF page and saves them locally.
+        An image whose xref was already extracted from an earlier page is not extracted again: it is copied from
+        the file written the first time, or, with an image store, simply points at the shared file.
+
+        Args:
+            doc (fitz.Document): The PyMuPDF document the page belongs to.
+            page (fitz.Page): The loaded PyMuPDF page.
+            page_num (int): The 0-based index of the page in the document.
+            pdf_images_folder (str): The directory the image files are written to.
+            xref_cache (dict): The images already saved from this document, keyed by xref; updated in place.
+
+        Returns:
+            list: A list of dictionaries containing details about each extracted image.
+        """
+        if self.image_mode == "metadata":
+            return self._describe_pdf_page_images(page, page_num)
+
+        images_data = []
+        for image_index, image in enumerate(page.get_images(full=True)):  # Get all images from the page
+            xref = image[0]  # Reference number for the image
+            position_filename = f"pdf_image_{page_num+1}_{image_index+1}"  # Position-based name, without extension
+
+            if xref in xref_cache:
+                image_format, saved_image = xref_cache[xref]
+                if self.image_store is None:  # Every position gets its own file; copy it instead of re-extracting
+                    saved_image = self._copy_image(saved_image["image_path"], pdf_images_folder, f"{position_filename}.{image_format}")
+            else:
                 base_image = doc.extract_image(xref)  # Extract the image using its reference
-                image_filename = f"pdf_image_{page_num+1}_{image_index+1}.{base_image['ext']}"  # Create a filename
-                image_path = os.path.join(pdf_images_folder, image_filename)  # Create a full path for the image
+                image_format = base_image["ext"]
+                saved_image = self._save_image(base_image["image"], image_format, pdf_images_folder, f"{position_filename}.{image_format}")
+                xref_cache[xref] = (image_format, saved_image)
 
+            # Append image details to the list
+            images_data.append(self._make_image_record("page_number", page_num + 1, image_format, saved_image))
+        return images_data
+
+    @instrumented()
+    def _save_image(self, blob, image_format, images_folder, image_filename):
+        """
+        Saves image data to disk. Without an image store, the image is written to `images_folder` under the given
+        position-based filename. With an image store, it is written once under the SHA-256 of its content and
+        every later occurrence, from any page or document, reuses the existing file.
+
+        Args:
+            blob (bytes): The image data.
+            image_format (str): The image file extension, such as 'png' or 'jpeg'.
+            images_folder (str): The directory of position-based image files.
+            image_filename (str): The position-based filename of the image.
+
+        Returns:
+            dict: The 'image_filename' and 'image_path' of the saved image, and its 'image_hash' with an image store.
+        """
+        if self.image_store is None:
+            image_path = os.path.join(images_folder, image_filename)  # Create a full path for the image
+            if self.writer is not None:
+                self.writer.write_bytes(image_path, blob)  # Written in the background
+            else:
                 with open(image_path, "wb") as image_file:  # Write the image file to disk
-                    image_file.write(base_image["image"])  # Save the image data
+                    image_file.write(blob)
+                instrumentation.record_write(len(blob))
+            return {"image_filename": image_filename, "image_path": image_path}
+
+        image_hash = hashlib.sha256(blob).hexdigest()
+        image_filename = f"{image_hash}.{image_format}"
+        image_folder = os.path.join(self.image_store, image_hash[:2])  # Fan out to keep directories small
+        image_path = os.path.join(image_folder, image_filename)
+        if self.writer is not None:
+            if not os.path.exists(image_path) and not self.writer.is_pending(image_path):
+                os.makedirs(image_folder, exist_ok=True)
+                self.writer.write_bytes(image_path, blob, atomic=True)
+        elif not os.path.exists(image_path):
+            os.makedirs(image_folder, exist_ok=True)
+            # Write to a temporary file and rename, so concurrent workers never see a partial image
+            temp_path = f"{image_path}.{os.getpid()}.tmp"
+            with open(temp_path, "wb") as image_file:
+                image_file.write(blob)
+            os.replace(temp_path, image_path)
+            instrumentation.record_write(len(blob))
+        return {"image_filename": image_filename, "image_path": image_path, "image_hash": image_hash}
+
+    @instrumented()
+    def _copy_image(self, source_path, images_folder, image_filename):
+        """
+        Copies an image file that was already saved to a new position-based filename.
+        Args:
+            source_path (str): The path of the saved image.
+            images_folder (str): The directory of position-based image files.
+            image_filename (str): The position-based filename of the copy.
 
-                # Append image details to the list
-                images_data.append({
-                    "page_number": page_num + 1,
-                    "image_filename": image_filename,
-                    "image_format": base_image["ext"],
-                    "image_path": image_path
-                })
+        Returns:
+            dict: The 'image_filename' and 'image_path' of the copy.
+        """
+        image_path = os.path.join(images_folder, image_filename)
+        if self.writer is not None:
+            self.writer.copy_file(source_path, image_path)  # Waits for the source if it is still being written
+        else:
+            shutil.copyfile(source_path, image_path)
+            instrumentation.record_file(image_path)
+        return {"image_filename": image_filename, "image_path": image_path}
+
+    def _make_image_record(self, location_key, location, image_format, saved_image):
+        """
+        Builds the metadata record of an extracted image.
+        Args:
+            location_key (str | None): 'page_number' or 'slide_number', or None for DOCX images.
+            location (int | None): The 1-based page or slide number of the image.
+            image_format (str): The image file extension.
+            saved_image (dict): The result of _save_image or _copy_image.
 
-        return images_data
+        Returns:
+            dict: The image metadata.
+        """
+        record = {location_key: location} if location_key else {}
+        record.update({
+            "image_filename": saved_image["image_filename"],
+            "image_format": image_format,
+            "image_path": saved_image["image_path"]
+        })
+        if "image_hash" in saved_image:
+            record["image_hash"] = saved_image["image_hash"]
+        return record
 
     def _extract_docx_images(self, doc):
         """
@@ -317,28 +1726,37 @@ class DataExtractor:
         Returns:
             list: A list of dictionaries, each containing metadata about the extracted images.
         """
-        images_data = []
-        docx_images_folder = os.path.join("output", "images", "docx")
+        docx_images_folder = os.path.join(self.output_folder, "images", "docx")
         os.makedirs(docx_images_folder, exist_ok=True)  # Ensure the output directory exists
+        return list(self._iter_docx_images(doc, docx_images_folder))
+
+    @instrumented()
+    def _iter_docx_images(self, doc, docx_images_folder):
+        """
+        Extract the images of a DOCX file one at a time, saving each to the given directory.
+        Args:
+            doc (Document): The loaded DOCX document object.
+            docx_images_folder (str): The directory the image files are written to.
+
+        Yields:
+            dict: Metadata about each extracted image.
+        """
+        if self.image_mode == "metadata":
+            yield from self._describe_docx_images(doc)
+            return
 
         # Iterate through all inline shapes in the document that are images
         for i, shape in enumerate(doc.inline_shapes):
             # Access the binary data of the image
             image_part = doc.part.related_parts[shape._inline.graphic.graphicData.pic.blipFill.blip.embed]
-            image_filename = f"docx_image_{i+1}.{image_part.content_type.split('/')[-1]}"  # Construct filename
-            image_path = os.path.join(docx_images_folder, image_filename)  # Construct file path
+            image_format = image_part.content_type.split('/')[-1]
+            image_filename = f"docx_image_{i+1}.{image_format}"  # Construct filename
 
             # Write the image file to the disk
-            with open(image_path, "wb") as image_file:
-                image_file.write(image_part.blob)
+            saved_image = self._save_image(image_part.blob, image_format, docx_images_folder, image_filename)
 
-            # Append image details to the list for later use or reference
-            images_data.append({
-                "image_filename": image_filename,
-                "image_format": image_part.content_type.split('/')[-1],
-                "image_path": image_path
-            })
-        return images_data
+            # Yield image details for later use or reference
+            yield self._make_image_record(None, None, image_format, saved_image)
 
     def _extract_pptx_images(self, presentation):
         """
@@ -350,42 +1768,193 @@ class DataExtractor:
             list: A list of dictionaries detailing the images extracted from each slide.
         """
         images_data = []
-        pptx_images_folder = os.path.join("output", "images", "pptx")
+        pptx_images_folder = os.path.join(self.output_folder, "images", "pptx")
         os.makedirs(pptx_images_folder, exist_ok=True)  # Ensure the output directory exists
 
         # Iterate through each slide and its shapes to find images
         for slide_num, slide in enumerate(presentation.slides):
-            for shape in slide.shapes:
-                if shape.shape_type == 13:  # Picture type in PowerPoint
-                    image = shape.image
-                    image_filename = f"pptx_image_{slide_num+1}_{shape.shape_id}.{image.ext}"  # Construct filename
-                    image_path = os.path.join(pptx_images_folder, image_filename)  # Construct file path
-
-                    # Write the image file to the disk
-                    with open(image_path, "wb") as image_file:
-                        image_file.write(image.blob)
-
-                    # Append image details to the list for later use or reference
-                    images_data.append({
-                        "slide_number": slide_num + 1,
-                        "image_filename": image_filename,
-                        "image_format": image.ext,
-                        "image_path": image_path
-                    })
+            images_data.extend(self._extract_pptx_slide_images(slide, slide_num, pptx_images_folder))
         return images_data
 
+    @instrumented()
+    def _extract_pptx_slide_images(self, slide, slide_num, pptx_images_folder):
+        """
+        Extract the images of a single slide and save them to the given directory.
+        Args:
+            slide (Slide): The python-pptx slide object.
+            slide_num (int): The 0-based index of the slide in the presentation.
+            pptx_images_folder (str): The directory the image files are written to.
+
+        Returns:
+            list: A list of dictionaries detailing the images extracted from the slide.
+        """
+        if self.image_mode == "metadata":
+            return self._describe_pptx_slide_images(slide, slide_num)
+
+        images_data = []
+        for shape in slide.shapes:
+            if shape.shape_type == 13:  # Picture type in PowerPoint
+                image = shape.image
+                image_filename = f"pptx_image_{slide_num+1}_{shape.shape_id}.{image.ext}"  # Construct filename
+
+                # Write the image file to the disk
+                saved_image = self._save_image(image.blob, image.ext, pptx_images_folder, image_filename)
+
+                # Append image details to the list for later use or reference
+                images_data.append(self._make_image_record("slide_number", slide_num + 1, image.ext, saved_image))
+        return images_data
+
+    # Image format of each PDF image filter, as reported by PyMuPDF's extract_image; other images become PNG.
+    PDF_IMAGE_FORMATS = {"DCTDecode": "jpeg", "JPXDecode": "jpx", "JBIG2Decode": "jb2"}
+
+    def _describe_pdf_page_images(self, page, page_num):
+        """
+        Records the metadata of the images of a single PDF page without extracting or decoding them.
+        Args:
+            page (fitz.Page): The loaded PyMuPDF page.
+            page_num (int): The 0-based index of the page in the document.
+
+        Returns:
+            list: A list of dictionaries with the xref, format, pixel dimensions, and positions of each image.
+        """
+        images = page.get_images(full=True)
+        if not images:
+            return []
+
+        positions = {}  # Bounding boxes of each xref on the page, in display order
+        for info in page.get_image_info(xrefs=True):
+            positions.setdefault(info["xref"], []).append([round(value, 2) for value in info["bbox"]])
+
+        return [{
+            "page_number": page_num + 1,
+            "image_index": image_index + 1,
+            "xref": image[0],
+            "image_format": self.PDF_IMAGE_FORMATS.get(image[8], "png"),
+            "width": image[2],
+            "height": image[3],
+            "positions": positions.get(image[0], [])
+        } for image_index, image in enumerate(images)]
+
+    def _describe_docx_images(self, doc):
+        """
+        Records the metadata of the inline images of a DOCX file without writing them to disk.
+        Only the image header is read to get the pixel dimensions.
+
+        Args:
+            doc (Document): The loaded DOCX document object.
+
+        Yields:
+            dict: The relationship id, format, pixel dimensions, and displayed size (in EMU) of each image.
+        """
+        for i, shape in enumerate(doc.inline_shapes):
+            rel_id = shape._inline.graphic.graphicData.pic.blipFill.blip.embed
+            image_part = doc.part.related_parts[rel_id]
+            yield {
+                "image_index": i + 1,
+                "rel_id": rel_id,
+                "image_format": image_part.content_type.split('/')[-1],
+                "width": image_part.image.px_width,
+                "height": image_part.image.px_height,
+                "display_width": shape.width,
+                "display_height": shape.height
+            }
+
+    def _describe_pptx_slide_images(self, slide, slide_num):
+        """
+        Records the metadata of the pictures of a single slide without writing them to disk.
+        Only the image header is read to get the pixel dimensions.
+
+        Args:
+            slide (Slide): The python-pptx slide object.
+            slide_num (int): The 0-based index of the slide in the presentation.
+
+        Returns:
+            list: The relationship id, format, pixel dimensions, and position (in EMU) of each picture.
+        """
+        images_data = []
+        for shape in slide.shapes:
+            if shape.shape_type == 13:  # Picture type in PowerPoint
+                image = shape.image
+                width, height = image.size
+                images_data.append({
+                    "slide_number": slide_num + 1,
+                    "shape_id": shape.shape_id,
+                    "rel_id": shape._element.blip_rId,
+                    "image_format": image.ext,
+                    "width": width,
+                    "height": height,
+                    "position": [shape.left, shape.top, shape.width, shape.height]
+                })
+        return images_data
+
+    def materialize_image(self, record):
+        """
+        Saves a single image recorded in 'metadata' image mode. See materialize_images.
+        Args:
+            record (dict): A metadata record returned by extract_images or iter_images.
+
+        Returns:
+            dict: The image record as produced in 'extract' image mode.
+        """
+        return self.materialize_images([record])[0]
+
+    @instrumented()
+    def materialize_images(self, records):
+        """
+        Saves images recorded in 'metadata' image mode, on demand. The document is opened once for all
+        the records, and each image is saved exactly as it would have been in 'extract' image mode.
+
+        Args:
+            records (list): Metadata records returned by extract_images or iter_images for the loaded file.
+
+        Returns:
+            list: The image records as produced in 'extract' image mode, in the same order.
+        """
+        file_type = self.loader.file_extension.lstrip('.')
+        images_folder = os.path.join(self.output_folder, "images", file_type)
+        os.makedirs(images_folder, exist_ok=True)
+        materialized = []
+
+        with self._open_document() as handle:
+            loaded_file = handle.document
+            for record in records:
+                if isinstance(self.loader, PDFLoader):
+                    base_image = loaded_file.extract_image(record["xref"])
+                    image_format = base_image["ext"]
+                    image_filename = f"pdf_image_{record['page_number']}_{record['image_index']}.{image_format}"
+                    saved_image = self._save_image(base_image["image"], image_format, images_folder, image_filename)
+                    materialized.append(self._make_image_record("page_number", record["page_number"], image_format, saved_image))
+                elif isinstance(self.loader, DOCXLoader):
+                    image_part = loaded_file.part.related_parts[record["rel_id"]]
+                    image_filename = f"docx_image_{record['image_index']}.{record['image_format']}"
+                    saved_image = self._save_image(image_part.blob, record["image_format"], images_folder, image_filename)
+                    materialized.append(self._make_image_record(None, None, record["image_format"], saved_image))
+                elif isinstance(self.loader, PPTLoader):
+                    slide = loaded_file.slides[record["slide_number"] - 1]
+                    image_part = slide.part.related_part(record["rel_id"])
+                    image_filename = f"pptx_image_{record['slide_number']}_{record['shape_id']}.{record['image_format']}"
+                    saved_image = self._save_image(image_part.blob, record["image_format"], images_folder, image_filename)
+                    materialized.append(self._make_image_record("slide_number", record["slide_number"], record["image_format"], saved_image))
+        return self._flush_artifacts(materialized)
+
+    @instrumented()
     def extract_tables(self):
         """
         Extract tables based on the file type of the loaded document. Determines the type of loader and
         delegates to the appropriate table extraction method.
         """
-        loaded_file = self.loader.load_file(self.loader.filepath)  # Load the file using the appropriate loader
+        if self._streams():
+            return self._extract_streamed(("tables",))["tables"]
+
         if isinstance(self.loader, PDFLoader):
-            return self._extract_pdf_tables(self.loader.filepath)  # Extract tables from PDF
-        elif isinstance(self.loader, DOCXLoader):
-            return self._extract_docx_tables(loaded_file)  # Extract tables from DOCX
-        elif isinstance(self.loader, PPTLoader):
-            return self._extract_pptx_tables(loaded_file)  # Extract tables from PPTX
+            return self._flush_artifacts(self._extract_pdf_tables(self.loader.filepath))  # Extract tables from PDF
+
+        with self._open_document() as handle:
+            loaded_file = handle.document  # Load the file using the appropriate loader
+            if isinstance(self.loader, DOCXLoader):
+                return self._flush_artifacts(self._extract_docx_tables(loaded_file))  # Extract tables from DOCX
+            elif isinstance(self.loader, PPTLoader):
+                return self._flush_artifacts(self._extract_pptx_tables(loaded_file))  # Extract tables from PPTX
 
     def _extract_pdf_tables(self, pdf_path):
         """
@@ -398,64 +1967,204 @@ class DataExtractor:
         Returns:
             list: A list of dictionaries containing metadata about the extracted tables and their CSV file paths.
         """
-        tables_data = []  # List to store metadata about the extracted tables
-        pdf_tables_folder = os.path.join("output", "tables", "pdf")  # Define the directory to store CSV files
+        pdf_tables_folder = os.path.join(self.output_folder, "tables", "pdf")  # Define the directory to store CSV files
         os.makedirs(pdf_tables_folder, exist_ok=True)  # Ensure the directory exists
 
-        with pdfplumber.open(pdf_path) as pdf:  # Open the PDF with pdfplumber
-            for page_num, page in enumerate(pdf.pages):  # Iterate through each page in the PDF
-                tables = page.extract_tables()  # Extract all tables found on the current page
-                for table_index, table in enumerate(tables):  # Iterate through each table
-                    csv_filename = f"pdf_table_{page_num+1}_{table_index+1}.csv"  # Create a unique filename for the CSV
-                    csv_path = os.path.join(pdf_tables_folder, csv_filename)  # Create the full path for the CSV file
-
-                    # Write the table data to a CSV file
-                    with open(csv_path, 'w', newline='', encoding='utf-8') as csvfile:
-                        writer = csv.writer(csvfile)
-                        writer.writerows(table)  # Write each row of the table to the CSV file
-
-                    # Store metadata about the table in the list
-                    tables_data.append({
-                        "page_number": page_num + 1,  # Page number (1-indexed for readability)
-                        "table_index": table_index + 1,  # Table index (1-indexed for readability)
-                        "csv_filename": csv_filename,
-                        "csv_path": csv_path
-                    })
+        self.table_pages_skipped = 0
+        with self.loader.open(pdf_path) as handle:  # Kept open for the page ranges extracted in this process
+            skipped_pages = self._get_table_free_pages(handle.document)
+            return self._map_page_ranges(self._extract_pdf_tables_range, pdf_path, handle.page_count, pdf_tables_folder,
+                                         skipped_pages)
 
+    def _extract_pdf_tables_range(self, pdf_path, start, stop, pdf_tables_folder, skipped_pages=frozenset()):
+        """
+        Extracts the tables of a range of pages from a PDF file. In a page worker the range is read through a
+        document handle of its own; in this process the open handle of the file is shared.
+        Args:
+            pdf_path (str): The file path to the PDF document.
+            start (int): The 0-based index of the first page to extract.
+            stop (int): The 0-based index of the page after the last page to extract.
+            pdf_tables_folder (str): The directory the CSV files are written to.
+            skipped_pages (frozenset): The 0-based indices of the pages the table pre-filter ruled out.
+
+        Returns:
+            list: A list of dictionaries containing metadata about the extracted tables and their CSV file paths.
+        """
+        tables_data = []  # List to store metadata about the extracted tables
+
+        with self.loader.open(pdf_path) as handle:
+            for page_num in range(start, stop):  # Iterate through each page of the range
+                if page_num in skipped_pages:
+                    continue
+                # pdfplumber opens the PDF on the first page that is not skipped
+                tables_data.extend(self._extract_pdf_page_tables(handle.layout.pages[page_num], page_num, pdf_tables_folder))
+
+        return self._flush_artifacts(tables_data)  # A page worker returns only once its CSV files are written
+
+    def _get_table_free_pages(self, doc):
+        """
+        Finds the pages of a PDF document that the table pre-filter rules out.
+        Args:
+            doc (fitz.Document): The PyMuPDF document.
+
+        Returns:
+            frozenset: The 0-based indices of the pages whose table detection is skipped.
+        """
+        return frozenset(page_num for page_num, page in enumerate(doc.pages()) if self._skips_table_detection(page))
+
+    @instrumented()
+    def _skips_table_detection(self, page):
+        """
+        Checks a PDF page with the table pre-filter and counts it when its table detection is skipped.
+        Args:
+            page (fitz.Page): The PyMuPDF page.
+
+        Returns:
+            bool: True if the pre-filter is enabled and the page cannot contain a table.
+        """
+        if not self.table_prefilter or self._may_contain_tables(page):
+            return False
+        self.table_pages_skipped += 1
+        instrumentation.increment("table_pages_skipped")
+        return True
+
+    @staticmethod
+    def _may_contain_tables(page):
+        """
+        Cheaply decides whether pdfplumber's table detection could find a table on a PDF page, using the vector
+        drawings listed by PyMuPDF instead of parsing the page layout. The horizontal and vertical segments of
+        lines and rectangles are collected, and the page can only hold a table if they cross at enough points
+        to form two cells. Text alone never forms a table with the default line-based settings. Pages with
+        curves are always detected, since pdfplumber also builds edges from curve segments.
+
+        Args:
+            page (fitz.Page): The PyMuPDF page.
+
+        Returns:
+            bool: False if the page cannot contain a table, True if it may.
+        """
+        horizontal, vertical = [], []
+        for drawing in page.get_cdrawings():
+            for item in drawing["items"]:
+                if item[0] == "l":
+                    (x0, y0), (x1, y1) = item[1], item[2]
+                    if abs(y0 - y1) <= 1:
+                        horizontal.append((min(x0, x1), max(x0, x1), y0))
+                    elif abs(x0 - x1) <= 1:
+                        vertical.append((x0, min(y0, y1), max(y0, y1)))
+                elif item[0] in ("re", "qu"):
+                    x0, y0, x1, y1 = fitz.Quad(item[1]).rect if item[0] == "qu" else fitz.Rect(item[1])
+                    horizontal.extend([(x0, x1, y0), (x0, x1, y1)])
+                    vertical.extend([(x0, y0, y1), (x1, y0, y1)])
+                else:
+                    return True  # Curve segments are not inspected
+
+        tolerance = TABLE_EDGE_TOLERANCE
+        intersections = 0
+        for x0, x1, y in horizontal:
+            for x, y0, y1 in vertical:
+                if x0 - tolerance <= x <= x1 + tolerance and y0 - tolerance <= y <= y1 + tolerance:
+                    intersections += 1
+                    if intersections >= MIN_TABLE_INTERSECTIONS:
+                        return True
+        return False
+
+    @page_time_limit("tables", lambda self, page_num: [])
+    @instrumented()
+    def _extract_pdf_page_tables(self, page, page_num, pdf_tables_folder):
+        """
+        Extracts the tables of a single PDF page and saves each one as a CSV file.
+        Args:
+            page (pdfplumber.page.Page): The pdfplumber page object.
+            page_num (int): The 0-based index of the page in the document.
+            pdf_tables_folder (str): The directory the CSV files are written to.
+
+        Returns:
+            list: A list of dictionaries containing metadata about the extracted tables and their CSV file paths.
+        """
+        tables_data = []
+        tables = page.extract_tables()  # Extract all tables found on the current page
+        for table_index, table in enumerate(tables):  # Iterate through each table
+            csv_filename = f"pdf_table_{page_num+1}_{table_index+1}.csv"  # Create a unique filename for the CSV
+
+            # Store metadata about the table in the list, writing the table data to a CSV file
+            tables_data.append({
+                "page_number": page_num + 1,  # Page number (1-indexed for readability)
+                "table_index": table_index + 1,  # Table index (1-indexed for readability)
+                **self._save_table(table, pdf_tables_folder, csv_filename)
+            })
         return tables_data
 
+    def _save_table(self, rows, tables_folder, csv_filename):
+        """
+        Saves the rows of a table as a CSV file, or keeps them in the table record with the 'rows' table format.
+        Args:
+            rows (list of lists): The rows of the table.
+            tables_folder (str): The directory the CSV file is written to.
+            csv_filename (str): The name of the CSV file.
+
+        Returns:
+            dict: The 'csv_filename' and 'csv_path' of the saved table, which are None with the 'rows' format,
+                  followed by the 'rows' themselves with that format.
+        """
+        if self.table_format == "rows":
+            return {"csv_filename": None, "csv_path": None, "rows": rows}
+        csv_path = os.path.join(tables_folder, csv_filename)  # Create the full path for the CSV file
+        self._write_csv(csv_path, rows)
+        return {"csv_filename": csv_filename, "csv_path": csv_path}
+
+    @instrumented()
+    def _write_csv(self, csv_path, rows):
+        """
+        Writes the rows of a table to a CSV file, or hands them to the background writer when one is set.
+        Args:
+            csv_path (str): The path of the CSV file.
+            rows (list of lists): The rows of the table.
+        """
+        if self.writer is not None:
+            self.writer.write_csv(csv_path, rows)
+            return
+        with open(csv_path, 'w', newline='', encoding='utf-8') as csvfile:
+            writer = csv.writer(csvfile)
+            writer.writerows(rows)  # Write each row of the table to the CSV file
+        instrumentation.record_file(csv_path)
+
     def _extract_docx_tables(self, doc):
         """
         Extracts tables from a DOCX file and saves them as CSV files in a specified directory.
         Each table is saved into a separate CSV file named uniquely based on its index in the document.
-        
+
         Args:
             doc (Document): The loaded DOCX document object from python-docx.
 
         Returns:
             list: A list of dictionaries containing metadata about the extracted tables and their CSV file paths.
         """
-        tables_data = []  # Initialize a list to hold metadata about each extracted table
-        docx_tables_folder = os.path.join("output", "tables", "docx")  # Define the directory to store CSV files
+        docx_tables_folder = os.path.join(self.output_folder, "tables", "docx")  # Define the directory to store CSV files
         os.makedirs(docx_tables_folder, exist_ok=True)  # Ensure the directory exists
+        return list(self._iter_docx_tables(doc, docx_tables_folder))
+
+    @instrumented()
+    def _iter_docx_tables(self, doc, docx_tables_folder):
+        """
+        Extracts the tables of a DOCX file one at a time, saving each as a CSV file in the given directory.
+        Args:
+            doc (Document): The loaded DOCX document object from python-docx.
+            docx_tables_folder (str): The directory the CSV files are written to.
 
+        Yields:
+            dict: Metadata about each extracted table and its CSV file path.
+        """
         # Iterate over each table in the document
         for table_index, table in enumerate(doc.tables):
             csv_filename = f"docx_table_{table_index+1}.csv"  # Construct a unique filename for the CSV
-            csv_path = os.path.join(docx_tables_folder, csv_filename)  # Create the full path for the CSV file
-
-            # Open a new CSV file and write the table data
-            with open(csv_path, 'w', newline='', encoding='utf-8') as csvfile:
-                writer = csv.writer(csvfile)
-                writer.writerows([[cell.text for cell in row.cells] for row in table.rows])  # Convert table rows to CSV
+            rows = [[cell.text for cell in row.cells] for row in table.rows]  # Convert table rows to CSV
 
-            # Append metadata about the table to the list
-            tables_data.append({
+            # Yield metadata about the table, writing the table data to a new CSV file
+            yield {
                 "table_index": table_index + 1,  # Index is 1-based for user clarity
-                "csv_filename": csv_filename,
-                "csv_path": csv_path
-            })
-        return tables_data
+                **self._save_table(rows, docx_tables_folder, csv_filename)
+            }
 
     def _extract_pptx_tables(self, presentation):
         """
@@ -469,27 +2178,38 @@ class DataExtractor:
             list: A list of dictionaries detailing the tables extracted from each slide, including CSV file paths.
         """
         tables_data = []  # Initialize a list to hold metadata about each extracted table
-        pptx_tables_folder = os.path.join("output", "tables", "pptx")  # Define the directory to store CSV files
+        pptx_tables_folder = os.path.join(self.output_folder, "tables", "pptx")  # Define the directory to store CSV files
         os.makedirs(pptx_tables_folder, exist_ok=True)  # Ensure the directory exists
 
         # Iterate through each slide in the presentation
         for slide_num, slide in enumerate(presentation.slides):
-            # Check each shape on the slide for a table
-            for shape in slide.shapes:
-                if shape.has_table:
-                    table = shape.table  # Get the table object
-                    csv_filename = f"pptx_table_{slide_num+1}_{shape.shape_id}.csv"  # Construct a unique filename for the CSV
-                    csv_path = os.path.join(pptx_tables_folder, csv_filename)  # Create the full path for the CSV file
-
-                    # Open a new CSV file and write the table data
-                    with open(csv_path, 'w', newline='', encoding='utf-8') as csvfile:
-                        writer = csv.writer(csvfile)
-                        writer.writerows([[cell.text for cell in row.cells] for row in table.rows])  # Convert table rows to CSV
-
-                    # Append metadata about the table to the list
-                    tables_data.append({
-                        "slide_number": slide_num + 1,  # Slide number is 1-based for user clarity
-                        "csv_filename": csv_filename,
-                        "csv_path": csv_path
-                    })
+            tables_data.extend(self._extract_pptx_slide_tables(slide, slide_num, pptx_tables_folder))
+        return tables_data
+
+    @instrumented()
+    def _extract_pptx_slide_tables(self, slide, slide_num, pptx_tables_folder):
+        """
+        Extracts the tables of a single slide and saves each one as a CSV file.
+        Args:
+            slide (Slide): The python-pptx slide object.
+            slide_num (int): The 0-based index of the slide in the presentation.
+            pptx_tables_folder (str): The directory the CSV files are written to.
+
+        Returns:
+            list: A list of dictionaries detailing the tables extracted from the slide, including CSV file paths.
+        """
+        tables_data = []
+
+        # Check each shape on the slide for a table
+        for shape in slide.shapes:
+            if shape.has_table:
+                table = shape.table  # Get the table object
+                csv_filename = f"pptx_table_{slide_num+1}_{shape.shape_id}.csv"  # Construct a unique filename for the CSV
+                rows = [[cell.text for cell in row.cells] for row in table.rows]  # Convert table rows to CSV
+
+                # Append metadata about the table to the list, writing the table data to a new CSV file
+                tables_data.append({
+                    "slide_number": slide_num + 1,  # Slide number is 1-based for user clarity
+                    **self._save_table(rows, pptx_tables_folder, csv_filename)
+                })
         return tables_data
@@ -0,0 +1,70 @@
+class ExtractionError(Exception):
+    """
+    Base of the structured errors of a single file. Carries the path of the file, a machine-readable code of
+    the problem, and a readable message, so that callers can report the failure of the file and carry on with
+    the rest of a run instead of stopping the process.
+
+    Attributes:
+        filepath (str): The path of the file.
+        code (str): The problem, e.g. 'load_failed' or 'timeout'.
+        message (str): A description of the problem.
+    """
+
+    def __init__(self, filepath, code, message):
+        super().__init__(f"{message}: {filepath}")
+        self.filepath = filepath
+        self.code = code
+        self.message = message
+
+    def __reduce__(self):
+        # Keeps the attributes when the error is sent back from a worker process.
+        return type(self), (self.filepath, self.code, self.message)
+
+    def to_dict(self):
+        """
+        Returns the error as a dict with the 'filepath', 'code', and 'message' of the problem.
+        """
+        return {"filepath": self.filepath, "code": self.code, "message": self.message}
+
+class LoadError(ExtractionError):
+    """
+    Raised when a file passed its pre-flight check but its library failed to open or parse it.
+    The code is 'load_failed'; the error of the library is chained as the cause.
+    """
+
+class FileTimeout(ExtractionError):
+    """
+    Raised when the extraction of a whole file takes longer than the file timeout. The code is 'timeout'.
+    """
+
+class PageTimeout(ExtractionError):
+    """
+    Raised when a stage of a single PDF page takes longer than the page timeout. The code is 'page_timeout'.
+    The extractor catches it, records the page as failed, and goes on with the next page.
+    """
+
+class StorageError(Exception):
+    """
+    Raised when the database cannot be connected to, or its tables cannot be brought up to date. Unlike the
+    errors of a file, it says nothing about the file being stored, so files that fail with it are not quarantined.
+
+    Attributes:
+        code (str): Always 'storage_unavailable'.
+    """
+
+    code = "storage_unavailable"
+
+    def to_dict(self):
+        """
+        Returns the error as a dict with its 'code' and 'message'.
+        """
+        return {"code": self.code, "message": str(self)}
+
+class StorageWriteError(StorageError):
+    """
+    Raised when the database rejects the rows of a document. The transaction is rolled back, so nothing of
+    the document is stored, and the file is reported as failed instead of done. The code is 'storage_failed';
+    the error of the database driver is chained as the cause.
+    """
+
+    code = "storage_failed"
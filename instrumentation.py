@@ -0,0 +1,222 @@
+import io
+import os
+import time
+import inspect
+import pstats
+import cProfile
+import logging
+import functools
+import threading
+import contextlib
+
+try:
+    import pyinstrument  # Optional statistical profiler
+except ImportError:
+    pyinstrument = None
+
+logger = logging.getLogger(__name__)
+
+# Profilers that can be switched on for a document.
+PROFILERS = ("cprofile", "pyinstrument")
+
+_active = None  # The DocumentMetrics being collected in this process, if any
+
+class DocumentMetrics:
+    """
+    Metrics collected while one document is processed: the time and number of calls of every instrumented
+    stage, and counters such as the pages visited and the bytes written. Stages and counters may be recorded
+    from several threads, e.g. by the background artifact writer.
+
+    Attributes:
+        document (str): The path of the document.
+        stages (dict): The 'calls' and 'seconds' of each stage, keyed by stage name. Times are inclusive,
+                       so the time of a stage includes the stages it calls.
+        counters (dict): Named totals, such as 'pages', 'bytes_written', and 'files_written'.
+        profile (str | None): The text report of the profiler, if one was enabled.
+    """
+
+    def __init__(self, document=None):
+        self.document = document
+        self.stages = {}
+        self.counters = {}
+        self.profile = None
+        self.seconds = 0.0
+        self._lock = threading.Lock()
+
+    def record_stage(self, name, seconds):
+        """
+        Adds one call of a stage.
+        """
+        with self._lock:
+            stage = self.stages.get(name)
+            if stage is None:
+                stage = self.stages[name] = {"calls": 0, "seconds": 0.0}
+            stage["calls"] += 1
+            stage["seconds"] += seconds
+
+    def increment(self, name, amount=1):
+        """
+        Adds an amount to a counter.
+        """
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def report(self):
+        """
+        Returns the metrics as a JSON-serializable dictionary.
+        """
+        with self._lock:
+            report = {
+                "document": self.document,
+                "seconds": self.seconds,
+                "stages": {name: dict(stage) for name, stage in sorted(self.stages.items())},
+                "counters": dict(sorted(self.counters.items()))
+            }
+        if self.profile is not None:
+            report["profile"] = self.profile
+        return report
+
+def get_active():
+    """
+    Returns the metrics being collected in this process, or None when instrumentation is off.
+    """
+    return _active
+
+def increment(name, amount=1):
+    """
+    Adds an amount to a counter of the current document. Does nothing when instrumentation is off.
+    """
+    metrics = _active
+    if metrics is not None:
+        metrics.increment(name, amount)
+
+def record_write(nbytes):
+    """
+    Counts one output file of the given size for the current document.
+    """
+    metrics = _active
+    if metrics is not None:
+        metrics.increment("files_written")
+        metrics.increment("bytes_written", nbytes)
+
+def record_file(path):
+    """
+    Counts one output file for the current document, reading its size from disk only when metrics are collected.
+    """
+    metrics = _active
+    if metrics is not None:
+        record_write(os.path.getsize(path))
+
+def _timed_generator(metrics, name, generator):
+    """
+    Passes through the items of a generator, recording the time spent producing them as one call of a stage.
+    """
+    elapsed = 0.0
+    try:
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(generator)
+            except StopIteration:
+                return
+            finally:
+                elapsed += time.perf_counter() - start
+            yield item
+    finally:
+        metrics.record_stage(name, elapsed)
+
+def instrumented(name=None):
+    """
+    Decorator that records the duration of every call of a method as a stage of the current document.
+    The stage is named after the class of the instance and the method, e.g. 'PDFLoader.load_file', unless a
+    name is given. When no metrics are being collected the call goes straight through, so the decorator costs
+    one global lookup.
+
+    Args:
+        name (str, optional): A fixed stage name.
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            metrics = _active
+            if metrics is None:
+                return method(self, *args, **kwargs)
+
+            stage_name = name or f"{type(self).__name__}.{method.__name__}"
+            start = time.perf_counter()
+            try:
+                result = method(self, *args, **kwargs)
+            except BaseException:
+                metrics.record_stage(stage_name, time.perf_counter() - start)
+                raise
+            if inspect.isgenerator(result):  # Generators are timed as they are consumed
+                return _timed_generator(metrics, stage_name, result)
+            metrics.record_stage(stage_name, time.perf_counter() - start)
+            return result
+        return wrapper
+    return decorator
+
+@contextlib.contextmanager
+def _profile_cprofile(metrics, top):
+    """
+    Profiles the enclosed code with cProfile and stores the `top` most expensive functions in the metrics.
+    """
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        stream = io.StringIO()
+        pstats.Stats(profiler, stream=stream).sort_stats("cumulative").print_stats(top)
+        metrics.profile = stream.getvalue()
+
+@contextlib.contextmanager
+def _profile_pyinstrument(metrics, top):
+    """
+    Profiles the enclosed code with pyinstrument and stores its text report in the metrics.
+    """
+    if pyinstrument is None:
+        raise ImportError("The 'pyinstrument' profiler is not installed; install it with 'pip install pyinstrument'")
+    profiler = pyinstrument.Profiler()
+    profiler.start()
+    try:
+        yield
+    finally:
+        profiler.stop()
+        metrics.profile = profiler.output_text(unicode=True)
+
+@contextlib.contextmanager
+def collect(document=None, profile=None, top=30):
+    """
+    Collects the metrics of one document while the `with` block runs. Collection is per process; worker
+    processes started inside the block are not measured.
+
+    Args:
+        document (str, optional): The path of the document, recorded in the report.
+        profile (str, optional): 'cprofile' or 'pyinstrument' to also profile the block.
+        top (int): The number of functions listed in the cProfile report.
+
+    Yields:
+        DocumentMetrics: The metrics, complete once the block exits.
+    """
+    global _active
+    if profile is not None and profile not in PROFILERS:
+        raise ValueError(f"Unknown profiler '{profile}', expected one of {', '.join(PROFILERS)}")
+
+    metrics = DocumentMetrics(document)
+    previous, _active = _active, metrics
+    start = time.perf_counter()
+    try:
+        if profile == "cprofile":
+            with _profile_cprofile(metrics, top):
+                yield metrics
+        elif profile == "pyinstrument":
+            with _profile_pyinstrument(metrics, top):
+                yield metrics
+        else:
+            yield metrics
+    finally:
+        metrics.seconds = time.perf_counter() - start
+        _active = previous
+        logger.debug("Collected metrics of %s in %.3fs", document, metrics.seconds)
@@ -0,0 +1,116 @@
+import logging
+
+logger = logging.getLogger(__name__)
+
+class DocumentHandle:
+    """
+    Lazily loaded document of one file, returned by FileLoader.open. Nothing is read when the handle is opened:
+    the parsed document, the streaming package, and the pdfplumber layout are each loaded the first time they are
+    used, and then shared by every extraction pass until the handle is closed.
+
+    A loader keeps one handle per file while it is open. Opening the same file again returns the same handle and
+    only counts one more user, so nested passes (e.g. extract_text within extract_all) reuse the loaded document,
+    and the document is closed when the last user closes the handle. Handles are context managers.
+
+    Attributes:
+        loader (FileLoader): The loader that opened the handle.
+        filepath (str): The path of the document.
+    """
+
+    def __init__(self, loader, filepath):
+        self.loader = loader
+        self.filepath = filepath
+        self._users = 0
+        self._resources = {}  # Loaded resources by name, in load order
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @property
+    def closed(self):
+        """
+        Whether every user has closed the handle.
+        """
+        return self._users == 0
+
+    def _acquire(self):
+        """
+        Counts one more user of the handle and returns it.
+        """
+        self._users += 1
+        return self
+
+    def close(self):
+        """
+        Closes the handle for one user. When the last user closes it, every loaded resource is closed and the
+        loader forgets the handle, so the next open loads the file again.
+        """
+        if self._users == 0:
+            return
+        self._users -= 1
+        if self._users:
+            return
+        for resource in reversed(list(self._resources.values())):
+            close = getattr(resource, "close", None)  # python-docx and python-pptx documents have nothing to close
+            if close is not None:
+                close()
+        self._resources.clear()
+        self.loader._release(self)
+        logger.debug("Closed file: %s", self.filepath)
+
+    def _get(self, name, load):
+        """
+        Returns a resource of the document, loading it on first use.
+        Args:
+            name (str): The name of the resource.
+            load (callable): Loads the resource from the path of the document.
+
+        Raises:
+            ValueError: If the handle is closed.
+        """
+        if self.closed:
+            raise ValueError(f"I/O operation on closed document: {self.filepath}")
+        if name not in self._resources:
+            self._resources[name] = load(self.filepath)
+        return self._resources[name]
+
+    def is_loaded(self, name):
+        """
+        Returns whether a resource ('document', 'package', or 'layout') has been loaded.
+        """
+        return name in self._resources
+
+    @property
+    def document(self):
+        """
+        The parsed document, as returned by the loader's load_file: a PyMuPDF Document, whose pages load when they
+        are first accessed, a python-docx Document, or a python-pptx Presentation, which is loaded whole, with all
+        of its slides, on first access.
+        """
+        return self._get("document", self.loader.load_file)
+
+    @property
+    def package(self):
+        """
+        The zip package of a DOCX or PPTX file for the streaming reader, as returned by the loader's load_stream.
+        """
+        return self._get("package", self.loader.load_stream)
+
+    @property
+    def layout(self):
+        """
+        The pdfplumber document of a PDF file, used for table detection. Its pages are parsed when they are first
+        accessed.
+        """
+        return self._get("layout", self.loader.load_layout)
+
+    @property
+    def page_count(self):
+        """
+        The number of pages of a PDF or slides of a PPTX file, read from the document metadata without parsing
+        the pages or slides; None for DOCX files, which have no fixed pages.
+        """
+        return self.loader.count_pages(self)
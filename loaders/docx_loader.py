@@ -1,6 +1,11 @@
+import logging
 from .file_loader import FileLoader
+from .preflight import check_ooxml
+from .ooxml_package import OOXMLPackage
 from docx import Document
 
+logger = logging.getLogger(__name__)
+
 class DOCXLoader(FileLoader):
     """
     Loader class for DOCX files, inheriting from the FileLoader abstract base class.
@@ -12,6 +17,15 @@ class DOCXLoader(FileLoader):
 
     file_extension = '.docx'
 
+    def check_file(self, filepath: str):
+        """
+        Checks the zip central directory and the required parts of a DOCX file (see preflight.check_ooxml).
+
+        Raises:
+            PreflightError: If the file is not a readable DOCX package.
+        """
+        check_ooxml(filepath)
+
     def process_file(self, filepath: str):
         """
         Loads a DOCX file after validation. If the file is valid, it opens and returns
@@ -24,8 +38,23 @@ class DOCXLoader(FileLoader):
             Document: A Document object representing the loaded DOCX file.
 
         Raises:
-            SystemExit: If the DOCX file cannot be opened or read, logs the error and stops the process.
+            LoadError: If the DOCX file cannot be opened or read; the error is logged and raised by load_file.
         """
         doc = Document(filepath)  # Attempts to open and read the DOCX file.
-        print(f"Loaded DOCX file: {filepath}")
+        logger.info("Loaded DOCX file: %s", filepath)
         return doc
+
+    def process_stream(self, filepath: str):
+        """
+        Opens a DOCX file as a zip package whose parts are read on demand, without building the
+        object tree of the whole document.
+
+        Args:
+            filepath (str): The path to the DOCX file.
+
+        Returns:
+            OOXMLPackage: The package of the DOCX file.
+        """
+        package = OOXMLPackage(filepath)
+        logger.info("Opened DOCX file for streaming: %s", filepath)
+        return package
@@ -1,6 +1,11 @@
 from abc import ABC, abstractmethod
-import sys
 import logging
+from instrumentation import instrumented
+from .document_handle import DocumentHandle
+from .preflight import PreflightError
+from errors import ExtractionError, LoadError
+
+logger = logging.getLogger(__name__)
 
 class FileLoader(ABC):
     """
@@ -14,28 +19,85 @@ class FileLoader(ABC):
 
     file_extension = ""  # This will be set by subclasses to specify the required file extension.
 
+    def __init__(self):
+        self._handles = {}  # Open document handles by file path
+
+    def __getstate__(self):
+        # Open documents cannot be pickled; a copy sent to a worker process opens its own handles.
+        state = self.__dict__.copy()
+        state["_handles"] = {}
+        return state
+
+    def open(self, filepath: str) -> DocumentHandle:
+        """
+        Opens a file as a lazily loaded document handle. Nothing is read until the document is first used, and
+        only the parts that are used are loaded: PDF pages are parsed when they are first accessed, a PPTX
+        presentation is loaded whole on first access, and the page count is read from the document metadata
+        without loading the document. While the handle is open, opening the same file
+        again returns the same handle, so the document is loaded and validated once for every extraction pass.
+
+        Args:
+            filepath (str): The full path of the file to open.
+
+        Returns:
+            DocumentHandle: The handle of the file, to be closed once it is no longer needed, e.g. with a `with` block.
+        """
+        handle = self._handles.get(filepath)
+        if handle is None:
+            handle = self._handles[filepath] = DocumentHandle(self, filepath)
+        return handle._acquire()
+
+    def _release(self, handle):
+        """
+        Forgets a handle once its last user has closed it.
+        """
+        if self._handles.get(handle.filepath) is handle:
+            del self._handles[handle.filepath]
+
     def validate_file(self, filepath: str) -> bool:
         """
-        Validates that the provided file has the correct extension. This method is used to
-        ensure that only files with the correct format are processed.
+        Validates that the provided file has the correct extension and passes the pre-flight check of its format,
+        which reads only a few KB of the file (see `check_file`). This method is used to ensure that only files
+        with the correct format are processed, and to reject corrupted, truncated, and encrypted files before
+        they are parsed.
 
         Args:
             filepath (str): The full path of the file to be validated.
 
         Returns:
-            bool: True if the file has the correct extension.
+            bool: True if the file is valid.
 
         Raises:
-            SystemExit: If the file does not have the expected extension, logs an error and exits the program.
+            PreflightError: If the file does not have the expected extension or fails the pre-flight check. The
+                            error is logged and raised, so the caller can go on with other files.
         """
         if not filepath.lower().endswith(self.file_extension):
-            # Log error if the file extension is not as expected and terminate the program.
-            logging.error(f"Invalid file format: {filepath}")
-            sys.exit(f"Invalid format stopped process: {filepath}")
+            # Log error if the file extension is not as expected.
+            logger.error("Invalid file format: %s", filepath)
+            raise PreflightError(filepath, "unsupported_extension", f"Expected a {self.file_extension} file")
+        try:
+            self.check_file(filepath)
+        except PreflightError as e:
+            logger.error("Rejected file (%s): %s", e.code, e)
+            raise
         # Log success if the file is valid and return True.
-        print(f"File validated: {filepath}")
+        logger.debug("File validated: %s", filepath)
         return True
 
+    def check_file(self, filepath: str):
+        """
+        Pre-flight check of the content of a file, overridden by the loaders of each format. It only reads the
+        parts of the file that tell whether it can be loaded, such as headers, trailers, and the zip central
+        directory, so bad files are rejected without being parsed.
+
+        Args:
+            filepath (str): The full path of the file to check.
+
+        Raises:
+            PreflightError: If the file cannot be loaded.
+        """
+
+    @instrumented()
     def load_file(self, filepath: str):
         """
         Loads the file and processes its content by calling the `process_file` method, which is
@@ -48,21 +110,74 @@ class FileLoader(ABC):
             The processed content of the file (as defined by the subclass).
 
         Raises:
-            SystemExit: If the file validation fails or an error occurs during file processing, 
-                        logs the error and exits the program.
+            PreflightError: If the file validation fails.
+            LoadError: If an error occurs during file processing. The error is logged, and the error of the
+                       library is chained as its cause.
+        """
+        return self._load(filepath, self.process_file)
+
+    @instrumented()
+    def load_stream(self, filepath: str):
         """
-        # Validate the file before proceeding with loading.
-        if not self.validate_file(filepath):
-            logging.error(f"File validation failed for: {filepath}")
-            sys.exit("File validation failed")
+        Validates the file and opens it for streaming by calling the `process_stream` method, which is
+        defined by the subclasses that support a streaming reader.
+
+        Args:
+            filepath (str): The full path of the file to open.
+
+        Returns:
+            The streaming reader of the file (as defined by the subclass).
+
+        Raises:
+            PreflightError: If the file validation fails.
+            LoadError: If the file cannot be opened. The error is logged and chained as for load_file.
+        """
+        return self._load(filepath, self.process_stream)
+
+    @instrumented()
+    def load_layout(self, filepath: str):
+        """
+        Validates the file and opens its page layout for table detection by calling the `process_layout` method,
+        which is defined by the subclasses that support one.
+
+        Args:
+            filepath (str): The full path of the file to open.
+
+        Returns:
+            The layout document of the file (as defined by the subclass).
+
+        Raises:
+            PreflightError: If the file validation fails.
+            LoadError: If the file cannot be opened. The error is logged and chained as for load_file.
+        """
+        return self._load(filepath, self.process_layout)
+
+    def count_pages(self, handle):
+        """
+        Returns the number of pages of an open document without parsing them, or None if the format has no
+        fixed pages. Overridden by the loaders of paged formats.
+
+        Args:
+            handle (DocumentHandle): The open handle of the file.
+        """
+        return None
+
+    def _load(self, filepath, process):
+        """
+        Validates the file and processes it with the given method. Loading errors are raised as a LoadError, so the
+        caller can report the file and go on with the next one.
+        """
+        self.validate_file(filepath)  # Raises PreflightError for files that cannot be loaded
 
         try:
             # Process the file using the subclass implementation.
-            return self.process_file(filepath)
+            return process(filepath)
+        except ExtractionError:
+            raise  # E.g. the file timeout expiring while the file is parsed
         except Exception as e:
-            # Log any errors that occur during file processing and terminate the program.
-            logging.error(f"Error loading file: {e}")
-            sys.exit(f"Error during file loading stopped process: {filepath}")
+            # Log any errors that occur during file processing and report them for this file only.
+            logger.error("Error loading file: %s", e)
+            raise LoadError(filepath, "load_failed", f"Error loading file ({type(e).__name__}: {e})") from e
 
     @abstractmethod
     def process_file(self, filepath):
@@ -77,3 +192,27 @@ class FileLoader(ABC):
             NotImplementedError: If the subclass does not implement this method.
         """
         raise NotImplementedError("The process_file method must be implemented by subclasses.")
+
+    def process_stream(self, filepath):
+        """
+        Opens the file for streaming. Only implemented by the loaders of formats with a streaming reader.
+
+        Args:
+            filepath (str): The full path of the file to open.
+
+        Raises:
+            NotImplementedError: If the file format has no streaming reader.
+        """
+        raise NotImplementedError(f"{type(self).__name__} has no streaming reader.")
+
+    def process_layout(self, filepath):
+        """
+        Opens the page layout of the file. Only implemented by the loaders of formats with table detection on the layout.
+
+        Args:
+            filepath (str): The full path of the file to open.
+
+        Raises:
+            NotImplementedError: If the file format has no page layout.
+        """
+        raise NotImplementedError(f"{type(self).__name__} has no page layout.")
@@ -0,0 +1,173 @@
+import zipfile
+import posixpath
+import collections
+from lxml import etree
+
+# XML namespaces of the Office Open XML parts read by the streaming reader.
+NAMESPACES = {
+    "a": "http://schemas.openxmlformats.org/drawingml/2006/main",
+    "ct": "http://schemas.openxmlformats.org/package/2006/content-types",
+    "p": "http://schemas.openxmlformats.org/presentationml/2006/main",
+    "pic": "http://schemas.openxmlformats.org/drawingml/2006/picture",
+    "pr": "http://schemas.openxmlformats.org/package/2006/relationships",
+    "r": "http://schemas.openxmlformats.org/officeDocument/2006/relationships",
+    "w": "http://schemas.openxmlformats.org/wordprocessingml/2006/main",
+    "wp": "http://schemas.openxmlformats.org/drawingml/2006/wordprocessingDrawing"
+}
+
+def qn(tag):
+    """
+    Converts a prefixed tag such as 'w:p' to the Clark notation used by lxml, '{namespace}p'.
+    """
+    prefix, local_name = tag.split(":")
+    return f"{{{NAMESPACES[prefix]}}}{local_name}"
+
+# A relationship of a part: its id, type, the reference written in the package, the partname of an
+# internal target (None for external targets such as URLs), and whether the target is external.
+Relationship = collections.namedtuple("Relationship", ["rId", "reltype", "target_ref", "target_partname", "is_external"])
+
+class OOXMLPackage:
+    """
+    Read-only view of a DOCX or PPTX package that reads its parts straight from the zip archive.
+    Unlike python-docx and python-pptx, no part is loaded until it is asked for, large XML parts are
+    parsed incrementally with lxml's iterparse, and binary parts such as media can be copied as streams.
+
+    Attributes:
+        filepath (str): The path of the package.
+        archive (zipfile.ZipFile): The open zip archive.
+    """
+
+    def __init__(self, filepath):
+        """
+        Opens the package and reads its content types.
+
+        Args:
+            filepath (str): The path of the DOCX or PPTX file.
+
+        Raises:
+            zipfile.BadZipFile: If the file is not a zip archive, e.g. an encrypted or corrupt document.
+            KeyError: If the archive has no '[Content_Types].xml', so it is not an Office Open XML package.
+        """
+        self.filepath = filepath
+        self.archive = zipfile.ZipFile(filepath)
+        self._rels = {}
+        self._overrides, self._defaults = {}, {}
+        content_types = etree.fromstring(self.archive.read("[Content_Types].xml"))
+        for override in content_types.iterfind(qn("ct:Override")):
+            self._overrides[override.get("PartName").lower()] = override.get("ContentType")
+        for default in content_types.iterfind(qn("ct:Default")):
+            self._defaults[default.get("Extension").lower()] = default.get("ContentType")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """
+        Closes the zip archive.
+        """
+        self.archive.close()
+
+    def content_type(self, partname):
+        """
+        Returns the content type of a part, e.g. 'image/png'.
+        """
+        content_type = self._overrides.get(partname.lower())
+        if content_type is None:
+            content_type = self._defaults.get(posixpath.splitext(partname)[1].lstrip(".").lower())
+        return content_type
+
+    def rels(self, partname="/"):
+        """
+        Returns the relationships of a part, in the order of its relationships part.
+        Args:
+            partname (str): The partname of the source part, e.g. '/word/document.xml'; '/' for the package.
+
+        Returns:
+            dict: The Relationship of each rId.
+        """
+        if partname not in self._rels:
+            base_uri, filename = posixpath.split(partname)
+            rels_name = posixpath.join(base_uri, "_rels", f"{filename}.rels")
+            rels = {}
+            if self.has_part(rels_name):
+                for rel in etree.fromstring(self.read_part(rels_name)).iterfind(qn("pr:Relationship")):
+                    target = rel.get("Target")
+                    if rel.get("TargetMode") == "External":
+                        rels[rel.get("Id")] = Relationship(rel.get("Id"), rel.get("Type"), target, None, True)
+                        continue
+                    target_partname = posixpath.normpath(posixpath.join(base_uri, target))
+                    # Internal references are normalized relative to the source part, as python-docx and python-pptx do
+                    target_ref = target_partname[1:] if base_uri == "/" else posixpath.relpath(target_partname, base_uri)
+                    rels[rel.get("Id")] = Relationship(rel.get("Id"), rel.get("Type"), target_ref, target_partname, False)
+            self._rels[partname] = rels
+        return self._rels[partname]
+
+    def related_partname(self, partname, reltype_suffix):
+        """
+        Returns the partname of the first internal part related to a part by a relationship type ending with the
+        given suffix, e.g. '/officeDocument' or '/styles', or None if there is none.
+        """
+        for rel in self.rels(partname).values():
+            if not rel.is_external and rel.reltype.endswith(reltype_suffix):
+                return rel.target_partname
+        return None
+
+    def main_partname(self):
+        """
+        Returns the partname of the main document part, e.g. '/word/document.xml' or '/ppt/presentation.xml'.
+        """
+        return self.related_partname("/", "/officeDocument")
+
+    def has_part(self, partname):
+        """
+        Returns whether the package contains a part.
+        """
+        try:
+            self.archive.getinfo(partname.lstrip("/"))
+        except KeyError:
+            return False
+        return True
+
+    def open_part(self, partname):
+        """
+        Opens a part for reading as a binary stream, without loading it into memory.
+        """
+        return self.archive.open(partname.lstrip("/"))
+
+    def read_part(self, partname):
+        """
+        Reads a whole part. Only meant for small parts such as relationships and styles.
+        """
+        return self.archive.read(partname.lstrip("/"))
+
+    def parse_part(self, partname):
+        """
+        Parses a small XML part into an element tree.
+        """
+        return etree.fromstring(self.read_part(partname))
+
+    def iter_children(self, partname, parent_tag):
+        """
+        Incrementally parses an XML part and yields each child of the elements with the given tag once the child
+        is complete, e.g. every block of 'w:body' or every shape of 'p:spTree'. Each child is cleared and
+        detached after it has been consumed, so the memory used does not grow with the size of the part.
+
+        Args:
+            partname (str): The partname of the XML part.
+            parent_tag (str): The prefixed tag of the parent elements, e.g. 'w:body'.
+
+        Yields:
+            lxml.etree._Element: Each complete child element, in document order.
+        """
+        parent_tag = qn(parent_tag)
+        with self.open_part(partname) as stream:
+            for _, element in etree.iterparse(stream, events=("end",), huge_tree=True):
+                parent = element.getparent()
+                if parent is None or parent.tag != parent_tag:
+                    continue
+                yield element
+                element.clear()
+                parent.remove(element)  # Detach the consumed child, so the parent never accumulates children
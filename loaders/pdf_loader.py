@@ -1,5 +1,10 @@
+import logging
 from .file_loader import FileLoader
-from PyPDF2 import PdfReader
+from .preflight import PreflightError, check_pdf
+import fitz  # PyMuPDF
+import pdfplumber  # Page layouts for table detection
+
+logger = logging.getLogger(__name__)
 
 class PDFLoader(FileLoader):
     """
@@ -12,21 +17,57 @@ class PDFLoader(FileLoader):
 
     file_extension = '.pdf'
 
+    def check_file(self, filepath: str):
+        """
+        Checks the header and trailer of a PDF file (see preflight.check_pdf). Only when the trailer has an
+        /Encrypt entry is the file opened, lazily, to find out whether reading it needs a password.
+
+        Raises:
+            PreflightError: If the file is not a readable PDF file.
+        """
+        if check_pdf(filepath):
+            with fitz.open(filepath) as reader:  # Reads the cross-reference table and encryption dictionary only
+                if reader.needs_pass:
+                    raise PreflightError(filepath, "encrypted", "PDF file is password protected")
+
     def process_file(self, filepath: str):
         """
-        Validates and loads a PDF file. If the file is valid, it opens and returns a PdfReader object
-        for further manipulation. If there are issues opening the file, the process is terminated.
+        Validates and loads a PDF file. If the file is valid, it opens and returns a PyMuPDF Document
+        that every PDF extraction pass shares. If there are issues opening the file, a LoadError is raised.
 
         Args:
             filepath (str): The path to the PDF file that needs to be loaded.
 
         Returns:
-            PdfReader: A PdfReader object from the PyPDF2 library that represents the loaded PDF file.
+            fitz.Document: A PyMuPDF Document that represents the loaded PDF file.
 
         Raises:
-            SystemExit: If the PDF file cannot be opened or read due to corruption or other issues, the process
-                        will stop after logging the error.
+            LoadError: If the PDF file cannot be opened or read due to corruption, password protection, or other
+                       issues; the error is logged and raised by load_file.
+        """
+        reader = fitz.open(filepath)  # Attempts to open and read the PDF file.
+        if reader.needs_pass:
+            reader.close()
+            raise ValueError(f"PDF file is password protected: {filepath}")
+        logger.info("Loaded PDF file: %s", filepath)
+        return reader
+
+    def process_layout(self, filepath: str):
+        """
+        Opens the page layout of a PDF file with pdfplumber, which parses each page when it is first accessed.
+
+        Args:
+            filepath (str): The path to the PDF file.
+
+        Returns:
+            pdfplumber.PDF: The pdfplumber document of the PDF file.
+        """
+        pdf = pdfplumber.open(filepath)
+        logger.info("Opened PDF layout: %s", filepath)
+        return pdf
+
+    def count_pages(self, handle):
+        """
+        Returns the number of pages of an open PDF file. PyMuPDF reads it from the page tree without loading any page.
         """
-        reader = PdfReader(filepath)  # Attempts to open and read the PDF file.
-        print(f"Loaded PDF file: {filepath}")
-        return reader
\ No newline at end of file
+        return handle.document.page_count
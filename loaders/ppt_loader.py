@@ -1,6 +1,11 @@
+import logging
 from .file_loader import FileLoader
+from .preflight import check_ooxml
+from .ooxml_package import OOXMLPackage, qn
 from pptx import Presentation
 
+logger = logging.getLogger(__name__)
+
 class PPTLoader(FileLoader):
     """
     Loader class for PPTX files, inheriting from the FileLoader abstract base class.
@@ -12,6 +17,15 @@ class PPTLoader(FileLoader):
 
     file_extension = '.pptx'
 
+    def check_file(self, filepath: str):
+        """
+        Checks the zip central directory and the required parts of a PPTX file (see preflight.check_ooxml).
+
+        Raises:
+            PreflightError: If the file is not a readable PPTX package.
+        """
+        check_ooxml(filepath)
+
     def process_file(self, filepath: str):
         """
         Loads a PPTX file after validation. If the file is valid, it opens and returns
@@ -24,8 +38,34 @@ class PPTLoader(FileLoader):
             Presentation: A Presentation object representing the loaded PPTX file.
 
         Raises:
-            SystemExit: If the PPTX file cannot be opened or read, logs the error and stops the process.
+            LoadError: If the PPTX file cannot be opened or read; the error is logged and raised by load_file.
         """
         ppt = Presentation(filepath)  # Attempts to open and read the PPTX file.
-        print(f"Loaded PPTX file: {filepath}")
+        logger.info("Loaded PPTX file: %s", filepath)
         return ppt
+
+    def process_stream(self, filepath: str):
+        """
+        Opens a PPTX file as a zip package whose parts are read on demand, without building the
+        object tree of the whole document.
+
+        Args:
+            filepath (str): The path to the PPTX file.
+
+        Returns:
+            OOXMLPackage: The package of the PPTX file.
+        """
+        package = OOXMLPackage(filepath)
+        logger.info("Opened PPTX file for streaming: %s", filepath)
+        return package
+
+    def count_pages(self, handle):
+        """
+        Returns the number of slides of an open PPTX file. Unless the presentation has already been loaded, the
+        slides are counted in the slide list of the presentation part without loading the presentation.
+        """
+        if handle.is_loaded("document"):
+            return len(handle.document.slides)
+        package = handle.package
+        presentation = package.parse_part(package.main_partname())
+        return len(presentation.findall(f"{qn('p:sldIdLst')}/{qn('p:sldId')}"))
@@ -0,0 +1,124 @@
+import os
+import re
+import zipfile
+import posixpath
+from lxml import etree
+from errors import ExtractionError
+
+# Number of bytes read from the start and the end of a PDF file. The header must be in the first 1024 bytes
+# and the '%%EOF' marker in the last 1024 bytes; the tail also holds the trailer dictionary.
+PDF_HEAD_SIZE = 1024
+PDF_TAIL_SIZE = 2048
+
+# Signature of an OLE compound file. Encrypted DOCX and PPTX files are stored in one, as are the legacy
+# binary .doc and .ppt formats.
+CFB_SIGNATURE = b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"
+
+# Parts every Office Open XML package must contain.
+OOXML_REQUIRED_PARTS = ("[Content_Types].xml", "_rels/.rels")
+OFFICE_DOCUMENT_RELTYPE = "/officeDocument"
+
+STARTXREF = re.compile(rb"startxref\s+(\d+)\s+%%EOF", re.DOTALL)
+ENCRYPT_ENTRY = re.compile(rb"/Encrypt(?![A-Za-z])")
+
+class PreflightError(ExtractionError, ValueError):
+    """
+    Raised when a file is rejected before it is loaded. Carries the path of the file, a machine-readable
+    code of the problem, and a readable message, so that callers can report the failure of the file and
+    carry on with the rest of a run.
+
+    Attributes:
+        filepath (str): The path of the rejected file.
+        code (str): The problem: 'unsupported_extension', 'missing', 'empty', 'not_pdf', 'truncated',
+                    'not_zip', 'missing_part', or 'encrypted'.
+        message (str): A description of the problem.
+    """
+
+def _get_size(filepath):
+    """
+    Returns the size of a file, rejecting missing and empty files.
+    """
+    try:
+        size = os.path.getsize(filepath)
+    except OSError:
+        raise PreflightError(filepath, "missing", "File does not exist or cannot be read") from None
+    if size == 0:
+        raise PreflightError(filepath, "empty", "File is empty")
+    return size
+
+def check_pdf(filepath):
+    """
+    Checks the structure of a PDF file from its first and last few KB: the '%PDF-' header, and the 'startxref'
+    pointer and '%%EOF' marker at the end of the file, whose cross-reference section must lie within the file.
+    A missing end or a pointer past the end of the file means the file was cut short. A pointer that misses
+    its section inside the file is left to PyMuPDF, which rebuilds the cross-reference table of such files.
+
+    Args:
+        filepath (str): The path of the PDF file.
+
+    Returns:
+        bool: Whether the trailer has an /Encrypt entry. Encrypted PDFs that only have an owner password are
+              readable, so whether a password is needed is left to the loader.
+
+    Raises:
+        PreflightError: If the file is missing, empty, not a PDF, or truncated.
+    """
+    size = _get_size(filepath)
+    with open(filepath, "rb") as file:
+        if b"%PDF-" not in file.read(PDF_HEAD_SIZE):
+            raise PreflightError(filepath, "not_pdf", "File has no PDF header")
+
+        file.seek(max(size - PDF_TAIL_SIZE, 0))
+        tail = file.read()
+        pointers = STARTXREF.findall(tail)
+        if not pointers:
+            raise PreflightError(filepath, "truncated", "PDF file has no startxref and %%EOF at its end")
+        xref_offset = int(pointers[-1])
+        if xref_offset >= size:
+            raise PreflightError(filepath, "truncated", "PDF cross-reference section lies beyond the end of the file")
+
+        trailer_start = tail.rfind(b"trailer")
+        if trailer_start >= 0:
+            trailer = tail[trailer_start:]  # Classic trailer dictionary
+        else:
+            file.seek(xref_offset)
+            trailer = file.read(PDF_HEAD_SIZE).split(b"stream", 1)[0]  # The dictionary of a cross-reference stream
+    return ENCRYPT_ENTRY.search(trailer) is not None
+
+def check_ooxml(filepath):
+    """
+    Checks the structure of a DOCX or PPTX file from its zip central directory: that the file is not an
+    encrypted (OLE compound) file, that the central directory can be read, that the package has its content
+    types, relationships, and main document part, and that the main part is not encrypted. No part is
+    decompressed except the package relationships, which are a few hundred bytes.
+
+    Args:
+        filepath (str): The path of the DOCX or PPTX file.
+
+    Raises:
+        PreflightError: If the file is missing, empty, encrypted, not a zip archive, or lacks a required part.
+    """
+    _get_size(filepath)
+    with open(filepath, "rb") as file:
+        if file.read(len(CFB_SIGNATURE)) == CFB_SIGNATURE:
+            raise PreflightError(filepath, "encrypted", "File is encrypted or in a legacy binary Office format")
+
+    try:
+        archive = zipfile.ZipFile(filepath)  # Reads only the end of central directory and the central directory
+    except zipfile.BadZipFile:
+        raise PreflightError(filepath, "not_zip", "File is not a zip archive") from None
+    with archive:
+        infos = {info.filename: info for info in archive.infolist()}
+        for partname in OOXML_REQUIRED_PARTS:
+            if partname not in infos:
+                raise PreflightError(filepath, "missing_part", f"Package has no {partname}")
+
+        main_partname = None
+        for rel in etree.fromstring(archive.read("_rels/.rels")):
+            if rel.get("Type", "").endswith(OFFICE_DOCUMENT_RELTYPE) and rel.get("TargetMode") != "External":
+                main_partname = posixpath.normpath(posixpath.join("/", rel.get("Target"))).lstrip("/")
+                break
+        if main_partname is None or main_partname not in infos:
+            raise PreflightError(filepath, "missing_part", "Package has no main document part")
+        if infos[main_partname].flag_bits & 0x1:  # Zip-level encryption of the main part
+            raise PreflightError(filepath, "encrypted", "Main document part is encrypted")
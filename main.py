@@ -1,11 +1,32 @@
 import os
+import sys
+import copy
+import glob
 import json
+import logging
+import argparse
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from concurrent.futures.process import BrokenProcessPool
 from dotenv import load_dotenv
 from loaders.pdf_loader import PDFLoader
 from loaders.docx_loader import DOCXLoader
 from loaders.ppt_loader import PPTLoader
-from data_extractor import DataExtractor
+from loaders.preflight import PreflightError
+from errors import ExtractionError, FileTimeout, StorageError
+from timeouts import time_limit
+import instrumentation
+from records import to_json
+from data_extractor import DataExtractor, HEADING_DETECTIONS
 from storage.sql_storage import SQLStorage
+from storage.sqlite_storage import SQLiteStorage
+from storage.extraction_cache import ExtractionCache
+from storage.artifact_writer import ArtifactWriter
+from storage.table_dataset import TableDataset, DATASET_FORMATS
+from storage.quarantine import Quarantine
+from storage.run_manifest import RunManifest
+
+logger = logging.getLogger(__name__)
 
 class FileProcessor:
     """
@@ -16,11 +37,26 @@ class FileProcessor:
         base_output_folder (str): The base directory where the output will be saved.
         config_file (str): The configuration file for loading environment variables.
         db_credentials (dict): Dictionary containing database credentials loaded from the .env file.
+        db_backend (str): The storage backend, 'mysql' (default) or 'sqlite', loaded from DB_BACKEND.
+        db_path (str): The SQLite database file used by the 'sqlite' backend, loaded from DB_PATH.
         loaders (dict): Dictionary mapping file extensions to their respective loader classes.
         file_paths (dict): Dictionary containing the paths of files to be processed.
+        extractor_options (dict): Keyword arguments passed to every DataExtractor, such as page_workers.
+        output_format (str): 'json' to save each content type as one JSON document, or 'jsonl' to stream
+                             records into JSON Lines files one page or slide at a time.
+        writer (ArtifactWriter | None): Background writer for the JSON files, images, and CSV files, or None
+                                        to write them synchronously.
+        metrics (bool): Whether per-stage metrics are collected for every file and saved under 'metrics/'.
+        profile (str | None): 'cprofile' or 'pyinstrument' to also profile every file; implies metrics.
+        table_dataset (TableDataset | None): Columnar dataset that the cells of every table are appended to instead
+                                             of one CSV file per table. In batch mode the workers send the cells
+                                             back and only this process writes the dataset.
+        file_timeout (float | None): Seconds the extraction of a single file may take before it is interrupted
+                                     and reported as failed with the 'timeout' error code.
     """
 
-    def __init__(self, base_output_folder="output", config_file="config.env"):
+    def __init__(self, base_output_folder="output", config_file="config.env", extractor_options=None, output_format="json",
+                 writer=None, metrics=False, profile=None, table_dataset=None, file_timeout=None):
         """
         Initializes the FileProcessor class by loading environment variables, setting up file loaders,
         and creating the necessary output directories.
@@ -28,9 +64,25 @@ class FileProcessor:
         Args:
             base_output_folder (str): Directory where output files will be saved.
             config_file (str): The path to the configuration file for loading environment variables.
+            extractor_options (dict, optional): Keyword arguments passed to every DataExtractor.
+            output_format (str): The format of the saved content files, either 'json' or 'jsonl'.
+            writer (ArtifactWriter, optional): Background writer that output files are handed to.
+            metrics (bool): Whether per-stage metrics are collected for every file.
+            profile (str, optional): The profiler run for every file, 'cprofile' or 'pyinstrument'.
+            table_dataset (TableDataset, optional): Columnar dataset the table cells of every file are appended to.
+            file_timeout (float, optional): Seconds the extraction of a single file may take; None for no limit.
         """
         load_dotenv(config_file)  # Load environment variables from the config file.
         self.base_output_folder = base_output_folder
+        self.extractor_options = extractor_options or {}
+        self.output_format = output_format
+        self.writer = writer
+        self.metrics = metrics or profile is not None
+        self.profile = profile
+        self.table_dataset = table_dataset
+        self.file_timeout = file_timeout
+        if table_dataset is not None:
+            self.extractor_options = dict(self.extractor_options, table_format="rows")  # Cells go to the dataset
         # Load database credentials from environment variables.
         self.db_credentials = {
             'host': os.getenv("DB_HOST"),
@@ -38,6 +90,8 @@ class FileProcessor:
             'password': os.getenv("DB_PASSWORD"),
             'database': os.getenv("DB_NAME")
         }
+        self.db_backend = os.getenv("DB_BACKEND", "mysql").lower()
+        self.db_path = os.getenv("DB_PATH", os.path.join(base_output_folder, "extracted_data.sqlite"))
         # Initialize file loaders for PDF, DOCX, and PPTX files.
         self.loaders = {
             'pdf': PDFLoader(),
@@ -71,52 +125,557 @@ class FileProcessor:
             data (dict): The extracted content to be saved.
             filename (str): The path where the JSON file will be saved.
         """
+        if self.writer is not None:
+            # Serialize now, so the data can change afterwards, and write in the background.
+            self.writer.write_text(filename, json.dumps(data, ensure_ascii=False, indent=4, default=to_json))
+            return
+        with open(filename, 'w', encoding='utf-8') as file:
+            json.dump(data, file, ensure_ascii=False, indent=4, default=to_json)  # Save data as a JSON file.
+        instrumentation.record_file(filename)
+
+    def save_to_jsonl(self, records, filename):
+        """
+        Saves extracted records to a JSON Lines file, writing each record as soon as it is produced.
+        Because records are consumed one at a time, a generator keeps memory use independent of the document size.
+
+        Args:
+            records (iterable): The extracted records, typically one of the DataExtractor iter_* generators.
+            filename (str): The path where the JSON Lines file will be saved.
+
+        Returns:
+            int: The number of records written.
+        """
+        count = 0
         with open(filename, 'w', encoding='utf-8') as file:
-            json.dump(data, file, ensure_ascii=False, indent=4)  # Save data as a JSON file.
+            for record in records:
+                file.write(json.dumps(record, ensure_ascii=False, default=to_json))
+                file.write("\n")
+                count += 1
+        instrumentation.record_file(filename)
+        return count
 
-    def process_file(self, loader, base_output_folder):
+    def process_file(self, loader, base_output_folder, storage=None):
         """
         Processes a file using the specified loader by extracting text, links, images, and tables.
-        The extracted data is saved in separate JSON files for each type of content.
+        The extracted data is saved in separate JSON files for each type of content. With the 'jsonl'
+        output format every content type is streamed page by page into a JSON Lines file instead.
+
+        When metrics are enabled, the time of every stage (loading, extraction, writes, and SQL calls), the pages,
+        and the bytes written are collected for the file and saved to 'metrics/<type>_metrics.json'.
 
         Args:
             loader (FileLoader): The loader responsible for loading and extracting content from the file.
             base_output_folder (str): The base directory where the output will be saved.
+            storage (Storage, optional): Storage that receives all the extracted data of the file in one transaction.
+
+        When a table dataset is set, the cells of the file's tables are appended to it.
+
+        Returns:
+            dict | None: The metrics report of the file, or None when metrics are disabled.
+        """
+        report, dataset_tables, _ = self._process_measured(loader, base_output_folder, storage)
+        self.add_dataset_tables(os.path.abspath(loader.filepath), loader.file_extension.lstrip('.'), dataset_tables)
+        return report
+
+    def add_dataset_tables(self, document, file_type, dataset_tables):
+        """
+        Appends the tables of a file to the table dataset, if one is set.
+
+        Args:
+            document (str): The path of the file.
+            file_type (str): The type of the file.
+            dataset_tables (list): The table records of the file with their 'rows'.
+        """
+        if self.table_dataset is not None and dataset_tables:
+            self.table_dataset.add_tables(document, file_type, dataset_tables)
+
+    def _process_measured(self, loader, base_output_folder, storage=None):
+        """
+        Extracts, saves, and stores the content of a file, collecting its metrics when they are enabled.
+
+        Returns:
+            tuple: The metrics report of the file (or None), its table records with their 'rows' for the table dataset,
+                   and the errors of the PDF pages that failed.
+
+        Raises:
+            FileTimeout: If the file takes longer than the file timeout.
         """
-        extractor = DataExtractor(loader)  # Initialize the DataExtractor with the loader.
+        with time_limit(self.file_timeout, lambda: FileTimeout(
+                loader.filepath, "timeout", f"Extraction took longer than {self.file_timeout} seconds")):
+            if not self.metrics:
+                return (None, *self._process_file(loader, base_output_folder, storage))
+
+            with instrumentation.collect(loader.filepath, profile=self.profile) as metrics:
+                dataset_tables, page_errors = self._process_file(loader, base_output_folder, storage)
+        report = metrics.report()
+        metrics_folder = os.path.join(base_output_folder, "metrics")
+        self.ensure_directory(metrics_folder)
+        with open(os.path.join(metrics_folder, f"{loader.file_extension.lstrip('.')}_metrics.json"), 'w', encoding='utf-8') as file:
+            json.dump(report, file, ensure_ascii=False, indent=4)
+        logger.info("Processed %s in %.3fs", loader.filepath, report["seconds"])
+        return report, dataset_tables, page_errors
+
+    def _process_file(self, loader, base_output_folder, storage=None):
+        """
+        Extracts, saves, and stores the content of a file. See process_file.
+
+        Returns:
+            tuple: The table records of the file with their 'rows', which are removed from the saved and stored
+                   records, and the errors of the PDF pages that failed.
+        """
+        extractor = DataExtractor(loader, base_output_folder, writer=self.writer, **self.extractor_options)  # Initialize the DataExtractor with the loader.
         content_types = ['text', 'links', 'images', 'tables']  # Define the types of content to extract.
-        extraction_methods = {
-            'text': extractor.extract_text,
-            'links': extractor.extract_links,
-            'images': extractor.extract_images,
-            'tables': extractor.extract_tables
-        }
-        
+        file_type = loader.file_extension.lstrip('.')  # Get the file extension without the dot.
+        dataset_tables = []  # Tables whose cells are appended to the table dataset
+
+        if self.output_format == "jsonl":
+            iterators = {
+                'text': extractor.iter_text,
+                'links': extractor.iter_links,
+                'images': extractor.iter_images,
+                'tables': lambda: self._split_table_rows(extractor.iter_tables(), dataset_tables)
+            }
+            for content in content_types:
+                output_folder = os.path.join(base_output_folder, content, file_type)
+                self.ensure_directory(output_folder)
+                self.save_to_jsonl(iterators[content](), os.path.join(output_folder, f"{file_type}_{content}.jsonl"))
+            return dataset_tables, extractor.page_errors
+
+        extracted = extractor.extract_all()  # Parse the file once and extract every content type in one pass.
+        extracted["tables"] = list(self._split_table_rows(extracted["tables"], dataset_tables))
+
         for content in content_types:
-            # Call the appropriate extraction method and get the data.
-            data = extraction_methods[content]()
-            file_type = loader.file_extension.lstrip('.')  # Get the file extension without the dot.
+            data = extracted[content]
             output_folder = os.path.join(base_output_folder, content, file_type)  # Define the output folder path.
             self.ensure_directory(output_folder)  # Ensure the output directory exists.
             # Save the extracted data to a JSON file.
             self.save_to_file(data, os.path.join(output_folder, f"{file_type}_{content}.json"))
 
+        if self.writer is not None:
+            self.writer.flush()  # Every output file of the document is on disk before it is stored
+
+        if storage is not None:
+            document = os.path.abspath(loader.filepath)
+            if extractor.manifest_folder:
+                # Replace only the rows of the re-extracted pages; every row of the file when it is not paginated.
+                storage.replace_pages(extracted, file_type, document, extractor.changed_pages,
+                                      content_hash=extractor.content_hash)
+            else:
+                # Store the whole document in one transaction, with the content hash of the cache if it has one.
+                storage.store_document(extracted, file_type, document, content_hash=extractor.content_hash)
+        return dataset_tables, extractor.page_errors
+
+    def _split_table_rows(self, tables, dataset_tables):
+        """
+        Moves the cells of table records extracted with the 'rows' table format out of the records, so the saved
+        content files and database rows only describe the tables.
+
+        Args:
+            tables (iterable): The table records of a file.
+            dataset_tables (list): Receives a copy of every record that has 'rows', with the rows.
+
+        Yields:
+            dict: Each table record without its 'rows'.
+        """
+        for table in tables:
+            if "rows" in table:
+                dataset_tables.append(dict(table))
+                table = {key: value for key, value in table.items() if key != "rows"}
+            yield table
+
+    def collect_files(self, source):
+        """
+        Collects the files of a batch from a directory (searched recursively) or a glob pattern.
+        Only files whose extension has a registered loader are kept.
+
+        Args:
+            source (str): A directory path or a glob pattern such as "incoming/**/*.pdf".
+
+        Returns:
+            list: The sorted paths of the files to process.
+        """
+        if os.path.isdir(source):
+            paths = [os.path.join(root, name) for root, _, names in os.walk(source) for name in names]
+        else:
+            paths = glob.glob(source, recursive=True)
+        return sorted(path for path in paths if self.get_file_type(path) in self.loaders)
+
+    def get_file_type(self, file_path):
+        """
+        Returns the file type of a path, which is its lower-cased extension without the dot.
+
+        Args:
+            file_path (str): The path of the file.
+        """
+        return os.path.splitext(file_path)[1].lstrip('.').lower()
+
+    def preflight(self, file_path):
+        """
+        Checks a file with the pre-flight validation of its loader, which reads only a few KB of the file,
+        so that a corrupted, truncated, or encrypted file is rejected before it is handed to a worker.
+
+        Args:
+            file_path (str): The path of the file.
+
+        Raises:
+            PreflightError: If the file is rejected.
+        """
+        self.loaders[self.get_file_type(file_path)].validate_file(file_path)
+
+    def get_failed_result(self, file_path, output_folder, error):
+        """
+        Returns the result of a file that failed. The 'error_code' is the code of a structured error (an
+        ExtractionError such as a PreflightError, or a StorageError), and None for other errors.
+        """
+        return {"file_path": file_path, "output_folder": output_folder, "status": "failed", "error": str(error),
+                "error_code": error.code if isinstance(error, (ExtractionError, StorageError)) else None}
+
+    def get_batch_output_folder(self, file_path, batch_root):
+        """
+        Returns the output folder of a single file in a batch. Every file gets its own folder,
+        mirroring its location below the batch root, so the outputs of different files never collide.
+
+        Args:
+            file_path (str): The path of the file being processed.
+            batch_root (str): The common directory of all the files in the batch.
+        """
+        return os.path.join(self.base_output_folder, "batch", os.path.relpath(file_path, batch_root))
+
+    def process_batch_file(self, file_path, output_folder, storage=None):
+        """
+        Processes one file of a batch inside a worker process. Failures are caught and reported in the
+        result so that a single bad file does not stop the rest of the batch. A file that takes longer than the
+        file timeout fails with the 'timeout' error code, and the PDF pages that failed within the page timeout
+        are listed under 'page_errors' of a file that is done.
+
+        Args:
+            file_path (str): The path of the file to process.
+            output_folder (str): The folder where this file's output is saved.
+            storage (Storage, optional): Storage that receives the extracted data, e.g. the connection a
+                                         long-running worker keeps open.
+
+        Returns:
+            dict: The file path, its output folder, the status ('done' or 'failed') and the error and its code,
+                  if any, with the metrics report of the file when metrics are enabled, and its table records with their
+                  'rows' under 'tables' when a table dataset is set.
+        """
+        loader = copy.copy(self.loaders[self.get_file_type(file_path)])  # Route the file to its loader by extension.
+        loader.filepath = file_path
+        try:
+            report, dataset_tables, page_errors = self._process_measured(loader, output_folder, storage)
+        except Exception as e:
+            logger.error("Error processing %s: %s", file_path, e)
+            return self.get_failed_result(file_path, output_folder, e)
+        result = {"file_path": file_path, "output_folder": output_folder, "status": "done", "error": None,
+                  "error_code": None, "page_errors": page_errors}
+        if report is not None:
+            result["metrics"] = report
+        if self.table_dataset is not None:
+            result["tables"] = dataset_tables  # Written by the parent process, which owns the dataset file
+        return result
+
+    def run_batch(self, source, workers=None, max_in_flight=None, quarantine=None, run_manifest=None):
+        """
+        Processes every supported file of a directory or glob pattern in parallel over a pool of worker processes.
+        At most `max_in_flight` files are queued at once; new files are submitted as earlier ones complete.
+        Files that fail the pre-flight validation are reported as failed without being submitted.
+
+        A worker process that dies, e.g. from a crash in a PDF library, breaks the whole pool, so the pool is
+        started again and the files that were in flight are retried one at a time. A file whose worker dies
+        while it runs alone fails with the 'worker_crashed' error code, and the batch goes on at full width.
+
+        With a quarantine, files quarantined by an earlier run are reported as skipped without being checked
+        or submitted, and every file that fails is quarantined.
+
+        With a run manifest, the state of every file is journaled as the run goes, and a restarted run resumes
+        where the last one stopped: files extracted by it are reported as done without being extracted again
+        ('previous_run' is True in their result), and files that were extracting when it died are submitted first.
+        A run manifest cannot be combined with a table dataset, which is written anew by every run and would
+        miss the tables of the files extracted by the earlier runs.
+
+        Args:
+            source (str): A directory path or a glob pattern selecting the files to process.
+            workers (int, optional): The number of worker processes. Defaults to the number of CPUs.
+            max_in_flight (int, optional): The maximum number of files submitted but not yet finished.
+                                           Defaults to twice the number of workers.
+            quarantine (Quarantine, optional): The list of failed input files kept across runs.
+            run_manifest (RunManifest, optional): The journal of the run, to resume an interrupted run.
+
+        Returns:
+            list: One result dictionary per file, as returned by `process_batch_file`.
+
+        Raises:
+            ValueError: If a run manifest is given and a table dataset is set.
+        """
+        if run_manifest is not None and self.table_dataset is not None:
+            raise ValueError("A resumed batch cannot write a table dataset: the tables of the files extracted "
+                             "by earlier runs would be missing from it")
+        file_paths = self.collect_files(source)
+        if not file_paths:
+            return []
+
+        workers = workers or os.cpu_count() or 1
+        max_in_flight = max_in_flight or workers * 2
+        batch_root = os.path.commonpath([os.path.dirname(os.path.abspath(path)) for path in file_paths])
+
+        if run_manifest is not None:
+            # Files that were being extracted when the last run died go first; sorting is stable
+            file_paths.sort(key=lambda path: run_manifest.get_state(path) != "extracting")
+            for file_path in file_paths:
+                if run_manifest.get_state(file_path) is None:
+                    run_manifest.mark(file_path, "pending")
+
+        results = []
+        pending = deque(file_paths)  # Files not submitted yet
+        suspects = deque()  # Files in flight when a worker died, with their output folders, retried one at a time
+        in_flight = {}  # The file path and output folder of every submitted file, by future
+        isolated = False  # Whether the only file in flight is a suspect running alone
+        executor = ProcessPoolExecutor(max_workers=workers)
+        try:
+            while pending or suspects or in_flight:
+                if suspects and not isolated:
+                    file_path, output_folder = suspects.popleft()
+                    in_flight[executor.submit(self.process_batch_file, file_path, output_folder)] = (file_path, output_folder)
+                    isolated = True
+                while not isolated and pending and len(in_flight) < max_in_flight:
+                    file_path = pending.popleft()
+                    output_folder = self.get_batch_output_folder(os.path.abspath(file_path), batch_root)
+                    entry = quarantine.get(file_path) if quarantine is not None else None
+                    if entry is not None:
+                        results.append({"file_path": file_path, "output_folder": output_folder, "status": "skipped",
+                                        "error": entry["error"], "error_code": entry["error_code"]})
+                        continue
+                    if run_manifest is not None and run_manifest.is_extracted(file_path):
+                        results.append({"file_path": file_path, "output_folder": output_folder, "status": "done",
+                                        "error": None, "error_code": None, "previous_run": True})
+                        continue
+                    try:
+                        self.preflight(file_path)  # Rejected files never take a slot
+                    except PreflightError as e:
+                        self._add_batch_result(results, self.get_failed_result(file_path, output_folder, e), quarantine,
+                                               run_manifest)
+                        continue
+                    in_flight[executor.submit(self.process_batch_file, file_path, output_folder)] = (file_path, output_folder)
+                    if run_manifest is not None:
+                        run_manifest.mark(file_path, "extracting")
+                if not in_flight:
+                    continue
+
+                # Wait for a slot so the queue of submitted files stays bounded.
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                crashed = self._collect_batch_futures(done, in_flight, results, quarantine, run_manifest)
+                if crashed and isolated:  # The suspect's own worker died
+                    file_path, output_folder = crashed[0]
+                    error = ExtractionError(file_path, "worker_crashed", "Worker process died while extracting the file")
+                    self._add_batch_result(results, self.get_failed_result(file_path, output_folder, error), quarantine,
+                                           run_manifest)
+                elif crashed:
+                    # Every other file in flight fails with the broken pool; keep those that finished before it broke.
+                    done, _ = wait(in_flight)
+                    suspects.extend(crashed + self._collect_batch_futures(done, in_flight, results, quarantine, run_manifest))
+                    logger.warning("A worker process died; retrying %d files one at a time", len(suspects))
+                isolated = False
+                if crashed:
+                    executor.shutdown(wait=False, cancel_futures=True)
+                    executor = ProcessPoolExecutor(max_workers=workers)
+        finally:
+            executor.shutdown(wait=True)
+
+        results.sort(key=lambda result: result["file_path"])  # Report results in input order.
+
+        failed = sum(result["status"] == "failed" for result in results)
+        skipped = sum(result["status"] == "skipped" for result in results)
+        resumed = sum(bool(result.get("previous_run")) for result in results)
+        print(f"Processed {len(results)} files ({failed} failed, {skipped} skipped, {resumed} extracted by an earlier run)")
+        return results
+
+    def _collect_batch_futures(self, futures, in_flight, results, quarantine=None, run_manifest=None):
+        """
+        Adds the results of finished batch futures and removes them from the files in flight.
+        Args:
+            futures (iterable): The finished futures.
+            in_flight (dict): The file path and output folder of every submitted file, by future; updated in place.
+            results (list): The results of the batch; updated in place.
+            quarantine (Quarantine, optional): The quarantine that failed files are added to.
+            run_manifest (RunManifest, optional): The journal the final state of every file is recorded in.
+
+        Returns:
+            list: The file path and output folder of every file whose worker process died.
+        """
+        crashed = []
+        for future in futures:
+            file_path, output_folder = in_flight.pop(future)
+            try:
+                result = self._collect_batch_result(future.result())
+            except BrokenProcessPool:
+                crashed.append((file_path, output_folder))
+                continue
+            except Exception as e:  # E.g. a result that could not be sent back
+                result = self.get_failed_result(file_path, output_folder, e)
+            self._add_batch_result(results, result, quarantine, run_manifest)
+        return crashed
+
+    def _add_batch_result(self, results, result, quarantine=None, run_manifest=None):
+        """
+        Adds the result of a file to the results of a batch, quarantining the file if it failed, and records
+        whether it was extracted or failed in the run manifest.
+        """
+        results.append(result)
+        if result["status"] == "failed" and quarantine is not None:
+            quarantine.add(result)
+        if run_manifest is not None:
+            run_manifest.mark(result["file_path"], "extracted" if result["status"] == "done" else "failed", result["error"])
+
+    def _collect_batch_result(self, result):
+        """
+        Appends the tables sent back by a batch worker to the table dataset and returns the rest of its result.
+        """
+        dataset_tables = result.pop("tables", None)
+        self.add_dataset_tables(os.path.abspath(result["file_path"]), self.get_file_type(result["file_path"]), dataset_tables)
+        return result
+
+    def create_storage(self):
+        """
+        Creates the storage backend selected by DB_BACKEND: a pooled MySQL connection by default,
+        or a local SQLite database file that needs no server.
+
+        Returns:
+            SQLStorage: The storage the extracted data is saved to.
+        """
+        if self.db_backend == "sqlite":
+            return SQLiteStorage(self.db_path)
+        return SQLStorage(**self.db_credentials)
+
     def run(self):
         """
         Main function that runs the file processing logic. It connects to the database, loads each file,
-        processes it using the appropriate loader, and extracts the required content.
+        processes it using the appropriate loader, and extracts the required content. When the database cannot
+        be connected to, the files are still extracted and saved.
         """
-        storage = SQLStorage(**self.db_credentials)  # Initialize SQL storage with database credentials.
-        if storage.connection.is_connected():
-            print("Successfully connected to the MySQL database")
+        try:
+            storage = self.create_storage()  # Initialize SQL storage with database credentials.
+        except StorageError as e:  # The files are still extracted and saved, only not stored
+            storage = None
+            print(f"Failed to connect to the {self.db_backend} database, continuing without it: {e}")
         else:
-            print("Failed to connect to the MySQL database")
+            if storage.is_connected():
+                print(f"Successfully connected to the {self.db_backend} database")
+            else:
+                print(f"Failed to connect to the {self.db_backend} database")
 
         # Process each file type (pdf, docx, pptx) using the respective loader.
         for file_type, loader in self.loaders.items():
             loader.filepath = self.file_paths[file_type]  # Set the file path for the loader.
-            self.process_file(loader, self.base_output_folder)  # Process the file and extract its content.
+            try:
+                self.process_file(loader, self.base_output_folder, storage)  # Process the file and store its content.
+            except ExtractionError as e:  # A rejected, unreadable, or timed out file does not stop the other files
+                print(f"Skipped {e.filepath}: {e.message} ({e.code})")
+            except StorageError as e:  # The file is extracted and saved, but its rows were rolled back
+                print(f"Failed to store {loader.filepath}: {e} ({e.code})")
+
+def add_processing_arguments(parser):
+    """
+    Adds the extraction, output, and logging options to a command line parser. They are shared by the
+    command line in this module and by the extraction service.
+
+    Args:
+        parser (argparse.ArgumentParser): The parser the options are added to.
+    """
+    parser.add_argument("--page-workers", type=int, help="Worker processes used to extract the pages of a large PDF.")
+    parser.add_argument("--pages-per-chunk", type=int, default=25, help="Pages handed to a page worker at a time.")
+    parser.add_argument("--output-format", choices=["json", "jsonl"], default="json",
+                        help="Save content as JSON documents or stream it page by page into JSON Lines files.")
+    parser.add_argument("--image-store", help="Directory where images are saved once, named by the hash of their content.")
+    parser.add_argument("--image-mode", choices=["extract", "metadata"], default="extract",
+                        help="Save every image, or only record image metadata for later materialization.")
+    parser.add_argument("--writer-threads", type=int, default=0,
+                        help="Threads writing output files in the background; 0 writes them synchronously.")
+    parser.add_argument("--writer-queue", type=int, default=64, help="Maximum number of output files queued for writing.")
+    parser.add_argument("--fsync", action="store_true", help="Flush every output file to stable storage.")
+    parser.add_argument("--metrics", action="store_true",
+                        help="Collect the time of every stage, the pages, and the bytes written for each file.")
+    parser.add_argument("--profile", choices=list(instrumentation.PROFILERS),
+                        help="Profile each file with cProfile or pyinstrument; the report is saved with the metrics.")
+    parser.add_argument("--log-level", default="INFO", choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+                        help="Level of the log events printed to the console.")
+    parser.add_argument("--manifest-folder",
+                        help="Directory of page fingerprints; only the changed pages and slides of a file are re-extracted.")
+    parser.add_argument("--no-table-prefilter", action="store_true",
+                        help="Run table detection on every PDF page, even pages whose drawings cannot form a table.")
+    parser.add_argument("--streaming", action="store_true",
+                        help="Read DOCX and PPTX files part by part from the archive to bound memory use on very large files.")
+    parser.add_argument("--heading-detection", choices=list(HEADING_DETECTIONS), default="threshold",
+                        help="Classify PDF headings by a fixed font size or relative to the body text of each page.")
+    parser.add_argument("--compact-records", action="store_true",
+                        help="Keep text lines as compact slotted records instead of dicts until they are written as JSON.")
+    parser.add_argument("--table-dataset",
+                        help="Path of a columnar file that receives the cells of every table instead of one CSV per table.")
+    parser.add_argument("--table-dataset-format", choices=list(DATASET_FORMATS), default="parquet",
+                        help="File format of the table dataset.")
+    parser.add_argument("--row-group-size", type=int, default=64 * 1024, help="Table cells per row group of the dataset.")
+    parser.add_argument("--file-timeout", type=float,
+                        help="Seconds the extraction of a single file may take before it is reported as failed.")
+    parser.add_argument("--page-timeout", type=float,
+                        help="Seconds each stage of a single PDF page may take before the page is skipped and reported.")
+    parser.add_argument("--cache-folder", help="Directory of the extraction cache; unchanged files are not re-extracted.")
+    parser.add_argument("--cache-max-mb", type=int, default=512, help="Maximum size of the extraction cache in MB.")
+    parser.add_argument("--clear-cache", action="store_true", help="Remove every entry from the extraction cache first.")
+
+def create_processor(args):
+    """
+    Creates the FileProcessor configured by the options of add_processing_arguments.
+
+    Args:
+        args (argparse.Namespace): The parsed command line options.
+
+    Returns:
+        FileProcessor: The processor, with its extraction cache, background writer, and table dataset.
+    """
+    extractor_options = {"page_workers": args.page_workers, "pages_per_chunk": args.pages_per_chunk,
+                         "image_store": args.image_store, "image_mode": args.image_mode,
+                         "manifest_folder": args.manifest_folder, "table_prefilter": not args.no_table_prefilter,
+                         "streaming": args.streaming, "compact_records": args.compact_records,
+                         "heading_detection": args.heading_detection, "page_timeout": args.page_timeout}
+    if args.cache_folder:
+        cache = ExtractionCache(args.cache_folder, max_bytes=args.cache_max_mb * 1024 * 1024)
+        if args.clear_cache:
+            cache.clear()
+        extractor_options["cache"] = cache
+    writer = None
+    if args.writer_threads > 0:
+        writer = ArtifactWriter(max_workers=args.writer_threads, max_pending=args.writer_queue, fsync=args.fsync)
+    table_dataset = None
+    if args.table_dataset:
+        table_dataset = TableDataset(args.table_dataset, format=args.table_dataset_format, row_group_size=args.row_group_size)
+    return FileProcessor(extractor_options=extractor_options, output_format=args.output_format,
+                         writer=writer, metrics=args.metrics, profile=args.profile,
+                         table_dataset=table_dataset, file_timeout=args.file_timeout)
 
 if __name__ == "__main__":
-    processor = FileProcessor()  # Create a FileProcessor instance.
-    processor.run()  # Run the file processing.
+    parser = argparse.ArgumentParser(description="Extract text, links, images, and tables from PDF, DOCX, and PPTX files.")
+    parser.add_argument("--batch", help="Directory or glob pattern of files to process in parallel.")
+    parser.add_argument("--workers", type=int, help="Number of worker processes for batch mode.")
+    parser.add_argument("--max-in-flight", type=int, help="Maximum number of queued files in batch mode.")
+    parser.add_argument("--quarantine",
+                        help="JSON Lines file listing the files that failed; batch mode skips them until they change.")
+    parser.add_argument("--run-manifest",
+                        help="JSON Lines journal of the batch; a restarted batch skips the files it already extracted.")
+    add_processing_arguments(parser)
+    args = parser.parse_args()
+    if args.run_manifest and args.table_dataset:  # Checked before the dataset file is created
+        parser.error("--run-manifest cannot be combined with --table-dataset: a resumed batch would write a "
+                     "dataset without the tables of the files extracted by earlier runs")
+    logging.basicConfig(level=args.log_level, format="%(message)s")
+
+    processor = create_processor(args)
+    try:
+        if args.batch:
+            quarantine = Quarantine(args.quarantine) if args.quarantine else None
+            run_manifest = RunManifest(args.run_manifest) if args.run_manifest else None
+            results = processor.run_batch(args.batch, workers=args.workers, max_in_flight=args.max_in_flight,
+                                          quarantine=quarantine, run_manifest=run_manifest)
+            sys.exit(1 if any(result["status"] == "failed" for result in results) else 0)
+        processor.run()  # Run the file processing.
+    finally:
+        if processor.table_dataset is not None:
+            processor.table_dataset.close()  # Writes the last row group and the file footer
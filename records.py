@@ -0,0 +1,86 @@
+import sys
+from dataclasses import dataclass
+from collections.abc import Mapping
+
+class Record(Mapping):
+    """
+    Base class of the compact text records. A record keeps its fields in `__slots__` instead of a per-instance
+    dict, and is a read-only mapping of its field names to their values, so code written for the dict records
+    (item access, `get`, `in`, and comparison with dicts) works unchanged. Records are converted to dicts only
+    when they are written as JSON, with `to_json` as the `default` hook of json.dump.
+    """
+
+    __slots__ = ()
+
+    def __getitem__(self, key):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self):
+        return iter(self.__slots__)
+
+    def __len__(self):
+        return len(self.__slots__)
+
+    def to_dict(self):
+        """
+        Returns the record as a plain dict, converting nested records as well.
+        """
+        return {key: to_plain(getattr(self, key)) for key in self.__slots__}
+
+@dataclass(eq=False)
+class TextLine(Record):
+    """
+    One line or paragraph of text with its style: a merged PDF line, a DOCX paragraph, or a PPTX paragraph.
+    The style name is interned, so the millions of lines of a batch share one string per style.
+    """
+
+    __slots__ = ("text", "style")
+    text: str
+    style: str
+
+    def __post_init__(self):
+        if self.style is not None:
+            self.style = sys.intern(self.style)
+
+@dataclass(eq=False)
+class PageText(Record):
+    """
+    The text lines of one PDF page.
+    """
+
+    __slots__ = ("page_number", "content")
+    page_number: int
+    content: list
+
+@dataclass(eq=False)
+class SlideText(Record):
+    """
+    The text lines of one PPTX slide.
+    """
+
+    __slots__ = ("slide_number", "content")
+    slide_number: int
+    content: list
+
+def to_plain(value):
+    """
+    Converts records, and lists of records, to plain dicts and lists; other values are returned as they are.
+    """
+    if isinstance(value, Record):
+        return value.to_dict()
+    if isinstance(value, list):
+        return [to_plain(item) for item in value]
+    return value
+
+def to_json(value):
+    """
+    The `default` hook of json.dump and json.dumps for data that may hold records.
+
+    Raises:
+        TypeError: If the value is not a record, as json.dump does for any other unserializable value.
+    """
+    if isinstance(value, Record):
+        return value.to_dict()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
@@ -0,0 +1,423 @@
+import os
+import json
+import time
+import uuid
+import queue
+import logging
+import argparse
+import threading
+import socketserver
+import multiprocessing
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from concurrent.futures import ProcessPoolExecutor
+from main import add_processing_arguments, create_processor
+from loaders.preflight import PreflightError
+from errors import StorageError
+
+logger = logging.getLogger(__name__)
+
+# State of a service worker process, set once by _init_worker and kept for the life of the process.
+_processor = None  # The FileProcessor of this worker
+_storage = None  # The database storage this worker keeps open between documents
+_store = False  # Whether this worker stores documents
+_progress = None  # Queue of the progress events sent back to the service
+_started = None  # Barrier the workers meet at when the service starts
+
+def _init_worker(processor, store, progress, started):
+    """
+    Prepares a worker process: keeps its FileProcessor and, when documents are stored, opens the database
+    connection that every document processed by this worker reuses. A database that cannot be connected to
+    does not stop the worker; the connection is tried again for the next document.
+    """
+    global _processor, _store, _progress, _started
+    _processor = processor
+    _store = store
+    _progress = progress
+    _started = started
+    _connect_storage()
+
+def _connect_storage():
+    """
+    Opens the database storage of this worker if documents are stored and it is not open yet.
+
+    Returns:
+        StorageError | None: The error if the database cannot be connected to.
+    """
+    global _storage
+    if not _store or _storage is not None:
+        return None
+    try:
+        _storage = _processor.create_storage()
+    except StorageError as e:
+        logger.error("Worker %d cannot connect to the database: %s", os.getpid(), e)
+        return e
+    return None
+
+def _warm_up():
+    """
+    Runs once in every worker when the service starts. Each call waits for the others, so the pool has to
+    start all of its workers instead of handing every call to the first idle one.
+    """
+    try:
+        _started.wait(timeout=60)
+    except threading.BrokenBarrierError:  # A worker failed to start; the service still runs with the others
+        pass
+    return os.getpid()
+
+def _extract_document(job_id, file_path, output_folder):
+    """
+    Extracts, saves, and optionally stores one document in a worker process.
+    Returns:
+        dict: The result of FileProcessor.process_batch_file, with the worker's process id and the seconds spent.
+    """
+    _progress.put((job_id, {"event": "started", "worker": os.getpid()}))
+    start = time.perf_counter()
+    error = _connect_storage()
+    if error is not None:  # Reported for this document; the next one tries to connect again
+        result = _processor.get_failed_result(file_path, output_folder, error)
+    else:
+        result = _processor.process_batch_file(file_path, output_folder, storage=_storage)
+    result["worker"] = os.getpid()
+    result["seconds"] = time.perf_counter() - start
+    return result
+
+class ExtractionJob:
+    """
+    A document submitted to the service.
+
+    Attributes:
+        job_id (str): The id of the job, which also names its output folder.
+        file_path (str): The path of the document.
+        output_folder (str): The folder where the output of the document is saved.
+        future (concurrent.futures.Future): The result of the worker, as returned by process_batch_file.
+        events (queue.Queue): The progress events of the job, ending with None once the result is available.
+    """
+
+    def __init__(self, job_id, file_path, output_folder):
+        self.job_id = job_id
+        self.file_path = file_path
+        self.output_folder = output_folder
+        self.future = None
+        self.events = queue.Queue()
+        self._finished = threading.Event()
+
+    def result(self):
+        """
+        Waits until the job is finished and returns its result. A worker that died is reported as a failure.
+
+        Returns:
+            dict: The result of the document, as returned by FileProcessor.process_batch_file.
+        """
+        self._finished.wait()
+        try:
+            return self.future.result()
+        except Exception as e:  # E.g. a worker process killed by the operating system
+            return {"file_path": self.file_path, "output_folder": self.output_folder, "status": "failed", "error": str(e),
+                    "error_code": None}
+
+class ExtractionService:
+    """
+    Long-running extraction service. The worker processes are started once, with the extraction libraries
+    loaded and, when documents are stored, a database connection open, and then process one document after
+    another. Documents submitted while every worker is busy wait in the pool's queue.
+
+    Attributes:
+        processor (FileProcessor): The processor whose options every worker uses.
+        workers (int): The number of worker processes.
+        store (bool): Whether every document is also stored in the database.
+    """
+
+    def __init__(self, processor, workers=None, store=False):
+        """
+        Initializes the service. The workers are started by start().
+
+        Args:
+            processor (FileProcessor): The processor whose extraction and output options are used.
+            workers (int, optional): The number of worker processes. Defaults to the number of CPUs.
+            store (bool): Whether every document is also stored with the storage selected by DB_BACKEND.
+        """
+        self.processor = processor
+        self.workers = workers or os.cpu_count() or 1
+        self.store = store
+        self.executor = None
+        self._jobs = {}  # Jobs waiting for their result, by job id
+        self._lock = threading.Lock()
+        self._progress = None
+        self._dispatcher = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def start(self):
+        """
+        Starts the worker processes and waits until every one of them is ready.
+
+        Returns:
+            ExtractionService: The service itself.
+        """
+        self._progress = multiprocessing.Queue()
+        self.executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                            initargs=(self.processor, self.store, self._progress,
+                                                      multiprocessing.Barrier(self.workers)))
+        self._dispatcher = threading.Thread(target=self._dispatch_progress, daemon=True)
+        self._dispatcher.start()
+        pids = {future.result() for future in [self.executor.submit(_warm_up) for _ in range(self.workers)]}
+        print(f"Extraction service started {len(pids)} workers")
+        return self
+
+    def close(self):
+        """
+        Waits for the submitted documents and stops the workers. The table dataset, if any, is closed.
+        """
+        if self.executor is not None:
+            self.executor.shutdown(wait=True)
+            self.executor = None
+            self._progress.put(None)  # Stops the dispatcher
+            self._dispatcher.join()
+        if self.processor.table_dataset is not None:
+            self.processor.table_dataset.close()
+
+    def _dispatch_progress(self):
+        """
+        Hands the progress events sent by the workers to the jobs they belong to.
+        """
+        while True:
+            item = self._progress.get()
+            if item is None:
+                return
+            job_id, event = item
+            with self._lock:
+                job = self._jobs.get(job_id)
+            if job is not None:
+                job.events.put(event)
+
+    def submit(self, file_path, output_folder=None):
+        """
+        Submits a document for extraction.
+
+        Args:
+            file_path (str): The path of the document.
+            output_folder (str, optional): The folder where its output is saved. Defaults to a folder of its own
+                                           below '<base output folder>/service/<job id>'.
+
+        Returns:
+            ExtractionJob: The submitted job.
+
+        Raises:
+            FileNotFoundError: If the document does not exist.
+            ValueError: If no loader supports the file type of the document.
+            PreflightError: If the document fails the pre-flight validation of its loader.
+        """
+        file_path = os.path.abspath(file_path)
+        if not os.path.isfile(file_path):
+            raise FileNotFoundError(f"No such file: {file_path}")
+        if self.processor.get_file_type(file_path) not in self.processor.loaders:
+            raise ValueError(f"Unsupported file type: {file_path}")
+        self.processor.preflight(file_path)  # Bad documents are rejected before they reach a worker
+
+        job_id = uuid.uuid4().hex[:12]
+        if output_folder is None:
+            output_folder = os.path.join(self.processor.base_output_folder, "service", job_id, os.path.basename(file_path))
+        job = ExtractionJob(job_id, file_path, os.path.abspath(output_folder))
+        with self._lock:
+            self._jobs[job_id] = job
+        job.events.put({"event": "queued"})
+        job.future = self.executor.submit(_extract_document, job_id, job.file_path, job.output_folder)
+        job.future.add_done_callback(lambda future: self._finish(job))
+        return job
+
+    @property
+    def in_progress(self):
+        """
+        The number of documents submitted and not finished yet.
+        """
+        with self._lock:
+            return len(self._jobs)
+
+    def _finish(self, job):
+        """
+        Completes a job once its worker is done: appends its tables to the table dataset and ends its events.
+        """
+        with self._lock:
+            self._jobs.pop(job.job_id, None)
+            if job.future.exception() is None:
+                result = job.future.result()
+                # Only this process writes the dataset; the lock keeps the tables of one document together
+                self.processor.add_dataset_tables(job.file_path, self.processor.get_file_type(job.file_path),
+                                                  result.pop("tables", None))
+        job._finished.set()
+        job.events.put(None)
+
+    def extract(self, file_path, output_folder=None):
+        """
+        Extracts a document and waits for the result.
+
+        Returns:
+            dict: The result of the document, as returned by FileProcessor.process_batch_file.
+        """
+        return self.submit(file_path, output_folder).result()
+
+    def read_content(self, result):
+        """
+        Reads the content files saved for a document.
+
+        Args:
+            result (dict): The result of the document.
+
+        Returns:
+            dict: The saved records of each content type ('text', 'links', 'images', 'tables').
+        """
+        file_type = self.processor.get_file_type(result["file_path"])
+        content = {}
+        for content_type in ('text', 'links', 'images', 'tables'):
+            path = os.path.join(result["output_folder"], content_type, file_type, f"{file_type}_{content_type}.{self.processor.output_format}")
+            with open(path, encoding="utf-8") as file:
+                if self.processor.output_format == "jsonl":
+                    content[content_type] = [json.loads(line) for line in file]
+                else:
+                    content[content_type] = json.load(file)
+        return content
+
+class ExtractionRequestHandler(BaseHTTPRequestHandler):
+    """
+    HTTP interface of the extraction service.
+
+    GET /health returns the number of workers and of documents in progress.
+    POST /extract takes a JSON body with the 'path' of a document and optionally its 'output_folder',
+    'include_content' to return the extracted records with the result, and 'stream' to receive the progress
+    of the document as JSON Lines ('queued', 'started', then 'done' or 'failed' with the result).
+    """
+
+    server_version = "DataExtractor"
+
+    def log_message(self, format, *args):
+        logger.info(format, *args)
+
+    def _send_json(self, status, data):
+        body = json.dumps(data, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path != "/health":
+            self._send_json(404, {"error": f"Unknown path: {self.path}"})
+            return
+        service = self.server.service
+        self._send_json(200, {"status": "ok", "workers": service.workers, "in_progress": service.in_progress})
+
+    def do_POST(self):
+        if self.path != "/extract":
+            self._send_json(404, {"error": f"Unknown path: {self.path}"})
+            return
+        try:
+            request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+            file_path = request["path"]
+        except (ValueError, KeyError, TypeError):
+            self._send_json(400, {"error": "The body must be a JSON object with the 'path' of a document"})
+            return
+
+        service = self.server.service
+        try:
+            job = service.submit(file_path, request.get("output_folder"))
+        except FileNotFoundError as e:
+            self._send_json(404, {"error": str(e)})
+            return
+        except PreflightError as e:
+            self._send_json(422, dict(e.to_dict(), error=str(e)))
+            return
+        except ValueError as e:
+            self._send_json(415, {"error": str(e)})
+            return
+
+        if request.get("stream"):
+            self._stream_job(job, request.get("include_content", False))
+            return
+        result = self._get_result(job, request.get("include_content", False))
+        self._send_json(200 if result["status"] == "done" else 422, result)
+
+    def _get_result(self, job, include_content):
+        """
+        Waits for the result of a job, adding its extracted records when they are requested.
+        """
+        result = dict(job.result(), job_id=job.job_id)
+        if include_content and result["status"] == "done":
+            result["content"] = self.server.service.read_content(result)
+        return result
+
+    def _stream_job(self, job, include_content):
+        """
+        Sends the progress events of a job as JSON Lines while it runs, ending with its result.
+        The connection is closed after the last event.
+        """
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.end_headers()
+        start = time.perf_counter()
+        while True:
+            event = job.events.get()
+            if event is None:
+                break
+            event = dict(event, job_id=job.job_id, elapsed=time.perf_counter() - start)
+            self.wfile.write(json.dumps(event).encode("utf-8") + b"\n")
+            self.wfile.flush()
+        result = self._get_result(job, include_content)
+        event = {"event": result["status"], "job_id": job.job_id, "elapsed": time.perf_counter() - start, "result": result}
+        self.wfile.write(json.dumps(event, ensure_ascii=False).encode("utf-8") + b"\n")
+        self.wfile.flush()
+
+class UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """
+    HTTP server listening on a Unix domain socket, handling every connection in its own thread.
+    """
+
+    daemon_threads = True
+
+def create_server(service, host="127.0.0.1", port=8750, socket_path=None):
+    """
+    Creates the HTTP server of an extraction service, on a TCP port or on a Unix domain socket.
+
+    Args:
+        service (ExtractionService): The started service.
+        host (str): The address the TCP server listens on.
+        port (int): The TCP port; 0 picks a free port.
+        socket_path (str, optional): The path of a Unix domain socket to listen on instead of a TCP port.
+
+    Returns:
+        socketserver.BaseServer: The server; call serve_forever() to handle requests.
+    """
+    if socket_path:
+        if os.path.exists(socket_path):
+            os.remove(socket_path)  # Left over by a previous run
+        server = UnixHTTPServer(socket_path, ExtractionRequestHandler)
+    else:
+        server = ThreadingHTTPServer((host, port), ExtractionRequestHandler)
+    server.service = service
+    return server
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a long-running extraction service with warm worker processes.")
+    parser.add_argument("--host", default="127.0.0.1", help="Address the HTTP server listens on.")
+    parser.add_argument("--port", type=int, default=8750, help="Port the HTTP server listens on.")
+    parser.add_argument("--socket", help="Path of a Unix domain socket to listen on instead of a TCP port.")
+    parser.add_argument("--workers", type=int, help="Number of worker processes kept running.")
+    parser.add_argument("--store", action="store_true",
+                        help="Also store every document in the database, over a connection each worker keeps open.")
+    add_processing_arguments(parser)
+    args = parser.parse_args()
+    logging.basicConfig(level=args.log_level, format="%(message)s")
+
+    with ExtractionService(create_processor(args), workers=args.workers, store=args.store) as service:
+        server = create_server(service, args.host, args.port, args.socket)
+        print(f"Listening on {args.socket or f'http://{args.host}:{server.server_address[1]}'}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
@@ -0,0 +1,198 @@
+import os
+import csv
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import instrumentation
+
+class ArtifactWriter:
+    """
+    Background writer for output artifacts (image files, table CSVs, and JSON content files).
+    Extractors hand finished artifacts to the writer and move on to the next page while a pool of threads
+    writes them to disk, so extraction overlaps with file system I/O.
+
+    The number of queued artifacts is bounded: once `max_pending` writes are waiting, the next write blocks
+    until one completes, which keeps memory use flat when the disk is slower than extraction. flush() is the
+    barrier called at the end of each document; it waits for every queued write and raises the first error.
+
+    Attributes:
+        max_workers (int): The number of writer threads.
+        max_pending (int): The maximum number of queued or running writes.
+        fsync (bool): Whether every file is flushed to stable storage before its write completes.
+    """
+
+    def __init__(self, max_workers=4, max_pending=64, fsync=False):
+        """
+        Initializes the writer. The thread pool is started on the first write.
+
+        Args:
+            max_workers (int): The number of writer threads.
+            max_pending (int): The maximum number of queued or running writes before submitting blocks.
+            fsync (bool): Whether every file is flushed to stable storage before its write completes.
+        """
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.fsync = fsync
+        self._reset()
+
+    def _reset(self):
+        """
+        Sets up the thread pool state of this process.
+        """
+        self._executor = None
+        self._slots = threading.BoundedSemaphore(self.max_pending)  # Backpressure on queued writes
+        self._lock = threading.Condition()
+        self._pending = {}  # Future of the latest queued write to each destination path
+        self._running = set()  # Futures of every queued or running write
+        self._errors = []
+
+    def __getstate__(self):
+        # Threads and queued writes cannot be sent to another process; the receiving process starts its own pool.
+        return {"max_workers": self.max_workers, "max_pending": self.max_pending, "fsync": self.fsync}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._reset()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _submit(self, path, task, *args):
+        """
+        Queues a write, blocking while `max_pending` writes are already queued.
+        Args:
+            path (str): The destination path of the write.
+            task (callable): The function that writes the file.
+            *args: The arguments of the task.
+        """
+        self._slots.acquire()
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="artifact-writer")
+            future = self._executor.submit(task, *args)
+            self._pending[path] = future
+            self._running.add(future)
+        future.add_done_callback(lambda done: self._complete(path, done))
+
+    def _complete(self, path, future):
+        """
+        Releases the slot of a finished write and records its error, if any.
+        """
+        with self._lock:
+            if self._pending.get(path) is future:
+                del self._pending[path]
+            self._running.discard(future)
+            if future.exception() is not None:
+                self._errors.append(future.exception())
+            self._lock.notify_all()
+        self._slots.release()
+
+    def is_pending(self, path):
+        """
+        Returns whether a write to the given path is queued or running.
+        """
+        with self._lock:
+            return path in self._pending
+
+    def _sync(self, file):
+        """
+        Flushes a written file to stable storage when fsync is enabled.
+        """
+        if self.fsync:
+            file.flush()
+            os.fsync(file.fileno())
+
+    def _write_bytes(self, path, data, atomic):
+        target_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp" if atomic else path
+        with open(target_path, "wb") as file:
+            file.write(data)
+            self._sync(file)
+        if atomic:
+            os.replace(target_path, path)  # Readers never see a partial file
+        instrumentation.record_write(len(data))
+
+    def _write_text(self, path, text):
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(text)
+            self._sync(file)
+        instrumentation.record_file(path)
+
+    def _write_csv(self, path, rows):
+        with open(path, "w", newline="", encoding="utf-8") as file:
+            csv.writer(file).writerows(rows)
+            self._sync(file)
+        instrumentation.record_file(path)
+
+    def _copy_file(self, source_future, source_path, path):
+        if source_future is not None:
+            source_future.result()  # The source was queued earlier, so it is already running or done
+        shutil.copyfile(source_path, path)
+        instrumentation.record_file(path)
+        if self.fsync:
+            with open(path, "rb") as file:
+                os.fsync(file.fileno())
+
+    def write_bytes(self, path, data, atomic=False):
+        """
+        Queues a binary file, such as an image.
+        Args:
+            path (str): The destination path.
+            data (bytes): The file content.
+            atomic (bool): Write to a temporary file and rename it, so concurrent readers never see a partial file.
+        """
+        self._submit(path, self._write_bytes, path, data, atomic)
+
+    def write_text(self, path, text):
+        """
+        Queues a UTF-8 text file, such as a JSON document.
+        Args:
+            path (str): The destination path.
+            text (str): The file content.
+        """
+        self._submit(path, self._write_text, path, text)
+
+    def write_csv(self, path, rows):
+        """
+        Queues a CSV file.
+        Args:
+            path (str): The destination path.
+            rows (list of lists): The rows of the table; they must not be modified after the call.
+        """
+        self._submit(path, self._write_csv, path, rows)
+
+    def copy_file(self, source_path, path):
+        """
+        Queues a copy of a file. If the source is itself still queued, the copy waits for it.
+        Args:
+            source_path (str): The path of the file to copy.
+            path (str): The destination path.
+        """
+        with self._lock:
+            source_future = self._pending.get(source_path)
+        self._submit(path, self._copy_file, source_future, source_path, path)
+
+    def flush(self):
+        """
+        Waits until every queued write is on disk. Called at the end of each document.
+        Raises:
+            OSError: The first error raised by a write since the last flush.
+        """
+        with self._lock:
+            self._lock.wait_for(lambda: not self._running)
+            errors, self._errors = self._errors, []
+        if errors:
+            raise errors[0]
+
+    def close(self):
+        """
+        Flushes every queued write and stops the writer threads.
+        """
+        try:
+            self.flush()
+        finally:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
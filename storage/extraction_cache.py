@@ -0,0 +1,250 @@
+import os
+import json
+import hashlib
+import logging
+from collections import OrderedDict
+from records import to_json
+
+logger = logging.getLogger(__name__)
+
+class ExtractionCache:
+    """
+    Persistent on-disk cache of extraction results, so unchanged documents are not re-extracted on every run.
+    Each entry is a JSON file keyed by the SHA-256 of the document content, the extractor version, and the
+    extraction options. The cache is bounded in size and evicts the least recently used entries first.
+
+    The size of the entries and their order of use are kept in an index, built by scanning the directory once,
+    so storing an entry does not scan the directory again. Entries written by other processes sharing the
+    directory are added to the index when they are read, or by the next full scan of evict().
+
+    Attributes:
+        cache_folder (str): The directory holding the cache entries.
+        max_bytes (int): The maximum total size of the cache entries on disk.
+    """
+
+    entry_extension = ".json"
+
+    def __init__(self, cache_folder, max_bytes=512 * 1024 * 1024):
+        """
+        Initializes the cache and creates its directory if needed.
+
+        Args:
+            cache_folder (str): The directory holding the cache entries.
+            max_bytes (int): The maximum total size of the cache entries; older entries are evicted beyond it.
+        """
+        self.cache_folder = cache_folder
+        self.max_bytes = max_bytes
+        self._index = None  # Size of every entry by path, least recently used first; None until the first scan
+        self._size = 0  # Total size of the indexed entries
+        os.makedirs(self.cache_folder, exist_ok=True)
+
+    @staticmethod
+    def hash_file(filepath, chunk_size=1024 * 1024):
+        """
+        Computes the SHA-256 of a file's content, reading it in chunks.
+
+        Args:
+            filepath (str): The path of the file to hash.
+            chunk_size (int): The number of bytes read at a time.
+
+        Returns:
+            str: The hexadecimal digest of the file content.
+        """
+        digest = hashlib.sha256()
+        with open(filepath, "rb") as file:
+            for chunk in iter(lambda: file.read(chunk_size), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def make_key(self, filepath, version, options, content_hash=None):
+        """
+        Builds the cache key of a document. Any change to the file content, the extractor version,
+        or an option that affects the output produces a different key.
+
+        Args:
+            filepath (str): The path of the document.
+            version (str): The version of the extraction logic.
+            options (dict): The extraction options that affect the extracted data.
+            content_hash (str, optional): The hash_file digest of the document, if the caller already computed
+                                          it; computed from the file otherwise.
+
+        Returns:
+            str: The cache key.
+        """
+        key_source = json.dumps({
+            "content": content_hash if content_hash is not None else self.hash_file(filepath),
+            "version": version,
+            "options": options
+        }, sort_keys=True)
+        return hashlib.sha256(key_source.encode("utf-8")).hexdigest()
+
+    def _entry_path(self, key):
+        """
+        Returns the path of the cache file of a key.
+        """
+        return os.path.join(self.cache_folder, key + self.entry_extension)
+
+    def _iter_entries(self):
+        """
+        Yields the directory entries of every cache file.
+        """
+        with os.scandir(self.cache_folder) as entries:
+            for entry in entries:
+                if entry.is_file() and entry.name.endswith(self.entry_extension):
+                    yield entry
+
+    def get(self, key):
+        """
+        Returns the cached extraction results for a key, or None on a miss.
+        An entry whose images or table CSV files no longer exist on disk is treated as a miss.
+
+        Args:
+            key (str): The cache key built by make_key.
+
+        Returns:
+            dict | None: The cached extraction results keyed by content type.
+        """
+        entry_path = self._entry_path(key)
+        try:
+            with open(entry_path, encoding="utf-8") as file:
+                entry = json.load(file)
+        except (OSError, ValueError):
+            return None
+
+        data = entry["data"]
+        artifact_paths = [item.get("image_path") for item in data.get("images", [])]
+        artifact_paths += [item.get("csv_path") for item in data.get("tables", [])]
+        if not all(os.path.exists(path) for path in artifact_paths if path):
+            return None
+
+        try:
+            os.utime(entry_path)  # Mark the entry as recently used for the eviction of the next full scan
+        except OSError:
+            pass
+        if self._index is not None:
+            if entry_path in self._index:
+                self._index.move_to_end(entry_path)
+            else:  # Written by another process
+                self._add_to_index(entry_path)
+        return data
+
+    def put(self, key, data, filepath=None, version=None):
+        """
+        Stores extraction results under a key, then evicts the least recently used entries if the cache is over
+        its size limit.
+        The entry is written to a temporary file and renamed, so concurrent readers never see a partial entry.
+
+        Args:
+            key (str): The cache key built by make_key.
+            data (dict): The extraction results keyed by content type.
+            filepath (str, optional): The path of the source document, recorded for invalidation.
+            version (str, optional): The extractor version, recorded for invalidation.
+        """
+        entry_path = self._entry_path(key)
+        temp_path = f"{entry_path}.{os.getpid()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as file:
+            entry = {"file_path": os.path.abspath(filepath) if filepath else None, "version": version, "data": data}
+            json.dump(entry, file, ensure_ascii=False, default=to_json)
+        os.replace(temp_path, entry_path)
+        if self._index is None:
+            self._scan()  # Indexes the new entry with the others
+        else:
+            self._add_to_index(entry_path)
+        self._evict_indexed()
+
+    def _scan(self):
+        """
+        Rebuilds the index from the cache directory, ordering the entries by their last use.
+        """
+        entries = []
+        for entry in self._iter_entries():
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:  # Removed by another process
+                continue
+            entries.append((stat.st_mtime, entry.path, stat.st_size))
+        self._index = OrderedDict((path, size) for _, path, size in sorted(entries))
+        self._size = sum(self._index.values())
+
+    def _add_to_index(self, entry_path):
+        """
+        Indexes an entry as the most recently used one, replacing its previous size if it was indexed.
+        """
+        try:
+            size = os.path.getsize(entry_path)
+        except OSError:
+            return
+        self._size += size - self._index.pop(entry_path, 0)
+        self._index[entry_path] = size
+
+    def evict(self):
+        """
+        Rescans the cache directory, picking up the entries written by other processes, and removes the least
+        recently used entries until the cache fits within max_bytes.
+
+        Returns:
+            int: The number of entries removed.
+        """
+        self._scan()
+        return self._evict_indexed()
+
+    def _evict_indexed(self):
+        """
+        Removes the least recently used indexed entries until their total size fits within max_bytes.
+
+        Returns:
+            int: The number of entries removed.
+        """
+        removed = 0
+        while self._size > self.max_bytes and self._index:
+            path, size = self._index.popitem(last=False)
+            try:
+                os.remove(path)
+                removed += 1
+            except FileNotFoundError:
+                pass
+            self._size -= size
+        if removed:
+            logger.info("Evicted %d entries from the extraction cache", removed)
+        return removed
+
+    def invalidate(self, filepath=None, keep_version=None):
+        """
+        Removes cache entries, either all of them or those matching the given criteria.
+        Use keep_version after changing the extraction logic to drop every entry built by older versions.
+
+        Args:
+            filepath (str, optional): Only remove the entries of this source document.
+            keep_version (str, optional): Only remove the entries whose extractor version differs from this one.
+
+        Returns:
+            int: The number of entries removed.
+        """
+        removed = 0
+        for entry in self._iter_entries():
+            if filepath is not None or keep_version is not None:
+                try:
+                    with open(entry.path, encoding="utf-8") as file:
+                        cached = json.load(file)
+                except (OSError, ValueError):
+                    cached = {}
+                if filepath is not None and cached.get("file_path") != os.path.abspath(filepath):
+                    continue
+                if keep_version is not None and cached.get("version") == keep_version:
+                    continue
+            try:
+                os.remove(entry.path)
+                removed += 1
+            except FileNotFoundError:
+                pass
+        self._index = None  # Rebuilt by the next put
+        return removed
+
+    def clear(self):
+        """
+        Removes every entry from the cache.
+
+        Returns:
+            int: The number of entries removed.
+        """
+        return self.invalidate()
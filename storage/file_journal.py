@@ -0,0 +1,83 @@
+import os
+import json
+import time
+
+class FileJournal:
+    """
+    Base of the JSON Lines files that keep a record of input files across batch runs, such as the quarantine
+    and the run manifest. Every record is appended as one line with the absolute path of the file and its
+    size and modification time when it was recorded; a later line for the same path replaces an earlier one.
+    Appending a line never rewrites the earlier ones, so the file stays valid however a run is interrupted,
+    and a last line cut short by a crash is ignored when the file is loaded.
+
+    Attributes:
+        path (str): The path of the JSON Lines file.
+    """
+
+    def __init__(self, path):
+        """
+        Loads the journal, if the file exists.
+
+        Args:
+            path (str): The path of the JSON Lines file.
+        """
+        self.path = path
+        self._entries = {}  # Latest entry of every file, by absolute path
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as file:
+                for line in file:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue  # The last line of a journal cut short by a crash
+                    self._entries[entry["file_path"]] = entry
+
+    def __len__(self):
+        return len(self._entries)
+
+    @staticmethod
+    def _fingerprint(file_path):
+        """
+        Returns the size and modification time of a file, or None if it cannot be read.
+        """
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+        return stat.st_size, stat.st_mtime_ns
+
+    def _get_entry(self, file_path):
+        """
+        Returns the latest entry of a file, or None if the journal does not know it.
+        """
+        return self._entries.get(os.path.abspath(file_path))
+
+    def _is_unchanged(self, entry, file_path):
+        """
+        Returns whether a file has the size and modification time recorded in its entry.
+        """
+        return self._fingerprint(file_path) == (entry["size"], entry["mtime_ns"])
+
+    def _append(self, file_path, fingerprint=None, **fields):
+        """
+        Appends the entry of a file to the journal.
+
+        Args:
+            file_path (str): The path of the file.
+            fingerprint (tuple, optional): The size and modification time of the file; read from the file if
+                                           not given, and recorded as None if it cannot be read.
+            **fields: The other fields of the entry.
+
+        Returns:
+            dict: The entry, with its 'file_path', 'size', 'mtime_ns', and 'time'.
+        """
+        size, mtime_ns = fingerprint or self._fingerprint(file_path) or (None, None)
+        entry = {"file_path": os.path.abspath(file_path), **fields, "size": size, "mtime_ns": mtime_ns,
+                 "time": time.time()}
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as file:
+            file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        self._entries[entry["file_path"]] = entry
+        return entry
@@ -0,0 +1,55 @@
+import logging
+from .file_journal import FileJournal
+
+logger = logging.getLogger(__name__)
+
+# Error codes that say nothing about the input file, so its failure is not a reason to quarantine it.
+TRANSIENT_ERROR_CODES = frozenset({"storage_unavailable", "storage_failed"})
+
+class Quarantine(FileJournal):
+    """
+    List of the input files that failed, kept in a JSON Lines file across batch runs. A quarantined file is
+    skipped by later batches until it changes, so known-bad files do not take worker time again, and the list
+    tells an operator which files to look at and why they failed.
+
+    Each line records one failure: the absolute path of the file, its size and modification time when it
+    failed, and the error and its code. A later line for the same path replaces an earlier one. A file whose
+    size or modification time changed since it failed is no longer quarantined.
+
+    Attributes:
+        path (str): The path of the JSON Lines file.
+    """
+
+    def get(self, file_path):
+        """
+        Returns the quarantine entry of a file, or None if the file is not quarantined or changed since it failed.
+
+        Args:
+            file_path (str): The path of the file.
+
+        Returns:
+            dict | None: The entry with the 'file_path', 'size', 'mtime_ns', 'error', 'error_code', and 'time'.
+        """
+        entry = self._get_entry(file_path)
+        if entry is None or not self._is_unchanged(entry, file_path):
+            return None
+        return entry
+
+    def add(self, result):
+        """
+        Quarantines the file of a failed result. Failures with a transient error code, and files that no
+        longer exist, are not quarantined.
+
+        Args:
+            result (dict): The result of the file, as returned by FileProcessor.process_batch_file.
+
+        Returns:
+            bool: Whether the file was quarantined.
+        """
+        fingerprint = self._fingerprint(result["file_path"])
+        if result["error_code"] in TRANSIENT_ERROR_CODES or fingerprint is None:
+            return False
+        # Appended at once, so an interrupted batch keeps it
+        self._append(result["file_path"], fingerprint, error=result["error"], error_code=result["error_code"])
+        logger.info("Quarantined %s (%s)", result["file_path"], result["error_code"])
+        return True
@@ -0,0 +1,64 @@
+from .file_journal import FileJournal
+
+# States of an input file in a run. A file is pending until it is submitted, extracting while a worker has it,
+# and extracted once its output files are written (and its rows stored, when the worker stores them), or failed.
+RUN_STATES = ("pending", "extracting", "extracted", "failed")
+
+class RunManifest(FileJournal):
+    """
+    Journal of the progress of a batch run, so a run that dies partway can be restarted where it stopped.
+    Every change of the state of an input file is appended as one line of a JSON Lines file, with the size
+    and modification time of the file; the last line of a file is its state.
+
+    When the run is restarted with the same journal, files that were extracted and have not changed since are
+    skipped, and files that were extracting when the run died are extracted again first. Their output files
+    are overwritten, so the restarted run leaves the same output files as a run that was never interrupted.
+
+    Attributes:
+        path (str): The path of the JSON Lines file.
+    """
+
+    def get_state(self, file_path):
+        """
+        Returns the state of a file in the journal, or None if the journal does not know it.
+
+        Args:
+            file_path (str): The path of the file.
+        """
+        entry = self._get_entry(file_path)
+        return entry["state"] if entry is not None else None
+
+    def is_extracted(self, file_path):
+        """
+        Returns whether a file was extracted by the run and has not changed since.
+
+        Args:
+            file_path (str): The path of the file.
+        """
+        entry = self._get_entry(file_path)
+        return entry is not None and entry["state"] == "extracted" and self._is_unchanged(entry, file_path)
+
+    def mark(self, file_path, state, error=None):
+        """
+        Records the state of a file.
+
+        Args:
+            file_path (str): The path of the file.
+            state (str): One of RUN_STATES.
+            error (str, optional): The error of a failed file.
+        """
+        if state not in RUN_STATES:
+            raise ValueError(f"Unknown run state: {state}")
+        fields = {"state": state}
+        if error is not None:
+            fields["error"] = error
+        self._append(file_path, **fields)
+
+    def counts(self):
+        """
+        Returns the number of files in each state.
+        """
+        counts = dict.fromkeys(RUN_STATES, 0)
+        for entry in self._entries.values():
+            counts[entry["state"]] += 1
+        return counts
@@ -1,15 +1,75 @@
-import sys
+import os
+import time
+import hashlib
+import logging
+import threading
+from contextlib import contextmanager
 from .storage import Storage
 import mysql.connector
+import instrumentation
+from instrumentation import instrumented
 from mysql.connector import Error
+from errors import StorageError, StorageWriteError
+from .extraction_cache import ExtractionCache
+
+logger = logging.getLogger(__name__)
 
 class SQLStorage(Storage):
     """
     Concrete class for storing extracted data into a MySQL database.
     This class handles connections to a MySQL database and provides methods to store various types of data.
+    Rows are inserted in bulk with executemany, in chunks of `chunk_size` rows, and the tables are created
+    once when the storage is initialized.
+
+    Connections come from a connection pool. Each thread checks out its own pooled connection the first time
+    it uses the storage, so one instance can be shared by worker threads, and a process that inherits the
+    instance (e.g. a forked worker) opens fresh connections instead of reusing the parent's sockets.
+    Dropped connections are re-established automatically before each query.
+
+    Rows can be tagged with the path of their source document. The documents are kept in the 'documents' table
+    with the SHA-256 of their path and content, and every row of a document refers to it by 'document_id' and
+    is keyed by its 'item_index', its position among the rows of the document in that table. Storing a document
+    again upserts its rows by that key and deletes the rows past its new end, in one transaction, so re-running
+    a batch replaces the rows of a document instead of duplicating them. The rows of re-extracted pages or
+    slides can be replaced with replace_pages.
     """
 
-    def __init__(self, host, user, password, database):
+    placeholder = "%s"  # Parameter marker of the database driver
+    database_error = Error  # Exception raised by the database driver
+    # Dialect of the table definitions and upserts; SQLiteStorage overrides these and inherits everything else.
+    primary_key = "INT AUTO_INCREMENT PRIMARY KEY"  # Definition of the generated 'id' column of every table
+    document_index = "document(255)"  # Indexed prefix of the document path; MySQL keys are limited to 3072 bytes
+    upsert_clause = "ON DUPLICATE KEY UPDATE {updates}"  # Turns an insert into an upsert on the unique key
+    upsert_update = "{column} = VALUES({column})"  # Updates a column of a stored row from the inserted row
+    row_key = ("document_id", "item_index")  # Unique key of the rows of a document in every data table
+
+    # The documents the rows of the data tables come from, keyed by the SHA-256 of their path. Created first,
+    # since every data table refers to it.
+    DOCUMENTS_COLUMNS = (
+        ("path", "VARCHAR(1024) NOT NULL"),
+        ("path_hash", "CHAR(64) NOT NULL"),
+        ("content_hash", "CHAR(64)"),
+        ("file_type", "VARCHAR(255)"),
+    )
+
+    # Columns every data table starts with: its document, the key of the row within the document, and its location.
+    DOCUMENT_COLUMNS = (
+        ("document", "VARCHAR(1024)"),
+        ("document_id", "INT"),
+        ("item_index", "INT"),
+        ("file_type", "VARCHAR(255)"),
+        ("page_number", "INT"),
+    )
+
+    # Content columns of the data tables, which are created once at startup.
+    TABLE_COLUMNS = {
+        "text_data": (("text", "TEXT"),),
+        "links_data": (("linked_text", "TEXT"), ("link", "TEXT")),
+        "images_data": (("image_filename", "VARCHAR(255)"), ("image_format", "VARCHAR(50)")),
+        "tables_data": (("csv_filename", "VARCHAR(255)"),),
+    }
+
+    def __init__(self, host, user, password, database, chunk_size=1000, pool_size=5):
         """
         Initialize the SQLStorage with database connection parameters.
         Args:
@@ -17,32 +77,206 @@ class SQLStorage(Storage):
             user (str): The username used to authenticate with MySQL.
             password (str): The password used to authenticate with MySQL.
             database (str): The name of the database to use.
+            chunk_size (int): The maximum number of rows sent in a single bulk insert.
+            pool_size (int): The number of pooled connections per process; at least the number of worker threads.
         """
         self.host = host
         self.user = user
         self.password = password
         self.database = database
-        self.connection = None
+        self.pool_size = pool_size
+        self._initialize(chunk_size)
+
+    def _initialize(self, chunk_size):
+        """
+        Sets up the per-thread connection state, connects, and creates the tables.
+        Args:
+            chunk_size (int): The maximum number of rows sent in a single bulk insert.
+        """
+        self.chunk_size = chunk_size
+        self._pid = os.getpid()
+        self._local = threading.local()
         self._connect()
+        self._create_tables()
+
+    def __getstate__(self):
+        # Connections cannot be sent to another process; the receiving process opens its own.
+        state = self.__dict__.copy()
+        state.pop("_local", None)
+        state["_pid"] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._local = threading.local()
+
+    def _get_local(self):
+        """
+        Returns the connection state of the current thread, discarding state inherited from a parent process.
+        """
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            self._local = threading.local()
+        return self._local
+
+    @property
+    def connection(self):
+        """
+        The database connection of the current thread, checked out from the pool on first use.
+        """
+        local = self._get_local()
+        if getattr(local, "connection", None) is None:
+            self._connect()
+        return local.connection
+
+    @property
+    def _in_transaction(self):
+        return getattr(self._get_local(), "in_transaction", False)
 
+    @_in_transaction.setter
+    def _in_transaction(self, value):
+        self._get_local().in_transaction = value
+
+    @instrumented()
     def _connect(self):
         """
-        Attempts to establish a connection to the MySQL database.
-        Prints a message indicating the connection status.
+        Checks out a connection to the MySQL database from the connection pool of this process
+        for the current thread. Prints a message indicating the connection status.
+
+        Raises:
+            StorageError: If the database cannot be connected to.
         """
         try:
-            self.connection = mysql.connector.connect(
+            connection = mysql.connector.connect(
                 host=self.host,
                 user=self.user,
                 password=self.password,
-                database=self.database
+                database=self.database,
+                pool_name=f"extractor_{os.getpid()}_{id(self)}",  # One pool per process and storage
+                pool_size=self.pool_size
             )
-            if self.connection.is_connected():
-                print("Connected to MySQL database")
+            self._get_local().connection = connection
+            if connection.is_connected():
+                logger.debug("Connected to MySQL database %s on %s", self.database, self.host)
         except Error as e:
-            print(f"Error connecting to MySQL: {e}")
-            sys.exit(1)
+            logger.error("Error connecting to MySQL: %s", e)
+            raise StorageError(f"Error connecting to MySQL: {e}") from e
+
+    def _ensure_connected(self):
+        """
+        Re-establishes the connection of the current thread if the server dropped it.
+        """
+        if not self.connection.is_connected():
+            self.connection.reconnect(attempts=3, delay=1)
+
+    def is_connected(self):
+        """
+        Returns whether the current thread has a live database connection.
+        """
+        return bool(self.connection.is_connected())
+
+    def close(self):
+        """
+        Returns the connection of the current thread to the pool.
+        """
+        local = self._get_local()
+        if getattr(local, "connection", None) is not None:
+            local.connection.close()
+            local.connection = None
+
+    @instrumented()
+    def _create_tables(self):
+        """
+        Creates the documents table and the data tables if they do not exist yet, and brings tables created by
+        earlier versions up to date: adds the 'document', 'document_id', and 'item_index' columns, the foreign
+        key to the documents table, and the indexes that find and key the rows of a document. Only the missing
+        columns, keys, and indexes are added. Runs once, when the storage is initialized.
+
+        Raises:
+            StorageError: If a table cannot be brought up to date; without the unique key of the rows, storing a
+                          document again would duplicate its rows.
+        """
+        self._execute_query(self._get_table_definition("documents", self.DOCUMENTS_COLUMNS,
+                                                       ["CONSTRAINT documents_path UNIQUE (path_hash)"]))
+        self._add_index("documents", "documents_content_hash", "content_hash")
+        for table, columns in self.TABLE_COLUMNS.items():
+            foreign_key = f"CONSTRAINT {table}_document_fk FOREIGN KEY (document_id) REFERENCES documents (id) ON DELETE CASCADE"
+            self._execute_query(self._get_table_definition(table, self.DOCUMENT_COLUMNS + columns, [foreign_key]))
+            existing_columns = self._get_columns(table)
+            for column, definition in self.DOCUMENT_COLUMNS[:3]:  # Added by later versions
+                if column not in existing_columns:
+                    self._alter_table(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+            if not self._has_foreign_key(table, "document_id"):
+                self._add_foreign_key(table, foreign_key)
+            self._add_index(table, f"{table}_document", self.document_index)
+            self._add_index(table, f"{table}_document_item", ", ".join(self.row_key), unique=True)
+
+    def _get_table_definition(self, table, columns, constraints=()):
+        """
+        Returns the CREATE TABLE statement of a table in the dialect of the database.
+        Args:
+            table (str): The name of the table.
+            columns (tuple): The (name, definition) pairs of the columns after the generated 'id' column.
+            constraints (list, optional): The table constraints, e.g. unique and foreign keys.
+        """
+        definitions = [f"id {self.primary_key}"] + [f"{name} {definition}" for name, definition in columns]
+        return f"CREATE TABLE IF NOT EXISTS {table} ({', '.join(definitions + list(constraints))})"
 
+    def _add_index(self, table, name, columns, unique=False):
+        """
+        Creates an index of a table, unless the table already has an index of that name.
+        """
+        if name not in self._get_indexes(table):
+            self._alter_table(f"CREATE {'UNIQUE ' if unique else ''}INDEX {name} ON {table} ({columns})")
+
+    def _add_foreign_key(self, table, constraint):
+        """
+        Adds a foreign key constraint to a table created by an earlier version.
+        """
+        self._alter_table(f"ALTER TABLE {table} ADD {constraint}")
+
+    def _get_columns(self, table):
+        """
+        Returns the names of the columns of a table.
+        """
+        return {row[0] for row in self._fetch_all(
+            "SELECT COLUMN_NAME FROM information_schema.COLUMNS WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s",
+            (table,))}
+
+    def _get_indexes(self, table):
+        """
+        Returns the names of the indexes of a table.
+        """
+        return {row[0] for row in self._fetch_all(
+            "SELECT INDEX_NAME FROM information_schema.STATISTICS WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s",
+            (table,))}
+
+    def _has_foreign_key(self, table, column):
+        """
+        Returns whether a column of a table has a foreign key constraint.
+        """
+        return bool(self._fetch_all(
+            "SELECT CONSTRAINT_NAME FROM information_schema.KEY_COLUMN_USAGE WHERE TABLE_SCHEMA = DATABASE() "
+            "AND TABLE_NAME = %s AND COLUMN_NAME = %s AND REFERENCED_TABLE_NAME IS NOT NULL", (table, column)))
+
+    def _alter_table(self, statement):
+        """
+        Runs a statement that brings a table up to date.
+
+        Raises:
+            StorageError: If the database rejects the statement, e.g. for lack of privileges.
+        """
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute(statement)
+            self.connection.commit()
+        except self.database_error as e:
+            logger.error("Cannot bring the table up to date with %s: %s", statement, e)
+            raise StorageError(f"Error migrating the tables: {e}") from e
+        finally:
+            cursor.close()
+
+    @instrumented()
     def _execute_query(self, query, data=None):
         """
         Executes a SQL query with optional parameters.
@@ -50,113 +284,354 @@ class SQLStorage(Storage):
             query (str): The SQL query to execute.
             data (tuple, optional): The data to be inserted into the database, if applicable.
         """
+        if not self._in_transaction:
+            self._ensure_connected()
         cursor = self.connection.cursor()
         try:
-            cursor.execute(query, data)
-            self.connection.commit()
-        except Error as e:
-            print(f"Error executing query: {e}")
+            cursor.execute(query, data or ())
+            if not self._in_transaction:
+                self.connection.commit()
+        except self.database_error as e:
+            if self._in_transaction:
+                raise
+            logger.error("Error executing query: %s", e)
         finally:
             cursor.close()
 
-    def store_text(self, text_data, file_type):
+    @instrumented()
+    def _execute_many(self, query, rows):
+        """
+        Executes a parameterized SQL query for many rows, sending them in chunks of `chunk_size` rows.
+        Outside a transaction the rows are committed once at the end; inside a transaction the commit is
+        left to the transaction.
+
+        Args:
+            query (str): The parameterized SQL query to execute.
+            rows (list of tuples): The parameters of each row.
+
+        Returns:
+            int: The number of rows sent to the database.
+        """
+        if not rows:
+            return 0
+
+        if not self._in_transaction:
+            self._ensure_connected()
+        cursor = self.connection.cursor()
+        try:
+            for start in range(0, len(rows), self.chunk_size):
+                cursor.executemany(query, rows[start:start + self.chunk_size])
+            if not self._in_transaction:
+                self.connection.commit()
+        except self.database_error as e:
+            if self._in_transaction:
+                raise  # Let the transaction roll back the whole document
+            self.connection.rollback()
+            logger.error("Error executing query: %s", e)
+            return 0
+        finally:
+            cursor.close()
+        return len(rows)
+
+    @instrumented()
+    def _fetch_one(self, query, data=None):
+        """
+        Executes a SQL query and returns its first row, or None if it returns no rows.
+        Args:
+            query (str): The SQL query to execute.
+            data (tuple, optional): The parameters of the query.
+        """
+        if not self._in_transaction:
+            self._ensure_connected()
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute(query, data or ())
+            return cursor.fetchone()
+        finally:
+            cursor.close()
+
+    def _fetch_all(self, query, data=None):
+        """
+        Executes a SQL query and returns all of its rows.
+        Args:
+            query (str): The SQL query to execute.
+            data (tuple, optional): The parameters of the query.
+        """
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute(query, data or ())
+            return list(cursor.fetchall())
+        finally:
+            cursor.close()
+
+    @contextmanager
+    def transaction(self):
+        """
+        Groups every insert made inside the `with` block into a single transaction.
+        The transaction is committed when the block completes and rolled back if any insert fails.
+
+        Raises:
+            StorageWriteError: If the database rejects a statement or the commit; nothing of the block is stored.
+        """
+        self._ensure_connected()
+        self._in_transaction = True
+        try:
+            yield self
+            self.connection.commit()
+        except self.database_error as e:
+            self.connection.rollback()
+            raise StorageWriteError(f"Error executing transaction, changes rolled back: {e}") from e
+        except Exception:
+            self.connection.rollback()  # Never leave a partial document behind
+            raise
+        finally:
+            self._in_transaction = False
+
+    @instrumented()
+    def _insert_rows(self, table, columns, rows, file_type, key=None):
+        """
+        Bulk inserts rows into a data table and logs the insert throughput.
+        Args:
+            table (str): The name of the table.
+            columns (tuple): The names of the columns, in the order of the row values.
+            rows (list of tuples): The rows to insert.
+            file_type (str): The type of file the rows were extracted from.
+            key (tuple, optional): The columns of a unique key. Rows whose key is already stored update the
+                                   stored row instead of being inserted.
+
+        Returns:
+            int: The number of rows inserted.
+        """
+        insert_query = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join([self.placeholder] * len(columns))})"
+        if key is not None:
+            insert_query += " " + self._get_upsert_clause(columns, key)
+        start_time = time.perf_counter()
+        inserted = self._execute_many(insert_query, rows)
+        elapsed = time.perf_counter() - start_time
+        instrumentation.increment("rows_inserted", inserted)
+        rate = inserted / elapsed if elapsed > 0 else 0.0
+        logger.debug("%d rows inserted into %s for %s (%.0f rows/s)", inserted, table, file_type, rate)
+        return inserted
+
+    def _get_upsert_clause(self, columns, key):
+        """
+        Returns the clause that turns an insert into an upsert, updating the other columns of a row whose unique
+        key is already stored.
+        """
+        updates = ", ".join(self.upsert_update.format(column=column) for column in columns if column not in key)
+        return self.upsert_clause.format(key=", ".join(key), updates=updates)
+
+    @staticmethod
+    def _get_location(item):
+        """
+        Returns the page or slide number of an extracted record, or None for DOCX records.
+        """
+        return item.get('page_number', item.get('slide_number'))
+
+    @staticmethod
+    def _with_document(columns, rows, document):
+        """
+        Adds the 'document' column to the columns and rows of an insert when a source document is given.
+        """
+        if document is None:
+            return columns, rows
+        return columns + ("document",), [row + (document,) for row in rows]
+
+    @instrumented()
+    def store_document(self, extracted, file_type, document=None, content_hash=None):
+        """
+        Stores all the data extracted from one document in a single transaction. When the source document is
+        given, it is recorded in the documents table and its rows are upserted by their key, and the rows past
+        the new end of the document are deleted, so storing a document again, e.g. when a batch is resumed,
+        replaces its rows instead of duplicating them.
+
+        Args:
+            extracted (dict): The extracted data keyed by content type ('text', 'links', 'images', 'tables').
+            file_type (str): The type of file from which the data is extracted.
+            document (str, optional): The path of the source document, stored with every row.
+            content_hash (str, optional): The SHA-256 of the document content; computed from the file if it exists.
+        """
+        with self.transaction():
+            if document is None:
+                self.store_text(extracted.get('text', []), file_type)
+                self.store_links(extracted.get('links', []), file_type)
+                self.store_images(extracted.get('images', []), file_type)
+                self.store_tables(extracted.get('tables', []), file_type)
+                return
+            document_id, created = self._upsert_document(document, file_type, content_hash)
+            self._store_document_rows(extracted, file_type, document, document_id, created)
+
+    @instrumented()
+    def replace_pages(self, extracted, file_type, document, page_numbers=None, content_hash=None):
+        """
+        Replaces the stored rows of the given pages or slides of a document with their freshly extracted records,
+        in a single transaction. Rows before the first of the pages are left untouched, and the rows from it on
+        are upserted by their key, so after an incremental re-extraction the stored rows match those of a full
+        re-run.
+
+        Args:
+            extracted (dict): The extracted data of the whole document, keyed by content type.
+            file_type (str): The type of file from which the data is extracted.
+            document (str): The path of the source document.
+            page_numbers (list, optional): The 1-based numbers of the re-extracted or removed pages or slides.
+                                           None replaces every row of the document.
+            content_hash (str, optional): The SHA-256 of the document content; computed from the file if it exists.
+        """
+        if page_numbers is not None and not page_numbers:
+            return  # Nothing changed
+
+        with self.transaction():
+            document_id, created = self._upsert_document(document, file_type, content_hash)
+            first_location = None if page_numbers is None else min(page_numbers)
+            self._store_document_rows(extracted, file_type, document, document_id, created, first_location)
+
+    def _upsert_document(self, document, file_type, content_hash=None):
+        """
+        Records a document in the documents table, or updates its content hash and file type.
+        Args:
+            document (str): The path of the document.
+            file_type (str): The type of the document.
+            content_hash (str, optional): The SHA-256 of the document content; computed from the file if it exists.
+
+        Returns:
+            tuple: The id of the document, and whether it was new.
+        """
+        if content_hash is None and os.path.isfile(document):
+            content_hash = ExtractionCache.hash_file(document)
+        path_hash = hashlib.sha256(document.encode("utf-8")).hexdigest()
+        select_query = f"SELECT id FROM documents WHERE path_hash = {self.placeholder}"
+        row = self._fetch_one(select_query, (path_hash,))
+        self._execute_query(
+            f"INSERT INTO documents (path, path_hash, content_hash, file_type) "
+            f"VALUES ({', '.join([self.placeholder] * 4)}) "
+            + self._get_upsert_clause(("path", "path_hash", "content_hash", "file_type"), ("path_hash",)),
+            (document, path_hash, content_hash, file_type)
+        )
+        if row is not None:
+            return row[0], False
+        return self._fetch_one(select_query, (path_hash,))[0], True
+
+    def _store_document_rows(self, extracted, file_type, document, document_id, created, first_location=None):
+        """
+        Upserts the rows of a document into every data table, keyed by the document id and the position of each
+        row among the rows of the document in the table, and deletes the rows past the new end of the document.
+
+        Args:
+            extracted (dict): The extracted data of the whole document, keyed by content type.
+            file_type (str): The type of file from which the data is extracted.
+            document (str): The path of the document.
+            document_id (int): The id of the document in the documents table.
+            created (bool): Whether the document is new in the documents table. Its rows stored by earlier versions
+                            without a document id are deleted, and every row is written.
+            first_location (int, optional): The first page or slide whose rows changed. Rows are ordered by page,
+                                            so the stored rows before it keep their positions and are left
+                                            untouched; only the records from it on are written.
+        """
+        for content in ('text', 'links', 'images', 'tables'):
+            table = f"{content}_data"
+            if created:
+                self._execute_query(f"DELETE FROM {table} WHERE document = {self.placeholder} AND document_id IS NULL",
+                                    (document,))
+            columns, rows = getattr(self, f"_get_{content}_rows")(extracted.get(content, []), file_type)
+            start = 0
+            if first_location is not None and not created:
+                start = self._fetch_one(f"SELECT COUNT(*) FROM {table} WHERE document_id = {self.placeholder} "
+                                        f"AND page_number < {self.placeholder}", (document_id, first_location))[0]
+                # The location is the second column of every row
+                rows = [row for row in rows if row[1] is not None and row[1] >= first_location]
+            keyed_rows = [row + (document, document_id, index) for index, row in enumerate(rows, start)]
+            self._insert_rows(table, columns + ("document",) + self.row_key, keyed_rows, file_type, key=self.row_key)
+            self._execute_query(f"DELETE FROM {table} WHERE document_id = {self.placeholder} "
+                                f"AND item_index >= {self.placeholder}", (document_id, start + len(rows)))
+
+    @instrumented()
+    def store_text(self, text_data, file_type, document=None):
         """
         Stores extracted text data into a MySQL database.
+        Page and slide records are flattened so that every line of their content is stored as its own row.
         Args:
             text_data (list of dicts): The text data to store, each item contains page number and text content.
             file_type (str): The type of file from which the text is extracted.
+            document (str, optional): The path of the source document, stored with every row.
         """
-        query = """
-        CREATE TABLE IF NOT EXISTS text_data (
-            id INT AUTO_INCREMENT PRIMARY KEY,
-            file_type VARCHAR(255),
-            page_number INT,
-            text TEXT
-        );
-        """
-        self._execute_query(query)
+        columns, rows = self._with_document(*self._get_text_rows(text_data, file_type), document)
+        self._insert_rows("text_data", columns, rows, file_type)
 
-        insert_query = "INSERT INTO text_data (file_type, page_number, text) VALUES (%s, %s, %s)"
-        for item in text_data:
-            self._execute_query(insert_query, (file_type, item.get('page_number'), item.get('text')))
-        print(f"Text data inserted into the database for {file_type}.")
-    
-    def store_links(self, links_data, file_type):
+    @instrumented()
+    def store_links(self, links_data, file_type, document=None):
         """
         Stores extracted hyperlink data into the MySQL database.
-        This includes creating a table for links if it does not already exist and inserting the hyperlink data.
 
         Args:
             links_data (list of dicts): The hyperlink data to store, each item contains page number, linked text, and the hyperlink.
             file_type (str): The type of file from which the links are extracted.
+            document (str, optional): The path of the source document, stored with every row.
 
         Each link is stored with its file type, page number, the text of the link, and the URL.
         """
-        query = """
-        CREATE TABLE IF NOT EXISTS links_data (
-            id INT AUTO_INCREMENT PRIMARY KEY,
-            file_type VARCHAR(255),
-            page_number INT,
-            linked_text TEXT,
-            link TEXT
-        );
-        """
-        self._execute_query(query)
+        columns, rows = self._with_document(*self._get_links_rows(links_data, file_type), document)
+        self._insert_rows("links_data", columns, rows, file_type)
 
-        insert_query = "INSERT INTO links_data (file_type, page_number, linked_text, link) VALUES (%s, %s, %s, %s)"
-        for item in links_data:
-            self._execute_query(insert_query, (file_type, item.get('page_number'), item.get('linked_text'), item.get('link')))
-        print(f"Links data inserted into the database for {file_type}.")
-
-    def store_images(self, images_data, file_type):
+    @instrumented()
+    def store_images(self, images_data, file_type, document=None):
         """
         Stores extracted image metadata into the MySQL database.
-        This involves creating a table for images if it does not exist and inserting metadata about each image.
 
         Args:
             images_data (list of dicts): The image data to store, each item contains page number, image filename, and image format.
             file_type (str): The type of file from which the images are extracted.
+            document (str, optional): The path of the source document, stored with every row.
 
         Each image's metadata includes the file type, page number, filename, and format.
         """
-        query = """
-        CREATE TABLE IF NOT EXISTS images_data (
-            id INT AUTO_INCREMENT PRIMARY KEY,
-            file_type VARCHAR(255),
-            page_number INT,
-            image_filename VARCHAR(255),
-            image_format VARCHAR(50)
-        );
-        """
-        self._execute_query(query)
-
-        insert_query = "INSERT INTO images_data (file_type, page_number, image_filename, image_format) VALUES (%s, %s, %s, %s)"
-        for item in images_data:
-            self._execute_query(insert_query, (file_type, item.get('page_number'), item.get('image_filename'), item.get('image_format')))
-        print(f"Image data inserted into the database for {file_type}.")
+        columns, rows = self._with_document(*self._get_images_rows(images_data, file_type), document)
+        self._insert_rows("images_data", columns, rows, file_type)
 
-    def store_tables(self, tables_data, file_type):
+    @instrumented()
+    def store_tables(self, tables_data, file_type, document=None):
         """
         Stores extracted tables metadata into the MySQL database.
-        This includes creating a table for storing tables data if it does not already exist and inserting the table data.
 
         Args:
             tables_data (list of dicts): The table data to store, each item contains page number and the filename of the CSV representing the table.
             file_type (str): The type of file from which the tables are extracted.
+            document (str, optional): The path of the source document, stored with every row.
 
         Each table's metadata is stored with its file type, page number, and the CSV filename that stores the table's actual data.
         """
-        query = """
-        CREATE TABLE IF NOT EXISTS tables_data (
-            id INT AUTO_INCREMENT PRIMARY KEY,
-            file_type VARCHAR(255),
-            page_number INT,
-            csv_filename VARCHAR(255)
-        );
+        columns, rows = self._with_document(*self._get_tables_rows(tables_data, file_type), document)
+        self._insert_rows("tables_data", columns, rows, file_type)
+
+    def _get_text_rows(self, text_data, file_type):
+        """
+        Returns the columns and rows of text data. Page and slide records are flattened so that every line of their
+        content is its own row.
         """
-        self._execute_query(query)
+        rows = []
+        for item in text_data:
+            if 'content' in item:  # PDF pages and PPTX slides hold a list of lines
+                rows.extend((file_type, self._get_location(item), line.get('text')) for line in item['content'])
+            else:
+                rows.append((file_type, self._get_location(item), item.get('text')))
+        return ("file_type", "page_number", "text"), rows
 
-        insert_query = "INSERT INTO tables_data (file_type, page_number, csv_filename) VALUES (%s, %s, %s)"
-        for item in tables_data:
-            self._execute_query(insert_query, (file_type, item.get('page_number'), item.get('csv_filename')))
-        print(f"Table data inserted into the database for {file_type}.")
+    def _get_links_rows(self, links_data, file_type):
+        """
+        Returns the columns and rows of hyperlink data.
+        """
+        rows = [(file_type, self._get_location(item), item.get('linked_text'), item.get('link')) for item in links_data]
+        return ("file_type", "page_number", "linked_text", "link"), rows
+
+    def _get_images_rows(self, images_data, file_type):
+        """
+        Returns the columns and rows of image metadata.
+        """
+        rows = [(file_type, self._get_location(item), item.get('image_filename'), item.get('image_format')) for item in images_data]
+        return ("file_type", "page_number", "image_filename", "image_format"), rows
+
+    def _get_tables_rows(self, tables_data, file_type):
+        """
+        Returns the columns and rows of table metadata.
+        """
+        rows = [(file_type, self._get_location(item), item.get('csv_filename')) for item in tables_data]
+        return ("file_type", "page_number", "csv_filename"), rows
@@ -0,0 +1,100 @@
+import os
+import logging
+import sqlite3
+from .sql_storage import SQLStorage
+from instrumentation import instrumented
+from errors import StorageError
+
+logger = logging.getLogger(__name__)
+
+class SQLiteStorage(SQLStorage):
+    """
+    Concrete class for storing extracted data into a local SQLite database file.
+    It implements the same Storage interface and table layout as SQLStorage, so extraction runs, tests,
+    and benchmarks can store their results on a single machine without a MySQL server.
+
+    Each thread of each process opens its own connection to the database file. The database runs in WAL mode
+    with a busy timeout, so several worker processes can write to the same file.
+    """
+
+    placeholder = "?"  # Parameter marker of the sqlite3 driver
+    database_error = sqlite3.Error  # Exception raised by the sqlite3 driver
+    primary_key = "INTEGER PRIMARY KEY AUTOINCREMENT"  # SQLite only generates ids for INTEGER primary keys
+    document_index = "document"  # SQLite indexes whole values
+    upsert_clause = "ON CONFLICT ({key}) DO UPDATE SET {updates}"
+    upsert_update = "{column} = excluded.{column}"
+
+    def __init__(self, database_path, chunk_size=1000, timeout=30.0):
+        """
+        Initialize the SQLiteStorage with the path of its database file.
+        Args:
+            database_path (str): The path of the SQLite database file; created if it does not exist.
+            chunk_size (int): The maximum number of rows sent in a single bulk insert.
+            timeout (float): Seconds to wait for another process to release a lock on the database.
+        """
+        self.database_path = database_path
+        self.timeout = timeout
+        self._initialize(chunk_size)
+
+    @instrumented()
+    def _connect(self):
+        """
+        Opens a connection to the SQLite database file for the current thread.
+
+        Raises:
+            StorageError: If the database file cannot be opened.
+        """
+        try:
+            directory = os.path.dirname(self.database_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            connection = sqlite3.connect(self.database_path, timeout=self.timeout)
+            connection.execute("PRAGMA journal_mode=WAL")  # Readers and the writer do not block each other
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute("PRAGMA foreign_keys=ON")  # Deleting a document deletes its rows
+            self._get_local().connection = connection
+        except sqlite3.Error as e:
+            logger.error("Error connecting to SQLite: %s", e)
+            raise StorageError(f"Error connecting to SQLite: {e}") from e
+
+    def _get_columns(self, table):
+        """
+        Returns the names of the columns of a table.
+        """
+        return {row[1] for row in self._fetch_all(f"PRAGMA table_info({table})")}
+
+    def _get_indexes(self, table):
+        """
+        Returns the names of the indexes of a table.
+        """
+        return {row[1] for row in self._fetch_all(f"PRAGMA index_list({table})")}
+
+    def _has_foreign_key(self, table, column):
+        """
+        Returns whether a column of a table has a foreign key constraint.
+        """
+        return any(row[3] == column for row in self._fetch_all(f"PRAGMA foreign_key_list({table})"))
+
+    def _add_foreign_key(self, table, constraint):
+        """
+        SQLite cannot add a constraint to an existing table, so a table created by an earlier version keeps its
+        rows without the foreign key: deleting a document does not delete them. Its rows are still keyed by the
+        unique index, so storing a document again does not duplicate them.
+        """
+        logger.warning("%s was created by an earlier version; SQLite cannot add its foreign key to the documents "
+                       "table, so deleting a document does not delete its rows", table)
+
+    def _ensure_connected(self):
+        """
+        SQLite connections are local files and do not drop; the connection of the thread is opened on first use.
+        """
+
+    def is_connected(self):
+        """
+        Returns whether the current thread has a usable database connection.
+        """
+        try:
+            self.connection.execute("SELECT 1")
+            return True
+        except sqlite3.Error:
+            return False
@@ -56,3 +56,21 @@ class Storage(ABC):
         Implementations should define how tables are stored, such as in CSV files, databases, or other structured formats.
         """
         pass
+
+    def store_document(self, extracted, file_type, document=None, content_hash=None):
+        """
+        Stores all the data extracted from one document.
+
+        Args:
+            extracted (dict): The extracted data keyed by content type ('text', 'links', 'images', 'tables').
+            file_type (str): The type of file from which the data is extracted.
+            document (str, optional): The path of the source document, for implementations that record it.
+            content_hash (str, optional): The SHA-256 of the document content, if the caller already computed
+                                          it, for implementations that record it.
+
+        Implementations that support transactions should override this to store the whole document atomically.
+        """
+        self.store_text(extracted.get('text', []), file_type)
+        self.store_links(extracted.get('links', []), file_type)
+        self.store_images(extracted.get('images', []), file_type)
+        self.store_tables(extracted.get('tables', []), file_type)
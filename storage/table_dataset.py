@@ -0,0 +1,153 @@
+import os
+
+try:
+    import pyarrow  # Optional dependency for the columnar table dataset
+    import pyarrow.ipc
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+# File formats of the table dataset.
+DATASET_FORMATS = ("parquet", "arrow")
+
+class TableDataset:
+    """
+    Columnar dataset of the tables of many documents, written as one Parquet file (or Arrow IPC file).
+    Every table cell is one row of the dataset, so the tables of a whole batch can be scanned with a single read
+    instead of opening one CSV file per table. Cells are buffered and written in row groups of `row_group_size`
+    rows, which keeps memory use bounded however many documents are appended.
+
+    Columns:
+        document (string): The path of the source document.
+        file_type (string): 'pdf', 'docx', or 'pptx'.
+        page_number (int32): The 1-based page of a PDF table; null for other file types.
+        slide_number (int32): The 1-based slide of a PPTX table; null for other file types.
+        table_index (int32): The 1-based index of the table on its page or slide, or in its DOCX document.
+        row (int32): The 0-based row of the cell in its table.
+        column (int32): The 0-based column of the cell in its row.
+        value (string): The text of the cell; null for the empty cells pdfplumber reports as None.
+
+    Attributes:
+        path (str): The path of the dataset file.
+        format (str): 'parquet' or 'arrow'.
+        row_group_size (int): The number of cells written at a time.
+        compression (str): The Parquet compression codec.
+    """
+
+    columns = ("document", "file_type", "page_number", "slide_number", "table_index", "row", "column", "value")
+
+    def __init__(self, path, format="parquet", row_group_size=64 * 1024, compression="zstd"):
+        """
+        Initializes the dataset. The file is created when the first row group is written.
+
+        Args:
+            path (str): The path of the dataset file.
+            format (str): 'parquet' or 'arrow'.
+            row_group_size (int): The number of cells buffered before a row group is written.
+            compression (str): The Parquet compression codec.
+        """
+        if pyarrow is None:
+            raise ImportError("The table dataset requires 'pyarrow'; install it with 'pip install pyarrow'")
+        if format not in DATASET_FORMATS:
+            raise ValueError(f"Unknown dataset format '{format}', expected one of {', '.join(DATASET_FORMATS)}")
+        self.path = path
+        self.format = format
+        self.row_group_size = row_group_size
+        self.compression = compression
+        self.schema = pyarrow.schema([
+            ("document", pyarrow.string()),
+            ("file_type", pyarrow.string()),
+            ("page_number", pyarrow.int32()),
+            ("slide_number", pyarrow.int32()),
+            ("table_index", pyarrow.int32()),
+            ("row", pyarrow.int32()),
+            ("column", pyarrow.int32()),
+            ("value", pyarrow.string())
+        ])
+        self._writer = None
+        self._closed = False
+        self._buffer = {column: [] for column in self.columns}
+        self.rows_written = 0
+
+    def __getstate__(self):
+        # The open file stays with the process that writes it; a copy sent to a batch worker only keeps the settings.
+        state = dict(self.__dict__, _writer=None)
+        state["_buffer"] = {column: [] for column in self.columns}
+        return state
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def add_tables(self, document, file_type, tables):
+        """
+        Appends the cells of the tables of one document.
+        Args:
+            document (str): The path of the source document.
+            file_type (str): 'pdf', 'docx', or 'pptx'.
+            tables (list): The table records of the document, extracted with the 'rows' table format.
+                           Tables without rows (saved as CSV files) are skipped.
+        """
+        slide_tables = {}  # PPTX records have no table index, so tables are numbered on each slide
+        for table in tables:
+            rows = table.get("rows")
+            if rows is None:
+                continue
+            page_number, slide_number = table.get("page_number"), table.get("slide_number")
+            table_index = table.get("table_index")
+            if table_index is None:
+                table_index = slide_tables[slide_number] = slide_tables.get(slide_number, 0) + 1
+            for row_index, row in enumerate(rows):
+                for column_index, value in enumerate(row):
+                    self._append(document, file_type, page_number, slide_number, table_index, row_index, column_index, value)
+
+    def _append(self, *cell):
+        """
+        Buffers one cell and writes a row group once the buffer is full.
+        """
+        for column, value in zip(self.columns, cell):
+            self._buffer[column].append(value)
+        if len(self._buffer["value"]) >= self.row_group_size:
+            self._write_row_group()
+
+    def _open(self):
+        """
+        Creates the dataset file and its writer.
+        """
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        if self.format == "parquet":
+            self._writer = pyarrow.parquet.ParquetWriter(self.path, self.schema, compression=self.compression)
+        else:
+            self._writer = pyarrow.ipc.new_file(self.path, self.schema)
+
+    def _write_row_group(self):
+        """
+        Writes the buffered cells as one row group, creating the file first if needed.
+        """
+        count = len(self._buffer["value"])
+        if count == 0:
+            return
+        batch = pyarrow.RecordBatch.from_pydict(self._buffer, schema=self.schema)
+        if self._writer is None:
+            self._open()
+        if self.format == "parquet":
+            self._writer.write_batch(batch, row_group_size=count)
+        else:
+            self._writer.write_batch(batch)
+        self.rows_written += count
+        self._buffer = {column: [] for column in self.columns}
+
+    def close(self):
+        """
+        Writes the remaining cells and completes the file. A dataset without any cell still gets an empty file,
+        so readers always find one.
+        """
+        if self._closed:
+            return
+        self._write_row_group()
+        if self._writer is None:
+            self._open()
+        self._writer.close()
+        self._closed = True
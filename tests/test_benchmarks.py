@@ -0,0 +1,43 @@
+import pytest
+from benchmarks.run_benchmarks import StageTimer, compare_reports, run_case
+from benchmarks.synthetic import generate_corpus
+from data_extractor import DataExtractor
+from loaders.ppt_loader import PPTLoader
+
+@pytest.fixture(scope="module")
+def synthetic_corpus(tmp_path_factory):
+    return generate_corpus(str(tmp_path_factory.mktemp("synthetic")), 3)
+
+@pytest.mark.parametrize("file_type", ["pdf", "docx", "pptx"])
+def test_synthetic_documents_have_every_content_type(synthetic_corpus, file_type):
+    result = run_case(f"{file_type}/synthetic_3", file_type, synthetic_corpus[file_type], store=True)
+    assert result["pages"] == (None if file_type == "docx" else 3)
+    assert result["records"] > 0
+    assert result["peak_rss_kb"] > 0
+    assert result["stages"]["DataExtractor.extract_all"]["calls"] == 1
+    assert result["stages"]["SQLStorage.store_document"]["calls"] == 1
+    assert result["stages"]["FileLoader.load_file"]["calls"] >= 1
+
+def test_stage_timer_counts_generators_and_restores_methods(synthetic_corpus, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # The extractor writes its CSV files relative to the working directory
+    original = DataExtractor.iter_tables
+    timer = StageTimer()
+    timer.instrument(DataExtractor, lambda method: method.startswith("iter_"))
+    try:
+        loader = PPTLoader()
+        loader.filepath = synthetic_corpus["pptx"]
+        tables = list(DataExtractor(loader).iter_tables())
+    finally:
+        timer.restore()
+    assert len(tables) == 3
+    assert timer.stages["DataExtractor.iter_tables"]["calls"] == 1
+    assert timer.stages["DataExtractor.iter_tables"]["seconds"] > 0
+    assert DataExtractor.iter_tables is original
+
+def test_compare_reports_flags_slower_cases():
+    baseline = {"cases": [{"name": "pdf/large", "seconds": 1.0}, {"name": "pdf/small", "seconds": 0.01}]}
+    current = {"cases": [{"name": "pdf/large", "seconds": 1.5}, {"name": "pdf/small", "seconds": 0.05},
+                         {"name": "pdf/new", "seconds": 9.0}]}
+    regressions = compare_reports(baseline, current, tolerance=0.2)
+    assert len(regressions) == 1 and regressions[0].startswith("pdf/large")
+    assert compare_reports(baseline, current, tolerance=0.6) == []
@@ -0,0 +1,413 @@
+import os
+import pytest
+from loaders.docx_loader import DOCXLoader
+from loaders.pdf_loader import PDFLoader
+from loaders.ppt_loader import PPTLoader
+from data_extractor import DataExtractor
+
+TEST_FILES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "test_files")
+
+LOADERS = {
+    "pdf": PDFLoader,
+    "docx": DOCXLoader,
+    "pptx": PPTLoader
+}
+
+def make_extractor(file_type, name="small"):
+    loader = LOADERS[file_type]()
+    loader.filepath = os.path.join(TEST_FILES, file_type, f"{name}.{file_type}")
+    return DataExtractor(loader)
+
+@pytest.fixture(autouse=True)
+def isolated_output(tmp_path, monkeypatch):
+    # The extractors write images and tables relative to the working directory.
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+@pytest.mark.parametrize("file_type", ["pdf", "docx", "pptx"])
+@pytest.mark.parametrize("name", ["small", "large", "multilingual", "annotate", "empty"])
+def test_extract_all_matches_separate_calls(file_type, name):
+    extractor = make_extractor(file_type, name)
+    separate = {
+        "text": extractor.extract_text(),
+        "links": extractor.extract_links(),
+        "images": extractor.extract_images(),
+        "tables": extractor.extract_tables()
+    }
+    assert extractor.extract_all() == separate
+
+@pytest.mark.parametrize("file_type", ["pdf", "docx", "pptx"])
+def test_extract_all_loads_file_once(file_type, mocker):
+    extractor = make_extractor(file_type, "large")
+    load_file = mocker.spy(extractor.loader, "load_file")
+    extractor.extract_all()
+    assert load_file.call_count == 1
+
+@pytest.mark.parametrize("name", ["large", "multilingual", "annotate"])
+def test_parallel_pdf_pages_match_serial(name):
+    serial = make_extractor("pdf", name)
+    parallel = make_extractor("pdf", name)
+    parallel.page_workers = 2
+    parallel.pages_per_chunk = 1
+    assert parallel.extract_text() == serial.extract_text()
+    assert parallel.extract_tables() == serial.extract_tables()
+    assert parallel.extract_all() == serial.extract_all()
+
+def test_page_ranges_cover_every_page_in_order():
+    extractor = make_extractor("pdf")
+    extractor.page_workers = 4
+    extractor.pages_per_chunk = 3
+    assert extractor._get_page_ranges(7) == [(0, 3), (3, 6), (6, 7)]
+    extractor.page_workers = None
+    assert extractor._get_page_ranges(7) == [(0, 7)]
+
+@pytest.mark.parametrize("file_type", ["pdf", "docx", "pptx"])
+@pytest.mark.parametrize("content", ["text", "links", "images", "tables"])
+def test_iterators_match_extract_methods(file_type, content):
+    extractor = make_extractor(file_type, "large")
+    records = getattr(extractor, f"iter_{content}")()
+    assert not isinstance(records, list)
+    assert list(records) == getattr(extractor, f"extract_{content}")()
+
+@pytest.mark.parametrize("file_type", ["pdf", "docx", "pptx"])
+def test_extract_all_uses_cache_without_opening_document(file_type, tmp_path, mocker):
+    from storage.extraction_cache import ExtractionCache
+    cache = ExtractionCache(str(tmp_path / "cache"))
+    first = make_extractor(file_type, "large")
+    first.cache = cache
+    expected = first.extract_all()
+
+    second = make_extractor(file_type, "large")
+    second.cache = cache
+    load_file = mocker.spy(second.loader, "load_file")
+    fitz_open = mocker.patch("data_extractor.fitz.open")
+    assert second.extract_all() == expected
+    assert load_file.call_count == 0
+    assert fitz_open.call_count == 0
+
+def test_cache_hit_replaces_every_stored_row(tmp_path):
+    from storage.extraction_cache import ExtractionCache
+    cache = ExtractionCache(str(tmp_path / "cache"))
+    for _ in range(2):  # The second run is a cache hit
+        extractor = make_extractor("pdf", "small")
+        extractor.cache = cache
+        extractor.manifest_folder = str(tmp_path / "manifests")
+        extractor.extract_all()
+    assert extractor.changed_pages is None  # The rows may be missing from the database being stored to
+
+@pytest.mark.parametrize("file_type", ["pdf", "docx", "pptx"])
+def test_cache_hit_returns_compact_records(file_type, tmp_path):
+    from storage.extraction_cache import ExtractionCache
+    cache = ExtractionCache(str(tmp_path / "cache"))
+    results = []
+    for _ in range(2):  # The second run is a cache hit
+        extractor = make_extractor(file_type, "small")
+        extractor.cache = cache
+        extractor.compact_records = True
+        results.append(extractor.extract_all())
+    miss, hit = results
+    assert [type(item) for item in hit["text"]] == [type(item) for item in miss["text"]]
+    assert [type(line) for item in hit["text"] for line in item.get("content", [])] == \
+        [type(line) for item in miss["text"] for line in item.get("content", [])]
+    assert hit["text"] == miss["text"]
+
+@pytest.fixture
+def repeated_logo_pdf(tmp_path):
+    import fitz
+    logo = fitz.Pixmap(fitz.csRGB, fitz.IRect(0, 0, 16, 16), False)
+    logo.set_rect(logo.irect, (200, 30, 30))
+    doc = fitz.open()
+    for _ in range(3):
+        page = doc.new_page()
+        page.insert_image(fitz.Rect(10, 10, 60, 60), stream=logo.tobytes("png"))
+    path = tmp_path / "logo.pdf"
+    doc.save(str(path))
+    return str(path)
+
+def make_pdf_extractor(path, **options):
+    loader = PDFLoader()
+    loader.filepath = path
+    return DataExtractor(loader, **options)
+
+def test_repeated_pdf_xref_is_extracted_once(repeated_logo_pdf, mocker):
+    import fitz
+    extract_image = mocker.spy(fitz.Document, "extract_image")
+    images = make_pdf_extractor(repeated_logo_pdf).extract_images()
+    assert extract_image.call_count == 1
+    assert [image["image_filename"] for image in images] == [f"pdf_image_{page}_1.png" for page in (1, 2, 3)]
+    assert all(os.path.isfile(image["image_path"]) for image in images)
+
+def test_image_store_writes_each_image_once(repeated_logo_pdf, tmp_path):
+    store = tmp_path / "image_store"
+    images = make_pdf_extractor(repeated_logo_pdf, image_store=str(store)).extract_images()
+    assert len(images) == 3
+    assert len({image["image_path"] for image in images}) == 1
+    assert images[0]["image_filename"] == f"{images[0]['image_hash']}.png"
+    assert len([name for _, _, names in os.walk(store) for name in names]) == 1
+
+def test_image_store_is_shared_across_documents(tmp_path):
+    store = str(tmp_path / "image_store")
+    first = make_extractor("pptx", "large")
+    first.image_store = store
+    second = make_extractor("pptx", "multilingual")
+    second.image_store = store
+    images = first.extract_images() + second.extract_images()
+    stored_files = [name for _, _, names in os.walk(store) for name in names]
+    assert sorted(stored_files) == sorted({image["image_filename"] for image in images})
+    assert all(os.path.isfile(image["image_path"]) for image in images)
+
+@pytest.mark.parametrize("file_type", ["pdf", "docx", "pptx"])
+def test_metadata_image_mode_writes_no_files(file_type, isolated_output, mocker):
+    import fitz
+    extract_image = mocker.spy(fitz.Document, "extract_image")
+    extractor = make_extractor(file_type, "large")
+    extractor.image_mode = "metadata"
+    records = extractor.extract_images()
+    assert records
+    assert all(record["width"] > 0 and record["height"] > 0 for record in records)
+    assert not [name for _, _, names in os.walk(isolated_output / "output") for name in names]
+    assert extract_image.call_count == 0
+
+@pytest.mark.parametrize("file_type", ["pdf", "docx", "pptx"])
+def test_materialized_images_match_extract_mode(file_type, tmp_path):
+    expected = make_extractor(file_type, "large").extract_images()
+    expected_bytes = [open(image["image_path"], "rb").read() for image in expected]
+
+    extractor = make_extractor(file_type, "large")
+    extractor.image_mode = "metadata"
+    extractor.output_folder = str(tmp_path / "lazy")
+    records = extractor.extract_images()
+    materialized = extractor.materialize_images(records)
+    for image, expected_image, content in zip(materialized, expected, expected_bytes):
+        assert {key: value for key, value in image.items() if key != "image_path"} == \
+            {key: value for key, value in expected_image.items() if key != "image_path"}
+        assert open(image["image_path"], "rb").read() == content
+    assert len(materialized) == len(expected)
+    assert extractor.materialize_image(records[0]) == materialized[0]
+
+@pytest.mark.parametrize("file_type", ["pdf", "docx", "pptx"])
+def test_background_writer_matches_synchronous_writes(file_type, tmp_path):
+    from storage.artifact_writer import ArtifactWriter
+    expected = make_extractor(file_type, "large")
+    expected.output_folder = str(tmp_path / "sync")
+    expected_data = expected.extract_all()
+
+    with ArtifactWriter(max_workers=2, max_pending=4) as writer:
+        extractor = make_extractor(file_type, "large")
+        extractor.output_folder = str(tmp_path / "async")
+        extractor.writer = writer
+        extracted = extractor.extract_all()
+    for content in ("images", "tables"):
+        paths = [item.get("image_path", item.get("csv_path")) for item in extracted[content]]
+        expected_paths = [item.get("image_path", item.get("csv_path")) for item in expected_data[content]]
+        assert [os.path.relpath(path, tmp_path / "async") for path in paths] == \
+            [os.path.relpath(path, tmp_path / "sync") for path in expected_paths]
+        assert [open(path, "rb").read() for path in paths] == [open(path, "rb").read() for path in expected_paths]
+
+def extract_incremental(loader_class, path, manifest_folder):
+    loader = loader_class()
+    loader.filepath = path
+    extractor = DataExtractor(loader, manifest_folder=manifest_folder)
+    return extractor, extractor.extract_all()
+
+def test_incremental_pdf_re_extracts_changed_pages_only(tmp_path, mocker):
+    import fitz
+    from benchmarks.synthetic import generate_pdf
+    path = str(tmp_path / "report.pdf")
+    generate_pdf(path, 5)
+    manifest_folder = str(tmp_path / "manifests")
+    extractor, _ = extract_incremental(PDFLoader, path, manifest_folder)
+    assert extractor.changed_pages == [1, 2, 3, 4, 5]
+
+    doc = fitz.open(path)
+    doc[1].insert_text((72, 500), "Late addition", fontsize=10)
+    doc.delete_page(4)
+    doc.save(str(tmp_path / "edited.pdf"), garbage=4)  # Rewrites and renumbers every object
+    doc.close()
+    os.replace(tmp_path / "edited.pdf", path)
+
+    extract_text = mocker.spy(DataExtractor, "_extract_pdf_page_text")
+    extractor, extracted = extract_incremental(PDFLoader, path, manifest_folder)
+    assert extractor.changed_pages == [2, 5]
+    assert extract_text.call_count == 1
+    assert extracted == make_pdf_extractor(path).extract_all()
+
+def test_incremental_pptx_splices_slides_and_links(tmp_path):
+    from pptx import Presentation
+    from benchmarks.synthetic import generate_pptx
+    path = str(tmp_path / "deck.pptx")
+    generate_pptx(path, 4)
+    presentation = Presentation(path)
+    # Slide 3 repeats the link of slide 1, so it is only reported once the link leaves slide 1
+    for slide_num in (0, 2):
+        presentation.slides[slide_num].shapes[1].text_frame.paragraphs[-1].runs[0].hyperlink.address = "https://example.com/shared"
+    presentation.save(path)
+    manifest_folder = str(tmp_path / "manifests")
+    extractor, extracted = extract_incremental(PPTLoader, path, manifest_folder)
+    assert [link["slide_number"] for link in extracted["links"]] == [1, 2, 4]
+
+    presentation = Presentation(path)
+    presentation.slides[0].shapes[1].text_frame.paragraphs[-1].runs[0].hyperlink.address = "https://example.com/moved"
+    presentation.save(path)
+
+    extractor, extracted = extract_incremental(PPTLoader, path, manifest_folder)
+    assert extractor.changed_pages == [1]
+    loader = PPTLoader()
+    loader.filepath = path
+    assert extracted == DataExtractor(loader).extract_all()
+    assert [link["slide_number"] for link in extracted["links"]] == [1, 2, 3, 4]
+
+def test_pdf_links_include_internal_targets_and_anchor_text(tmp_path):
+    import fitz
+    doc = fitz.open()
+    doc.new_page()
+    doc.new_page()
+    first, second = doc[0], doc[1]
+    first.insert_text((72, 100), "Visit example site", fontsize=12)
+    first.insert_link({"kind": fitz.LINK_URI, "from": fitz.Rect(70, 88, 190, 104), "uri": "https://example.com"})
+    first.insert_text((72, 200), "Jump to appendix", fontsize=12)
+    first.insert_link({"kind": fitz.LINK_GOTO, "from": fitz.Rect(70, 188, 180, 204), "page": 1, "to": fitz.Point(0, 0)})
+    first.add_text_annot((300, 300), "A sticky note without an action")
+    first.add_highlight_annot(fitz.Rect(70, 88, 190, 104))
+    second.insert_text((72, 100), "Appendix", fontsize=12)
+    path = str(tmp_path / "links.pdf")
+    doc.save(path)
+
+    links = make_pdf_extractor(path).extract_links()
+    assert [(link["link"], link["linked_text"], link["link_type"]) for link in links] == [
+        ("https://example.com", "Visit example site", "uri"),
+        ("#page=2", "Jump to appendix", "goto")
+    ]
+    assert links[1]["target_page"] == 2
+    assert links[0]["rect"] == [70.0, 88.0, 190.0, 104.0]
+
+@pytest.mark.parametrize("name", ["small", "large", "multilingual", "annotate"])
+def test_table_prefilter_loses_no_tables(name, tmp_path):
+    results = {}
+    for table_prefilter in (True, False):
+        extractor = make_pdf_extractor(os.path.join(TEST_FILES, "pdf", f"{name}.pdf"),
+                                       output_folder=str(tmp_path / str(table_prefilter)), table_prefilter=table_prefilter)
+        tables = extractor.extract_tables()
+        results[table_prefilter] = [(table["csv_filename"], open(table["csv_path"], encoding="utf-8").read()) for table in tables]
+    assert results[True] == results[False]
+
+def test_table_prefilter_skips_pages_without_ruling_lines(tmp_path, mocker):
+    from benchmarks.synthetic import generate_pdf
+    import fitz
+    path = str(tmp_path / "report.pdf")
+    generate_pdf(path, 3)
+    doc = fitz.open(path)
+    doc.insert_page(1, text="A page of prose without any table.")  # Becomes page 2
+    path = str(tmp_path / "mixed.pdf")
+    doc.save(path)
+
+    extract_page_tables = mocker.spy(DataExtractor, "_extract_pdf_page_tables")
+    extractor = make_pdf_extractor(path)
+    extracted = extractor.extract_all()
+    assert extractor.table_pages_skipped == 1
+    assert [call.args[2] for call in extract_page_tables.call_args_list] == [0, 2, 3]
+    assert [table["page_number"] for table in extracted["tables"]] == [1, 3, 4]
+    assert extracted == make_pdf_extractor(path, table_prefilter=False).extract_all()
+
+@pytest.mark.parametrize("file_type", ["docx", "pptx"])
+@pytest.mark.parametrize("name", ["small", "large", "multilingual", "annotate", "empty"])
+@pytest.mark.parametrize("image_mode", ["extract", "metadata"])
+def test_streaming_matches_python_docx_and_pptx(file_type, name, image_mode, tmp_path, mocker):
+    expected = make_extractor(file_type, name)
+    expected.image_mode = image_mode
+    expected.output_folder = str(tmp_path / "loaded")
+    expected_data = expected.extract_all()
+
+    extractor = make_extractor(file_type, name)
+    extractor.image_mode = image_mode
+    extractor.output_folder = str(tmp_path / "streamed")
+    extractor.streaming = True
+    load_file = mocker.spy(extractor.loader, "load_file")
+    extracted = extractor.extract_all()
+    assert load_file.call_count == 0
+    assert extracted.keys() == expected_data.keys()
+    for content, records in extracted.items():
+        for record, expected_record in zip(records, expected_data[content]):
+            for key in ("image_path", "csv_path"):
+                if key in record:
+                    assert open(record.pop(key), "rb").read() == open(expected_record.pop(key), "rb").read()
+        assert records == expected_data[content]
+
+@pytest.mark.parametrize("file_type", ["docx", "pptx"])
+@pytest.mark.parametrize("content", ["text", "links", "images", "tables"])
+def test_streaming_iterators_match_extract_methods(file_type, content):
+    extractor = make_extractor(file_type, "large")
+    extractor.streaming = True
+    assert list(getattr(extractor, f"iter_{content}")()) == getattr(extractor, f"extract_{content}")()
+
+def test_ooxml_package_releases_consumed_blocks(tmp_path):
+    from benchmarks.synthetic import generate_docx
+    from loaders.ooxml_package import OOXMLPackage, qn
+    path = str(tmp_path / "report.docx")
+    generate_docx(path, 20)
+    with OOXMLPackage(path) as package:
+        blocks = 0
+        for block in package.iter_children(package.main_partname(), "w:body"):
+            blocks += 1
+            assert block.getprevious() is None  # Earlier blocks are detached from the body
+        assert blocks > 20
+        assert package.content_type("/word/document.xml").endswith("document.main+xml")
+        assert qn("w:p") == "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}p"
+
+@pytest.mark.parametrize("file_type", ["pdf", "docx", "pptx"])
+@pytest.mark.parametrize("streaming", [False, True])
+def test_compact_records_match_dict_records(file_type, streaming):
+    from records import Record
+    expected = make_extractor(file_type, "large").extract_text()
+    extractor = make_extractor(file_type, "large")
+    extractor.compact_records = True
+    extractor.streaming = streaming
+    extracted = extractor.extract_all()["text"]
+    assert extracted == expected
+    assert extracted and all(isinstance(record, Record) for record in extracted)
+    assert list(extractor.iter_text()) == expected
+
+def test_page_heading_detection_uses_the_body_font_size(tmp_path):
+    import fitz
+    path = str(tmp_path / "small_type.pdf")
+    doc = fitz.open()
+    page = doc.new_page()
+    page.insert_text((72, 72), "Chapter one", fontsize=12)
+    for i in range(5):
+        page.insert_text((72, 100 + 14 * i), f"Body text set in eight point type, line {i}.", fontsize=8)
+    doc.save(path)
+
+    fixed = make_pdf_extractor(path).extract_text()
+    relative = make_pdf_extractor(path, heading_detection="page").extract_text()
+    assert [line["style"] for line in fixed[0]["content"]] == ["normal"]  # 12 points is below the fixed threshold
+    assert [line["style"] for line in relative[0]["content"]] == ["Heading", "normal"]
+    assert relative[0]["content"][0]["text"] == "Chapter one"
+    assert " ".join(line["text"] for line in relative[0]["content"]) == fixed[0]["content"][0]["text"]
+
+@pytest.mark.parametrize("file_type", ["pdf", "docx", "pptx"])
+def test_open_handle_is_shared_by_every_extract_call(file_type, mocker):
+    extractor = make_extractor(file_type, "large")
+    expected = extractor.extract_all()
+    load_file = mocker.spy(extractor.loader, "load_file")
+    with extractor.loader.open(extractor.loader.filepath) as handle:
+        assert extractor.loader.open(extractor.loader.filepath) is handle
+        handle.close()  # The nested open only counted one more user
+        extracted = {content: getattr(extractor, f"extract_{content}")() for content in expected}
+        assert not handle.closed
+    assert extracted == expected
+    assert load_file.call_count == 1
+    assert handle.closed
+    assert extractor.loader.open(extractor.loader.filepath) is not handle
+
+def test_pptx_handle_counts_slides_without_loading_them():
+    import pickle
+    from pptx.parts.slide import SlidePart
+    loader = PPTLoader()
+    path = os.path.join(TEST_FILES, "pptx", "large.pptx")
+    with loader.open(path) as handle:
+        assert handle.page_count == 3
+        assert not handle.is_loaded("document")  # Counted from the slide list of the package
+        presentation = handle.document
+        assert type(presentation.slides[1].part) is SlidePart  # python-pptx is used as is
+        assert handle.document is presentation  # Loaded once
+        assert pickle.loads(pickle.dumps(loader))._handles == {}
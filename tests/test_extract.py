@@ -2,8 +2,10 @@ import pytest
 from loaders.docx_loader import DOCXLoader 
 from loaders.pdf_loader import PDFLoader 
 from loaders.ppt_loader import PPTLoader  
+from loaders.preflight import PreflightError
 from mysql.connector import Error
 from storage.sql_storage import SQLStorage
+from errors import StorageError
 from unittest.mock import patch, MagicMock
 
 @pytest.fixture
@@ -20,12 +22,12 @@ def test_validate_large_docx_file(docx_loader):
 
 def test_validate_corrupted_docx_file(docx_loader):
     corrupted_docx_path = "test_files/docx/corrupted.docx"
-    with pytest.raises(SystemExit):
+    with pytest.raises(PreflightError):
         docx_loader.load_file(corrupted_docx_path)
 
 def test_validate_non_docx_file(docx_loader):
     non_docx_path = "test_files/pdf/small.pdf"
-    with pytest.raises(SystemExit):
+    with pytest.raises(PreflightError):
         docx_loader.load_file(non_docx_path)
 
 def test_validate_empty_docx_file(docx_loader):
@@ -38,7 +40,7 @@ def test_validate_docx_with_complex_formatting(docx_loader):
 
 def test_validate_password_protected_docx(docx_loader):
     protected_docx_path = "test_files/docx/password.docx"
-    with pytest.raises(SystemExit):
+    with pytest.raises(PreflightError):
         docx_loader.load_file(protected_docx_path)
 
 def test_validate_docx_with_embedded_links(docx_loader):
@@ -79,12 +81,12 @@ def test_validate_large_pdf_file(pdf_loader):
 
 def test_validate_corrupted_pdf_file(pdf_loader):
     corrupted_pdf_path = "test_files/pdf/corrupted.pdf"
-    with pytest.raises(SystemExit):
+    with pytest.raises(PreflightError):
         pdf_loader.load_file(corrupted_pdf_path)
 
 def test_validate_non_pdf_file(pdf_loader):
     non_pdf_path = "test_files/docx/small.docx"
-    with pytest.raises(SystemExit):
+    with pytest.raises(PreflightError):
         pdf_loader.load_file(non_pdf_path)
 
 def test_validate_empty_pdf_file(pdf_loader):
@@ -93,7 +95,7 @@ def test_validate_empty_pdf_file(pdf_loader):
 
 def test_validate_password_protected_pdf(pdf_loader):
     protected_pdf_path = "test_files/pdf/password.pdf"
-    with pytest.raises(SystemExit):
+    with pytest.raises(PreflightError):
         pdf_loader.load_file(protected_pdf_path)
 
 def test_validate_pdf_with_embedded_links(pdf_loader):
@@ -130,12 +132,12 @@ def test_validate_large_pptx_file(ppt_loader):
 
 def test_validate_corrupted_pptx_file(ppt_loader):
     corrupted_pptx_path = "test_files/pptx/corrupted.pptx"
-    with pytest.raises(SystemExit):
+    with pytest.raises(PreflightError):
         ppt_loader.load_file(corrupted_pptx_path)
 
 def test_validate_non_pptx_file(ppt_loader):
     non_pptx_path = "test_files/pdf/small.pdf"
-    with pytest.raises(SystemExit):
+    with pytest.raises(PreflightError):
         ppt_loader.load_file(non_pptx_path)
 
 def test_validate_empty_pptx_file(ppt_loader):
@@ -148,7 +150,7 @@ def test_validate_pptx_with_complex_animations(ppt_loader):
 
 def test_validate_password_protected_pptx(ppt_loader):
     protected_pptx_path = "test_files/pptx/password.pptx"
-    with pytest.raises(SystemExit):
+    with pytest.raises(PreflightError):
         ppt_loader.load_file(protected_pptx_path)
 
 def test_validate_pptx_with_embedded_links(ppt_loader):
@@ -203,14 +205,14 @@ def invalid_credentials():
 
 def test_validate_successful_database_connection(mocker, valid_credentials):
     # Mock the connect method from mysql.connector to return True for is_connected
-    mocker.patch('mysql.connector.connect', return_value=mocker.Mock(is_connected=lambda: True))
+    mocker.patch('mysql.connector.connect', return_value=mocker.MagicMock(is_connected=lambda: True))
     storage = SQLStorage(**valid_credentials)
     assert storage.connection.is_connected(), "Connected to MySQL database"
 
 def test_validate_failed_database_connection(mocker, invalid_credentials):
     # Mock the connect method to raise a connection error
     mocker.patch('mysql.connector.connect', side_effect=Error("Failed to connect"))
-    with pytest.raises(SystemExit):  # Assuming your code exits on failure
+    with pytest.raises(StorageError):  # The caller decides whether to go on without the database
         SQLStorage(**invalid_credentials)
 
 @pytest.fixture
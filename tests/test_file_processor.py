@@ -0,0 +1,129 @@
+import os
+import json
+import shutil
+import pytest
+from main import FileProcessor
+
+TEST_FILES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "test_files")
+
+@pytest.fixture
+def batch_dir(tmp_path):
+    # Two files with the same name in different folders must not overwrite each other's output.
+    source = tmp_path / "incoming"
+    for folder in ("a", "b"):
+        (source / folder).mkdir(parents=True)
+        for file_type in ("pdf", "docx", "pptx"):
+            shutil.copy(os.path.join(TEST_FILES, file_type, f"small.{file_type}"), source / folder / f"small.{file_type}")
+    (source / "a" / "notes.txt").write_text("not a supported document")
+    return source
+
+@pytest.fixture
+def processor(tmp_path):
+    return FileProcessor(base_output_folder=str(tmp_path / "output"))
+
+def test_collect_files_filters_by_loader(processor, batch_dir):
+    files = processor.collect_files(str(batch_dir))
+    assert len(files) == 6
+    assert not any(path.endswith(".txt") for path in files)
+
+def test_collect_files_accepts_glob(processor, batch_dir):
+    files = processor.collect_files(str(batch_dir / "**" / "*.pdf"))
+    assert [os.path.basename(path) for path in files] == ["small.pdf", "small.pdf"]
+
+def test_run_batch_isolates_output_per_file(processor, batch_dir):
+    results = processor.run_batch(str(batch_dir), workers=2, max_in_flight=2)
+    assert [result["status"] for result in results] == ["done"] * 6
+    output_folders = {result["output_folder"] for result in results}
+    assert len(output_folders) == 6
+    for result in results:
+        file_type = processor.get_file_type(result["file_path"])
+        for content in ("text", "links", "images", "tables"):
+            assert os.path.isfile(os.path.join(result["output_folder"], content, file_type, f"{file_type}_{content}.json"))
+        images = json.load(open(os.path.join(result["output_folder"], "images", file_type, f"{file_type}_images.json")))
+        assert all(image["image_path"].startswith(result["output_folder"]) for image in images)
+
+def test_run_batch_reports_failures_without_stopping(processor, batch_dir):
+    shutil.copy(os.path.join(TEST_FILES, "pptx", "corrupt.pptx"), batch_dir / "b" / "corrupt.pptx")
+    results = processor.run_batch(str(batch_dir), workers=2)
+    statuses = {os.path.basename(result["file_path"]): result["status"] for result in results}
+    assert statuses.pop("corrupt.pptx") == "failed"
+    assert set(statuses.values()) == {"done"}
+
+def test_save_to_jsonl_consumes_records_incrementally(processor, tmp_path):
+    def records():
+        for page_number in range(1, 4):
+            yield {"page_number": page_number, "content": [{"text": "ünïcode", "style": "normal"}]}
+
+    filename = tmp_path / "records.jsonl"
+    assert processor.save_to_jsonl(records(), str(filename)) == 3
+    lines = filename.read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line)["page_number"] for line in lines] == [1, 2, 3]
+    assert "ünïcode" in lines[0]
+
+def test_run_batch_jsonl_output(tmp_path, batch_dir):
+    processor = FileProcessor(base_output_folder=str(tmp_path / "output"), output_format="jsonl")
+    results = processor.run_batch(str(batch_dir / "a"), workers=1)
+    for result in results:
+        file_type = processor.get_file_type(result["file_path"])
+        text_file = os.path.join(result["output_folder"], "text", file_type, f"{file_type}_text.jsonl")
+        with open(text_file, encoding="utf-8") as file:
+            assert all(json.loads(line) for line in file)
+
+def test_run_batch_appends_tables_to_one_dataset(tmp_path, batch_dir):
+    pyarrow = pytest.importorskip("pyarrow")
+    import csv
+    import pyarrow.parquet
+    from storage.table_dataset import TableDataset
+    csv_processor = FileProcessor(base_output_folder=str(tmp_path / "csv"))
+    csv_results = csv_processor.run_batch(str(batch_dir / "a"), workers=2)
+    expected = set()
+    for result in csv_results:
+        file_type = csv_processor.get_file_type(result["file_path"])
+        tables = json.load(open(os.path.join(result["output_folder"], "tables", file_type, f"{file_type}_tables.json")))
+        for table in tables:
+            with open(table["csv_path"], newline="", encoding="utf-8") as file:
+                expected.update((os.path.abspath(result["file_path"]), row_index, column_index, value)
+                                for row_index, row in enumerate(csv.reader(file)) for column_index, value in enumerate(row))
+
+    dataset_path = str(tmp_path / "tables.parquet")
+    with TableDataset(dataset_path) as dataset:
+        processor = FileProcessor(base_output_folder=str(tmp_path / "output"), table_dataset=dataset)
+        results = processor.run_batch(str(batch_dir / "a"), workers=2)
+    assert all("tables" not in result for result in results)
+    assert not any(name.endswith(".csv") for _, _, names in os.walk(tmp_path / "output") for name in names)
+    cells = pyarrow.parquet.read_table(dataset_path).to_pylist()
+    # CSV files store missing cells as empty strings
+    assert {(cell["document"], cell["row"], cell["column"], cell["value"] or "") for cell in cells} == expected
+    for result in results:
+        file_type = processor.get_file_type(result["file_path"])
+        tables = json.load(open(os.path.join(result["output_folder"], "tables", file_type, f"{file_type}_tables.json")))
+        assert tables and all(table["csv_path"] is None and "rows" not in table for table in tables)
+
+@pytest.mark.parametrize("output_format", ["json", "jsonl"])
+def test_compact_records_write_the_same_files(tmp_path, output_format):
+    outputs = {}
+    for compact_records in (False, True):
+        output_folder = tmp_path / f"compact_{compact_records}"
+        processor = FileProcessor(base_output_folder=str(output_folder), output_format=output_format,
+                                  extractor_options={"compact_records": compact_records})
+        loader = processor.loaders["pdf"]
+        loader.filepath = os.path.join(TEST_FILES, "pdf", "large.pdf")
+        processor.process_file(loader, str(output_folder))
+        outputs[compact_records] = open(output_folder / "text" / "pdf" / f"pdf_text.{output_format}", encoding="utf-8").read()
+    assert outputs[True] == outputs[False]
+
+def test_cached_file_is_hashed_once(tmp_path, monkeypatch):
+    from storage.extraction_cache import ExtractionCache
+    from storage.sqlite_storage import SQLiteStorage
+    hashed = []
+    hash_file = ExtractionCache.hash_file
+    monkeypatch.setattr(ExtractionCache, "hash_file", staticmethod(lambda path: hashed.append(path) or hash_file(path)))
+    processor = FileProcessor(base_output_folder=str(tmp_path / "output"),
+                              extractor_options={"cache": ExtractionCache(str(tmp_path / "cache"))})
+    storage = SQLiteStorage(str(tmp_path / "data.sqlite"))
+    loader = processor.loaders["pdf"]
+    loader.filepath = os.path.join(TEST_FILES, "pdf", "small.pdf")
+    processor.process_file(loader, str(tmp_path / "output"), storage)
+    # The hash of the cache key is the one stored in the documents table
+    assert hashed == [loader.filepath]
+    assert storage.connection.execute("SELECT content_hash FROM documents").fetchone() == (hash_file(loader.filepath),)
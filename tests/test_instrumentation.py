@@ -0,0 +1,79 @@
+import os
+import json
+import logging
+import pytest
+import instrumentation
+from loaders.pdf_loader import PDFLoader
+from loaders.ppt_loader import PPTLoader
+from data_extractor import DataExtractor
+from main import FileProcessor
+
+TEST_FILES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "test_files")
+
+@pytest.fixture(autouse=True)
+def isolated_output(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+def make_extractor(loader_class, path):
+    loader = loader_class()
+    loader.filepath = os.path.join(TEST_FILES, path)
+    return DataExtractor(loader)
+
+def test_stages_are_not_recorded_without_collection():
+    extractor = make_extractor(PDFLoader, "pdf/small.pdf")
+    assert instrumentation.get_active() is None
+    extractor.extract_text()
+    with instrumentation.collect() as metrics:
+        pass
+    assert metrics.report()["stages"] == {}
+
+def test_collect_records_stages_and_counters():
+    extractor = make_extractor(PDFLoader, "pdf/large.pdf")
+    with instrumentation.collect(extractor.loader.filepath) as metrics:
+        extracted = extractor.extract_all()
+    report = metrics.report()
+    assert report["document"] == extractor.loader.filepath
+    assert report["stages"]["PDFLoader.load_file"]["calls"] == 1
+    assert report["stages"]["DataExtractor.extract_all"]["calls"] == 1
+    assert report["stages"]["DataExtractor._extract_pdf_page_text"]["calls"] == report["counters"]["pages"]
+    assert report["stages"]["DataExtractor._extract_pdf_page_tables"]["seconds"] > 0
+    files = len(extracted["images"]) + len(extracted["tables"])
+    assert report["counters"]["files_written"] == files
+    written = [item.get("image_path", item.get("csv_path")) for item in extracted["images"] + extracted["tables"]]
+    assert report["counters"]["bytes_written"] == sum(os.path.getsize(path) for path in written)
+    assert instrumentation.get_active() is None
+
+def test_generators_are_timed_as_they_are_consumed():
+    extractor = make_extractor(PPTLoader, "pptx/large.pptx")
+    with instrumentation.collect() as metrics:
+        records = extractor.iter_text()
+        assert "DataExtractor.iter_text" not in metrics.stages
+        list(records)
+    assert metrics.stages["DataExtractor.iter_text"]["calls"] == 1
+
+def test_cprofile_hook_adds_profile_report():
+    extractor = make_extractor(PDFLoader, "pdf/small.pdf")
+    with instrumentation.collect(profile="cprofile") as metrics:
+        extractor.extract_text()
+    assert "extract_text" in metrics.report()["profile"]
+    with pytest.raises(ValueError):
+        with instrumentation.collect(profile="unknown"):
+            pass
+
+def test_loaders_log_leveled_events(caplog):
+    extractor = make_extractor(PDFLoader, "pdf/small.pdf")
+    with caplog.at_level(logging.DEBUG, logger="loaders"):
+        extractor.loader.load_file(extractor.loader.filepath)
+    levels = {record.getMessage(): record.levelname for record in caplog.records}
+    assert levels[f"File validated: {extractor.loader.filepath}"] == "DEBUG"
+    assert levels[f"Loaded PDF file: {extractor.loader.filepath}"] == "INFO"
+
+def test_file_processor_saves_metrics_report(isolated_output):
+    processor = FileProcessor(base_output_folder=str(isolated_output / "output"), metrics=True)
+    loader = PDFLoader()
+    loader.filepath = os.path.join(TEST_FILES, "pdf", "small.pdf")
+    report = processor.process_file(loader, processor.base_output_folder)
+    with open(isolated_output / "output" / "metrics" / "pdf_metrics.json", encoding="utf-8") as file:
+        assert json.load(file) == report
+    assert report["counters"]["files_written"] >= 4  # The four JSON content files, at least
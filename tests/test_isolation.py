@@ -0,0 +1,104 @@
+import os
+import time
+import shutil
+import pytest
+import pdfplumber
+from main import FileProcessor
+from data_extractor import DataExtractor
+from loaders.pdf_loader import PDFLoader
+from storage.quarantine import Quarantine
+from storage.sqlite_storage import SQLiteStorage
+from timeouts import time_limit
+from errors import ExtractionError, FileTimeout, LoadError, PageTimeout, StorageError
+
+TEST_FILES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "test_files")
+
+class SlowProcessor(FileProcessor):
+    """Hangs on every file named 'slow...'."""
+
+    def _process_file(self, loader, base_output_folder, storage=None):
+        if os.path.basename(loader.filepath).startswith("slow"):
+            time.sleep(60)
+        return super()._process_file(loader, base_output_folder, storage)
+
+class CrashingProcessor(FileProcessor):
+    """Kills its worker process on every file named 'crash...'."""
+
+    def process_batch_file(self, file_path, output_folder, storage=None):
+        if os.path.basename(file_path).startswith("crash"):
+            os._exit(1)
+        return super().process_batch_file(file_path, output_folder, storage)
+
+def make_batch(tmp_path, names):
+    source = tmp_path / "incoming"
+    source.mkdir()
+    for name in names:
+        file_type = name.rsplit(".", 1)[1]
+        shutil.copy(os.path.join(TEST_FILES, file_type, f"small.{file_type}"), source / name)
+    return str(source)
+
+def test_nested_time_limits_raise_the_outer_error():
+    with pytest.raises(FileTimeout):
+        with time_limit(0.1, lambda: FileTimeout("a.pdf", "timeout", "File")):
+            with time_limit(5, lambda: PageTimeout("a.pdf", "page_timeout", "Page")):
+                time.sleep(2)
+    with time_limit(None, lambda: FileTimeout("a.pdf", "timeout", "File")):
+        time.sleep(0.01)  # No limit
+
+def test_load_errors_are_raised_for_the_file(mocker):
+    mocker.patch("fitz.open", side_effect=RuntimeError("broken xref"))
+    with pytest.raises(LoadError) as error:
+        PDFLoader().load_file(os.path.join(TEST_FILES, "pdf", "small.pdf"))
+    assert error.value.code == "load_failed"
+    assert isinstance(error.value.__cause__, RuntimeError)
+
+def test_page_timeout_skips_the_page(mocker, tmp_path):
+    mocker.patch.object(pdfplumber.page.Page, "extract_tables", lambda page: time.sleep(60))
+    loader = PDFLoader()
+    loader.filepath = os.path.join(TEST_FILES, "pdf", "small.pdf")
+    extractor = DataExtractor(loader, str(tmp_path), table_prefilter=False, page_timeout=0.1)
+    extracted = extractor.extract_all()
+    assert extracted["tables"] == []
+    assert extracted["text"] and extracted["text"][0]["content"]  # The other stages of the pages are kept
+    assert len(extractor.page_errors) == len(extracted["text"])
+    assert {(error["stage"], error["code"]) for error in extractor.page_errors} == {("tables", "page_timeout")}
+
+def test_batch_quarantines_timed_out_files(tmp_path):
+    source = make_batch(tmp_path, ["small.pdf", "slow.pdf"])
+    quarantine = Quarantine(str(tmp_path / "quarantine.jsonl"))
+    processor = SlowProcessor(base_output_folder=str(tmp_path / "output"), file_timeout=1)
+    results = {os.path.basename(result["file_path"]): result for result in processor.run_batch(source, workers=2,
+                                                                                               quarantine=quarantine)}
+    assert results["small.pdf"]["status"] == "done" and results["small.pdf"]["page_errors"] == []
+    assert (results["slow.pdf"]["status"], results["slow.pdf"]["error_code"]) == ("failed", "timeout")
+
+    # The next run skips the quarantined file until it changes
+    quarantine = Quarantine(str(tmp_path / "quarantine.jsonl"))
+    results = {os.path.basename(result["file_path"]): result for result in processor.run_batch(source, workers=2,
+                                                                                               quarantine=quarantine)}
+    assert (results["slow.pdf"]["status"], results["slow.pdf"]["error_code"]) == ("skipped", "timeout")
+    os.utime(os.path.join(source, "slow.pdf"), ns=(0, 0))
+    assert quarantine.get(os.path.join(source, "slow.pdf")) is None
+
+def test_batch_recovers_from_a_dead_worker(tmp_path):
+    source = make_batch(tmp_path, ["a.pdf", "b.docx", "crash.pdf", "d.pptx", "e.pdf"])
+    processor = CrashingProcessor(base_output_folder=str(tmp_path / "output"))
+    results = {os.path.basename(result["file_path"]): result for result in processor.run_batch(source, workers=2)}
+    assert (results["crash.pdf"]["status"], results["crash.pdf"]["error_code"]) == ("failed", "worker_crashed")
+    assert all(results[name]["status"] == "done" for name in ("a.pdf", "b.docx", "d.pptx", "e.pdf"))
+
+def test_storage_connection_errors_are_raised(tmp_path):
+    with pytest.raises(StorageError):
+        SQLiteStorage(str(tmp_path))  # A directory cannot be opened as a database file
+    error = ExtractionError("a.pdf", "worker_crashed", "Worker process died")
+    assert FileProcessor(base_output_folder=str(tmp_path)).get_failed_result("a.pdf", "out", error)["error_code"] == \
+        "worker_crashed"
+
+def test_rejected_rows_fail_the_file(tmp_path, mocker):
+    import sqlite3
+    storage = SQLiteStorage(str(tmp_path / "data.sqlite"))
+    mocker.patch.object(storage, "_execute_many", side_effect=sqlite3.OperationalError("disk I/O error"))
+    processor = FileProcessor(base_output_folder=str(tmp_path / "output"))
+    result = processor.process_batch_file(os.path.join(TEST_FILES, "pdf", "small.pdf"), str(tmp_path / "output"), storage)
+    assert (result["status"], result["error_code"]) == ("failed", "storage_failed")
+    assert storage.connection.execute("SELECT COUNT(*) FROM documents").fetchone()[0] == 0  # Rolled back
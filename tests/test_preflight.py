@@ -0,0 +1,68 @@
+import os
+import shutil
+import pickle
+import zipfile
+import pytest
+from main import FileProcessor
+from loaders.pdf_loader import PDFLoader
+from loaders.docx_loader import DOCXLoader
+from loaders.ppt_loader import PPTLoader
+from loaders.preflight import PreflightError
+
+TEST_FILES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "test_files")
+
+LOADERS = {
+    "pdf": PDFLoader,
+    "docx": DOCXLoader,
+    "pptx": PPTLoader
+}
+
+def reject(file_type, path):
+    with pytest.raises(PreflightError) as error:
+        LOADERS[file_type]().validate_file(str(path))
+    return error.value.code
+
+@pytest.mark.parametrize("file_type", ["pdf", "docx", "pptx"])
+def test_sample_files_are_checked(file_type):
+    for name in ("small", "large", "multilingual", "annotate", "empty"):
+        assert LOADERS[file_type]().validate_file(os.path.join(TEST_FILES, file_type, f"{name}.{file_type}"))
+    assert reject(file_type, os.path.join(TEST_FILES, file_type, f"password.{file_type}")) == "encrypted"
+    assert reject(file_type, os.path.join(TEST_FILES, file_type, f"corrupt.{file_type}")) in ("not_pdf", "not_zip")
+    assert reject(file_type, os.path.join(TEST_FILES, file_type, f"missing.{file_type}")) == "missing"
+    assert reject(file_type, os.path.join(TEST_FILES, "pdf" if file_type != "pdf" else "docx", "small.txt")) == \
+        "unsupported_extension"
+
+def test_truncated_and_empty_pdf_are_rejected(tmp_path):
+    data = open(os.path.join(TEST_FILES, "pdf", "small.pdf"), "rb").read()
+    (tmp_path / "truncated.pdf").write_bytes(data[:len(data) // 2])
+    (tmp_path / "empty.pdf").write_bytes(b"")
+    (tmp_path / "bad_pointer.pdf").write_bytes(data.replace(b"startxref\n505068", b"startxref\n905068"))
+    assert reject("pdf", tmp_path / "truncated.pdf") == "truncated"
+    assert reject("pdf", tmp_path / "empty.pdf") == "empty"
+    assert reject("pdf", tmp_path / "bad_pointer.pdf") == "truncated"
+
+def test_package_without_main_part_is_rejected(tmp_path):
+    path = tmp_path / "no_document.docx"
+    with zipfile.ZipFile(os.path.join(TEST_FILES, "docx", "small.docx")) as source, zipfile.ZipFile(path, "w") as target:
+        for item in source.infolist():
+            if item.filename != "word/document.xml":
+                target.writestr(item, source.read(item))
+    assert reject("docx", path) == "missing_part"
+
+def test_preflight_error_is_structured():
+    error = PreflightError("a.pdf", "truncated", "PDF file is cut short")
+    assert error.to_dict() == {"filepath": "a.pdf", "code": "truncated", "message": "PDF file is cut short"}
+    assert pickle.loads(pickle.dumps(error)).to_dict() == error.to_dict()
+
+def test_batch_reports_rejected_files_and_goes_on(tmp_path):
+    source = tmp_path / "incoming"
+    source.mkdir()
+    for file_type in ("pdf", "docx"):
+        shutil.copy(os.path.join(TEST_FILES, file_type, f"small.{file_type}"), source / f"small.{file_type}")
+        shutil.copy(os.path.join(TEST_FILES, file_type, f"password.{file_type}"), source / f"password.{file_type}")
+    processor = FileProcessor(base_output_folder=str(tmp_path / "output"))
+    results = {os.path.basename(result["file_path"]): result for result in processor.run_batch(str(source), workers=2)}
+    assert results["small.pdf"]["status"] == results["small.docx"]["status"] == "done"
+    assert results["password.pdf"]["status"] == results["password.docx"]["status"] == "failed"
+    assert results["password.pdf"]["error_code"] == results["password.docx"]["error_code"] == "encrypted"
+    assert not os.path.exists(results["password.pdf"]["output_folder"])  # Never handed to a worker
@@ -0,0 +1,24 @@
+import json
+import pickle
+from records import TextLine, PageText, SlideText, to_json
+
+def test_records_read_and_compare_like_dicts():
+    page = PageText(3, [TextLine("Title", "Heading"), TextLine("Body", "normal")])
+    expected = {"page_number": 3, "content": [{"text": "Title", "style": "Heading"}, {"text": "Body", "style": "normal"}]}
+    assert page == expected
+    assert page["content"][0]["text"] == "Title"
+    assert page.get("slide_number") is None and "content" in page
+    assert list(page) == ["page_number", "content"]
+    assert page.to_dict() == expected and type(page.to_dict()["content"][0]) is dict
+    assert SlideText(1, []) != PageText(1, [])  # The location keys differ
+    assert not hasattr(page, "__dict__")
+
+def test_style_names_are_interned():
+    style = "".join(["Heading", " 1"])  # Built at run time, so not interned by the compiler
+    assert TextLine("a", style).style is TextLine("b", "Heading 1").style
+    assert TextLine("c", None).style is None
+
+def test_records_serialize_as_json_and_pickle():
+    page = PageText(1, [TextLine("ünïcode", "normal")])
+    assert json.loads(json.dumps({"text": [page]}, default=to_json)) == {"text": [page.to_dict()]}
+    assert pickle.loads(pickle.dumps(page)) == page  # Page records come back from the page workers
@@ -0,0 +1,51 @@
+import os
+import shutil
+import pytest
+from main import FileProcessor
+from storage.run_manifest import RunManifest
+
+TEST_FILES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "test_files")
+
+def make_batch(tmp_path):
+    source = tmp_path / "incoming"
+    source.mkdir()
+    for file_type in ("pdf", "docx", "pptx"):
+        shutil.copy(os.path.join(TEST_FILES, file_type, f"small.{file_type}"), source / f"small.{file_type}")
+    return str(source)
+
+def by_name(results):
+    return {os.path.basename(result["file_path"]): result for result in results}
+
+def test_restarted_batch_skips_extracted_files(tmp_path):
+    source = make_batch(tmp_path)
+    manifest_path = str(tmp_path / "run.jsonl")
+    processor = FileProcessor(base_output_folder=str(tmp_path / "output"))
+    first = by_name(processor.run_batch(source, workers=2, run_manifest=RunManifest(manifest_path)))
+    assert all(result["status"] == "done" and not result.get("previous_run") for result in first.values())
+    assert RunManifest(manifest_path).counts() == {"pending": 0, "extracting": 0, "extracted": 3, "failed": 0}
+
+    # The run died while the DOCX file was extracting, and its output was lost
+    RunManifest(manifest_path).mark(os.path.join(source, "small.docx"), "extracting")
+    shutil.rmtree(first["small.docx"]["output_folder"])
+    with open(manifest_path, "a", encoding="utf-8") as file:
+        file.write('{"file_path": "cut sh')  # A line the crash cut short
+
+    second = by_name(processor.run_batch(source, workers=2, run_manifest=RunManifest(manifest_path)))
+    assert second["small.pdf"]["previous_run"] and second["small.pptx"]["previous_run"]
+    assert second["small.docx"]["status"] == "done" and not second["small.docx"].get("previous_run")
+    assert os.path.exists(os.path.join(second["small.docx"]["output_folder"], "text", "docx", "docx_text.json"))
+
+def test_changed_files_are_extracted_again(tmp_path):
+    source = make_batch(tmp_path)
+    manifest = RunManifest(str(tmp_path / "run.jsonl"))
+    processor = FileProcessor(base_output_folder=str(tmp_path / "output"))
+    processor.run_batch(source, workers=1, run_manifest=manifest)
+    os.utime(os.path.join(source, "small.pdf"), ns=(0, 0))
+    assert not manifest.is_extracted(os.path.join(source, "small.pdf"))
+    assert manifest.is_extracted(os.path.join(source, "small.docx"))
+
+def test_resumed_batch_refuses_a_table_dataset(tmp_path):
+    processor = FileProcessor(base_output_folder=str(tmp_path / "output"))
+    processor.table_dataset = object()  # Any dataset; it is refused before a file is read
+    with pytest.raises(ValueError):
+        processor.run_batch(make_batch(tmp_path), run_manifest=RunManifest(str(tmp_path / "run.jsonl")))
@@ -0,0 +1,58 @@
+import os
+import json
+import threading
+import urllib.error
+import urllib.request
+import pytest
+from main import FileProcessor
+from service import ExtractionService, create_server
+
+TEST_FILES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "test_files")
+
+@pytest.fixture(scope="module")
+def server(tmp_path_factory):
+    processor = FileProcessor(base_output_folder=str(tmp_path_factory.mktemp("output")))
+    with ExtractionService(processor, workers=1) as service:
+        server = create_server(service, port=0)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+        server.shutdown()
+        server.server_close()
+
+def post(url, body):
+    request = urllib.request.Request(f"{url}/extract", data=json.dumps(body).encode("utf-8"))
+    try:
+        with urllib.request.urlopen(request) as response:
+            return response.status, response.read()
+    except urllib.error.HTTPError as e:
+        return e.code, e.read()
+
+def test_extract_returns_the_result_and_content(server):
+    status, body = post(server, {"path": os.path.join(TEST_FILES, "docx", "small.docx"), "include_content": True})
+    result = json.loads(body)
+    assert status == 200
+    assert result["status"] == "done"
+    assert result["worker"] != os.getpid()
+    assert os.path.isfile(os.path.join(result["output_folder"], "text", "docx", "docx_text.json"))
+    assert set(result["content"]) == {"text", "links", "images", "tables"}
+    assert result["content"]["text"]
+
+def test_extract_streams_progress_events(server):
+    status, body = post(server, {"path": os.path.join(TEST_FILES, "pdf", "small.pdf"), "stream": True})
+    events = [json.loads(line) for line in body.splitlines()]
+    assert status == 200
+    assert [event["event"] for event in events] == ["queued", "started", "done"]
+    assert len({event["job_id"] for event in events}) == 1
+    assert events[-1]["result"]["status"] == "done"
+
+def test_extract_rejects_invalid_requests(server, tmp_path):
+    unsupported = tmp_path / "notes.txt"
+    unsupported.write_text("not a supported document")
+    assert post(server, {"output_folder": str(tmp_path)})[0] == 400
+    assert post(server, {"path": str(tmp_path / "missing.pdf")})[0] == 404
+    assert post(server, {"path": str(unsupported)})[0] == 415
+
+def test_health_reports_the_workers(server):
+    with urllib.request.urlopen(f"{server}/health") as response:
+        health = json.load(response)
+    assert health == {"status": "ok", "workers": 1, "in_progress": 0}
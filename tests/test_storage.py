@@ -0,0 +1,335 @@
+import os
+import pytest
+from storage.extraction_cache import ExtractionCache
+
+@pytest.fixture
+def cache(tmp_path):
+    return ExtractionCache(str(tmp_path / "cache"), max_bytes=10 * 1024)
+
+@pytest.fixture
+def document(tmp_path):
+    path = tmp_path / "doc.pdf"
+    path.write_bytes(b"%PDF-1.4 first version")
+    return path
+
+def test_cache_key_depends_on_content_version_and_options(cache, document):
+    key = cache.make_key(str(document), "1", {"file_type": ".pdf"})
+    assert key == cache.make_key(str(document), "1", {"file_type": ".pdf"})
+    assert key != cache.make_key(str(document), "2", {"file_type": ".pdf"})
+    assert key != cache.make_key(str(document), "1", {"file_type": ".docx"})
+    document.write_bytes(b"%PDF-1.4 second version")
+    assert key != cache.make_key(str(document), "1", {"file_type": ".pdf"})
+
+def test_cache_round_trip_and_missing_artifacts(cache, tmp_path):
+    csv_path = tmp_path / "table.csv"
+    csv_path.write_text("a,b")
+    data = {"text": [{"text": "hello", "style": "normal"}], "links": [], "images": [],
+            "tables": [{"csv_filename": "table.csv", "csv_path": str(csv_path)}]}
+    cache.put("key", data)
+    assert cache.get("key") == data
+    assert cache.get("other") is None
+    csv_path.unlink()
+    assert cache.get("key") is None  # Results pointing at deleted files are not reused
+
+def test_cache_evicts_least_recently_used(cache):
+    payload = {"text": ["x" * 3000], "links": [], "images": [], "tables": []}
+    for index, key in enumerate(["a", "b", "c"]):
+        cache.put(key, payload)
+        os.utime(cache._entry_path(key), (index, index))  # Deterministic access order
+    assert cache.get("a") is not None  # Touch "a" so "b" becomes the least recently used
+    cache.put("d", payload)
+    assert cache.get("b") is None
+    assert all(cache.get(key) is not None for key in ("a", "c", "d"))
+
+def test_cache_put_scans_the_directory_once(cache, mocker):
+    payload = {"text": ["x" * 3000], "links": [], "images": [], "tables": []}
+    scan = mocker.spy(cache, "_iter_entries")
+    for key in "abcdef":
+        cache.put(key, payload)
+    assert scan.call_count == 1  # Later puts update the index
+    assert [cache.get(key) is not None for key in "abcdef"] == [False, False, False, True, True, True]
+
+def test_cache_invalidation(cache, document):
+    payload = {"text": [], "links": [], "images": [], "tables": []}
+    cache.put("old", payload, filepath=str(document), version="1")
+    cache.put("new", payload, filepath=str(document), version="2")
+    cache.put("other", payload, filepath="other.pdf", version="2")
+    assert cache.invalidate(keep_version="2") == 1
+    assert cache.invalidate(filepath=str(document)) == 1
+    assert cache.get("other") is not None
+    assert cache.clear() == 1
+
+@pytest.fixture
+def mysql_connection(mocker):
+    connection = mocker.MagicMock()
+    connection.is_connected.return_value = True
+    mocker.patch('mysql.connector.connect', return_value=connection)
+    return connection
+
+def executed_queries(connection, method):
+    cursor = connection.cursor.return_value
+    return [call[0][0] for call in getattr(cursor, method).call_args_list]
+
+def test_sql_storage_creates_tables_once_at_startup(mysql_connection):
+    from storage.sql_storage import SQLStorage
+    storage = SQLStorage("localhost", "root", "password", "database")
+    assert len([query for query in executed_queries(mysql_connection, "execute") if "CREATE TABLE" in query]) == 5
+    storage.store_text([{"page_number": 1, "text": "Example text"}], "pdf")
+    storage.store_text([{"page_number": 2, "text": "Another example text"}], "pdf")
+    assert len([query for query in executed_queries(mysql_connection, "execute") if "CREATE TABLE" in query]) == 5
+
+def test_sql_storage_inserts_rows_in_chunks(mysql_connection):
+    from storage.sql_storage import SQLStorage
+    storage = SQLStorage("localhost", "root", "password", "database", chunk_size=2)
+    mysql_connection.commit.reset_mock()
+    text_data = [{"page_number": 1, "content": [{"text": f"line {i}", "style": "normal"} for i in range(5)]}]
+    storage.store_text(text_data, "pdf")
+    batches = mysql_connection.cursor.return_value.executemany.call_args_list
+    assert [len(call[0][1]) for call in batches] == [2, 2, 1]
+    assert batches[0][0][1][0] == ("pdf", 1, "line 0")
+    assert mysql_connection.commit.call_count == 1
+
+def test_sql_storage_stores_document_in_one_transaction(mysql_connection):
+    from storage.sql_storage import SQLStorage
+    storage = SQLStorage("localhost", "root", "password", "database")
+    mysql_connection.commit.reset_mock()
+    storage.store_document({
+        "text": [{"slide_number": 2, "content": [{"text": "Title", "style": "Heading"}]}],
+        "links": [{"slide_number": 2, "linked_text": "site", "link": "https://example.com"}],
+        "images": [{"slide_number": 2, "image_filename": "a.png", "image_format": "png"}],
+        "tables": [{"slide_number": 3, "csv_filename": "t.csv"}]
+    }, "pptx")
+    assert len(executed_queries(mysql_connection, "executemany")) == 4
+    assert mysql_connection.commit.call_count == 1
+    assert mysql_connection.cursor.return_value.executemany.call_args_list[2][0][1] == [("pptx", 2, "a.png", "png")]
+
+def test_sql_storage_rolls_back_failed_document(mysql_connection):
+    from mysql.connector import Error
+    from errors import StorageWriteError
+    from storage.sql_storage import SQLStorage
+    storage = SQLStorage("localhost", "root", "password", "database")
+    mysql_connection.commit.reset_mock()
+    mysql_connection.cursor.return_value.executemany.side_effect = [None, Error("insert failed")]
+    with pytest.raises(StorageWriteError) as error:
+        storage.store_document({"text": [{"text": "a", "style": "Normal"}], "links": [{"link": "https://example.com"}]}, "docx")
+    assert error.value.code == "storage_failed"
+    assert isinstance(error.value.__cause__, Error)
+    assert mysql_connection.rollback.call_count == 1
+    assert mysql_connection.commit.call_count == 0
+
+def test_sql_storage_uses_pooled_connection_per_thread(mysql_connection, mocker):
+    import threading
+    import mysql.connector
+    from storage.sql_storage import SQLStorage
+    storage = SQLStorage("localhost", "root", "password", "database", pool_size=4)
+    assert "pool_name" in mysql.connector.connect.call_args.kwargs
+    assert mysql.connector.connect.call_args.kwargs["pool_size"] == 4
+
+    thread = threading.Thread(target=storage.store_links, args=([{"page_number": 1, "link": "https://example.com"}], "pdf"))
+    thread.start()
+    thread.join()
+    assert mysql.connector.connect.call_count == 2  # The worker thread checked out its own connection
+
+def test_sql_storage_reconnects_dropped_connection(mysql_connection):
+    from storage.sql_storage import SQLStorage
+    storage = SQLStorage("localhost", "root", "password", "database")
+    mysql_connection.is_connected.return_value = False
+    storage.store_text([{"text": "a", "style": "Normal"}], "docx")
+    assert mysql_connection.reconnect.called
+
+@pytest.fixture
+def sqlite_storage(tmp_path):
+    from storage.sqlite_storage import SQLiteStorage
+    return SQLiteStorage(str(tmp_path / "data.sqlite"), chunk_size=2)
+
+def count_rows(storage, table):
+    return storage.connection.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+def test_sqlite_storage_stores_document(sqlite_storage):
+    sqlite_storage.store_document({
+        "text": [{"page_number": 1, "content": [{"text": f"line {i}", "style": "normal"} for i in range(5)]}],
+        "links": [{"page_number": 1, "link": "https://example.com"}],
+        "images": [{"page_number": 1, "image_filename": "pdf_image_1_1.png", "image_format": "png"}],
+        "tables": [{"page_number": 1, "table_index": 1, "csv_filename": "pdf_table_1_1.csv"}]
+    }, "pdf")
+    assert sqlite_storage.is_connected()
+    assert [count_rows(sqlite_storage, table) for table in ("text_data", "links_data", "images_data", "tables_data")] == [5, 1, 1, 1]
+    assert sqlite_storage.connection.execute("SELECT file_type, page_number, text FROM text_data ORDER BY id").fetchone() == ("pdf", 1, "line 0")
+
+def test_sqlite_storage_rolls_back_failed_document(sqlite_storage):
+    with pytest.raises(AttributeError):
+        sqlite_storage.store_document({"text": [{"text": "kept?", "style": "Normal"}], "links": [None]}, "docx")
+    assert count_rows(sqlite_storage, "text_data") == 0
+
+def test_sqlite_storage_is_shared_across_threads_and_processes(sqlite_storage):
+    import pickle
+    import threading
+    threads = [threading.Thread(target=sqlite_storage.store_text, args=([{"text": f"thread {i}", "style": "Normal"}], "docx"))
+               for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    copy = pickle.loads(pickle.dumps(sqlite_storage))  # As sent to a worker process
+    copy.store_text([{"text": "worker", "style": "Normal"}], "docx")
+    assert count_rows(sqlite_storage, "text_data") == 5
+
+def test_sqlite_storage_replaces_rows_of_changed_pages(sqlite_storage):
+    def document(version):
+        return {
+            "text": [{"page_number": page, "content": [{"text": f"page {page} v{version if page == 2 else 1}"}]} for page in (1, 2, 3)],
+            "links": [{"page_number": 2, "link": f"https://example.com/v{version}"}],
+            "images": [],
+            "tables": [{"page_number": 3, "csv_filename": "pdf_table_3_1.csv"}]
+        }
+    sqlite_storage.store_document(document(1), "pdf", "/docs/report.pdf")
+    sqlite_storage.store_document(document(1), "pdf", "/docs/other.pdf")
+    sqlite_storage.replace_pages(document(2), "pdf", "/docs/report.pdf", [2])
+    rows = sqlite_storage.connection.execute(
+        "SELECT page_number, text FROM text_data WHERE document = ? ORDER BY page_number", ("/docs/report.pdf",)).fetchall()
+    assert rows == [(1, "page 1 v1"), (2, "page 2 v2"), (3, "page 3 v1")]
+    assert sqlite_storage.connection.execute(
+        "SELECT link FROM links_data WHERE document = ?", ("/docs/report.pdf",)).fetchall() == [("https://example.com/v2",)]
+    assert count_rows(sqlite_storage, "text_data") == 6  # The other document is untouched
+
+    sqlite_storage.replace_pages({"text": [], "links": [], "images": [], "tables": []}, "pdf", "/docs/report.pdf", [3])
+    assert count_rows(sqlite_storage, "tables_data") == 1
+    sqlite_storage.replace_pages(document(3), "pdf", "/docs/other.pdf")
+    assert count_rows(sqlite_storage, "text_data") == 5
+
+def test_sqlite_storage_stores_a_document_again_without_duplicates(sqlite_storage):
+    extracted = {"text": [{"page_number": 1, "content": [{"text": "line", "style": "normal"}]}],
+                 "links": [], "images": [], "tables": [{"page_number": 1, "csv_filename": "pdf_table_1_1.csv"}]}
+    for _ in range(2):  # E.g. a resumed batch storing the file it was storing when it died
+        sqlite_storage.store_document(extracted, "pdf", "/docs/report.pdf")
+    sqlite_storage.store_document(extracted, "pdf", "/docs/other.pdf")
+    assert count_rows(sqlite_storage, "text_data") == count_rows(sqlite_storage, "tables_data") == 2
+    assert "text_data_document" in [row[1] for row in sqlite_storage.connection.execute("PRAGMA index_list(text_data)")]
+
+def test_sqlite_storage_upserts_rows_by_document_key(sqlite_storage, tmp_path):
+    path = tmp_path / "report.pdf"
+    path.write_bytes(b"%PDF-1.4 report")
+    sqlite_storage.store_text([{"page_number": 1, "text": "legacy"}], "pdf", str(path))  # Stored without a document id
+    extracted = {"text": [{"page_number": 1, "content": [{"text": "a"}, {"text": "b"}]}], "links": [], "images": [],
+                 "tables": []}
+    sqlite_storage.store_document(extracted, "pdf", str(path))
+    ids = sqlite_storage.connection.execute("SELECT id, document_id, item_index FROM text_data ORDER BY id").fetchall()
+    assert [row[2] for row in ids] == [0, 1]
+    assert sqlite_storage.connection.execute("SELECT path, content_hash FROM documents").fetchall() == \
+        [(str(path), ExtractionCache.hash_file(str(path)))]
+
+    extracted["text"][0]["content"] = [{"text": "c"}]
+    sqlite_storage.store_document(extracted, "pdf", str(path))  # Updates the first row, deletes the second
+    assert sqlite_storage.connection.execute("SELECT id, document_id, text FROM text_data").fetchall() == \
+        [(ids[0][0], ids[0][1], "c")]
+    assert "text_data_document_item" in [row[1] for row in sqlite_storage.connection.execute("PRAGMA index_list(text_data)")]
+
+    sqlite_storage.connection.execute("DELETE FROM documents")  # The rows of a deleted document go with it
+    assert count_rows(sqlite_storage, "text_data") == 0
+
+def test_sqlite_storage_creates_the_shared_table_layout(sqlite_storage):
+    from storage.sql_storage import SQLStorage
+    for table, columns in SQLStorage.TABLE_COLUMNS.items():
+        expected = ["id"] + [name for name, _ in SQLStorage.DOCUMENT_COLUMNS + columns]
+        assert [row[1] for row in sqlite_storage.connection.execute(f"PRAGMA table_info({table})")] == expected
+
+def test_sql_storage_adds_document_column_to_existing_tables(tmp_path):
+    import sqlite3
+    from storage.sqlite_storage import SQLiteStorage
+    path = str(tmp_path / "old.sqlite")
+    connection = sqlite3.connect(path)
+    connection.execute("CREATE TABLE text_data (id INTEGER PRIMARY KEY AUTOINCREMENT, file_type VARCHAR(255), page_number INT, text TEXT)")
+    connection.close()
+    storage = SQLiteStorage(path)
+    storage.store_text([{"page_number": 1, "text": "kept"}], "pdf", "/docs/report.pdf")
+    assert storage.connection.execute("SELECT document, text FROM text_data").fetchall() == [("/docs/report.pdf", "kept")]
+    columns = [row[1] for row in storage.connection.execute("PRAGMA table_info(text_data)")]
+    assert "document_id" in columns and "item_index" in columns
+
+def test_sql_storage_migrates_only_missing_keys_and_raises_on_failure(tmp_path, mocker):
+    import sqlite3
+    from errors import StorageError
+    from storage.sqlite_storage import SQLiteStorage
+    path = str(tmp_path / "data.sqlite")
+    SQLiteStorage(path)
+    alter_table = mocker.spy(SQLiteStorage, "_alter_table")
+    SQLiteStorage(path)
+    assert alter_table.call_count == 0  # Up to date
+
+    path = str(tmp_path / "duplicates.sqlite")
+    connection = sqlite3.connect(path)
+    connection.execute("CREATE TABLE text_data (id INTEGER PRIMARY KEY AUTOINCREMENT, document VARCHAR(1024), "
+                       "document_id INT, item_index INT, file_type VARCHAR(255), page_number INT, text TEXT)")
+    connection.executemany("INSERT INTO text_data (document_id, item_index, text) VALUES (1, 0, ?)", [("a",), ("b",)])
+    connection.commit()
+    connection.close()
+    with pytest.raises(StorageError):  # The unique key cannot be added, so the rows would be duplicated
+        SQLiteStorage(path)
+
+def test_artifact_writer_flush_waits_for_queued_files(tmp_path):
+    from storage.artifact_writer import ArtifactWriter
+    with ArtifactWriter(max_workers=2, max_pending=2) as writer:
+        for index in range(10):
+            writer.write_bytes(str(tmp_path / f"image_{index}.png"), bytes([index]) * 100)
+        writer.write_csv(str(tmp_path / "table.csv"), [["a", "b"], ["1", "2"]])
+        writer.write_text(str(tmp_path / "data.json"), '{"text": "é"}')
+        writer.copy_file(str(tmp_path / "image_9.png"), str(tmp_path / "copy.png"))
+        writer.flush()
+        assert (tmp_path / "image_3.png").read_bytes() == bytes([3]) * 100
+        assert (tmp_path / "table.csv").read_text(encoding="utf-8").splitlines() == ["a,b", "1,2"]
+        assert (tmp_path / "data.json").read_text(encoding="utf-8") == '{"text": "é"}'
+        assert (tmp_path / "copy.png").read_bytes() == bytes([9]) * 100
+
+def test_artifact_writer_applies_backpressure(tmp_path, mocker):
+    import threading
+    from storage.artifact_writer import ArtifactWriter
+    release = threading.Event()
+    writer = ArtifactWriter(max_workers=1, max_pending=1)
+    write_text = writer._write_text
+    mocker.patch.object(writer, "_write_text", side_effect=lambda *args: (release.wait(), write_text(*args)))
+    writer.write_text(str(tmp_path / "first.json"), "1")
+    second = threading.Thread(target=writer.write_text, args=(str(tmp_path / "second.json"), "2"))
+    second.start()
+    second.join(timeout=0.2)
+    assert second.is_alive()  # Blocked until the first write completes
+    release.set()
+    second.join()
+    writer.close()
+    assert (tmp_path / "second.json").read_text() == "2"
+
+def test_artifact_writer_flush_raises_write_errors(tmp_path):
+    from storage.artifact_writer import ArtifactWriter
+    writer = ArtifactWriter()
+    writer.write_bytes(str(tmp_path / "missing" / "image.png"), b"data")
+    with pytest.raises(OSError):
+        writer.flush()
+    writer.flush()  # Errors are reported once
+    writer.close()
+
+@pytest.mark.parametrize("format", ["parquet", "arrow"])
+def test_table_dataset_writes_cells_in_row_groups(tmp_path, format):
+    pyarrow = pytest.importorskip("pyarrow")
+    from storage.table_dataset import TableDataset
+    path = str(tmp_path / f"tables.{format}")
+    with TableDataset(path, format=format, row_group_size=4) as dataset:
+        dataset.add_tables("a.pdf", "pdf", [{"page_number": 2, "table_index": 1, "rows": [["x", None], ["1", "2"]]}])
+        dataset.add_tables("b.pptx", "pptx", [{"slide_number": 1, "csv_path": "table.csv"},  # Saved as CSV, skipped
+                                              {"slide_number": 1, "rows": [["y"]]}, {"slide_number": 1, "rows": [["z"]]}])
+    if format == "parquet":
+        import pyarrow.parquet
+        assert pyarrow.parquet.ParquetFile(path).metadata.num_row_groups == 2
+        table = pyarrow.parquet.read_table(path)
+    else:
+        import pyarrow.ipc
+        table = pyarrow.ipc.open_file(path).read_all()
+    assert table.to_pylist()[1] == {"document": "a.pdf", "file_type": "pdf", "page_number": 2, "slide_number": None,
+                                    "table_index": 1, "row": 0, "column": 1, "value": None}
+    assert [(row["table_index"], row["value"]) for row in table.to_pylist()[4:]] == [(1, "y"), (2, "z")]
+
+def test_table_dataset_without_tables_writes_empty_file(tmp_path):
+    pytest.importorskip("pyarrow")
+    import pyarrow.parquet
+    from storage.table_dataset import TableDataset
+    path = str(tmp_path / "tables.parquet")
+    TableDataset(path).close()
+    assert pyarrow.parquet.read_table(path).num_rows == 0
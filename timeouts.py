@@ -0,0 +1,68 @@
+import time
+import signal
+import threading
+import contextlib
+
+# Time limits active in this process, outermost first, as (deadline, make_error) pairs. They share one
+# interval timer, which is always armed for the nearest deadline.
+_limits = []
+_previous_handler = None  # The SIGALRM handler to restore when the last limit ends
+
+def is_supported():
+    """
+    Returns whether time limits can be enforced here: they need SIGALRM and interval timers, which are
+    POSIX only, and signal handlers only run in the main thread of a process.
+    """
+    return hasattr(signal, "setitimer") and threading.current_thread() is threading.main_thread()
+
+def _arm():
+    """
+    Sets the interval timer to the nearest deadline, or disarms it when no limit is active.
+    """
+    if _limits:
+        remaining = min(deadline for deadline, _ in _limits) - time.monotonic()
+        signal.setitimer(signal.ITIMER_REAL, max(remaining, 0.001))
+    else:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+
+def _on_alarm(signum, frame):
+    """
+    Raises the error of the outermost expired limit, so that a file timeout is not mistaken for the timeout
+    of the page being extracted when it expires.
+    """
+    now = time.monotonic()
+    for deadline, make_error in _limits:
+        if deadline <= now:
+            raise make_error()
+    _arm()
+
+@contextlib.contextmanager
+def time_limit(seconds, make_error):
+    """
+    Interrupts the enclosed code with an error once it has run for longer than `seconds`. Limits can be
+    nested, e.g. a page timeout within a file timeout. The error is raised from the Python code running
+    when the limit expires; a call stuck in a C library is interrupted when it returns to Python.
+
+    Where limits are not supported (see is_supported), or when `seconds` is None or 0, the code runs
+    without a limit.
+
+    Args:
+        seconds (float): The time limit in seconds.
+        make_error (callable): Returns the exception raised when the limit expires.
+    """
+    global _previous_handler
+    if not seconds or not is_supported():
+        yield
+        return
+
+    if not _limits:
+        _previous_handler = signal.signal(signal.SIGALRM, _on_alarm)
+    _limits.append((time.monotonic() + seconds, make_error))
+    _arm()
+    try:
+        yield
+    finally:
+        _limits.pop()
+        _arm()
+        if not _limits:
+            signal.signal(signal.SIGALRM, _previous_handler)